@@ -2,6 +2,7 @@
 
 from functools import lru_cache
 from pathlib import Path
+from pydantic import BaseModel
 from pydantic_settings import BaseSettings
 
 # Find project root (parent of backend/)
@@ -9,6 +10,13 @@ PROJECT_ROOT = Path(__file__).parent.parent.parent
 ENV_FILE = PROJECT_ROOT / ".env"
 
 
+class GatewayTarget(BaseModel):
+    """One gateway in a fleet."""
+    name: str
+    url: str
+    token: str = ""
+
+
 class Settings(BaseSettings):
     """Application settings loaded from environment."""
     
@@ -17,6 +25,124 @@ class Settings(BaseSettings):
     openclaw_gateway_token: str = ""
     openclaw_workspace: str = str(Path.home() / ".openclaw" / "workspace")
     
+    # Fleet: gateways queried by the /api/fleet views in addition to the default one, as JSON, e.g.
+    # FLEET_GATEWAYS='[{"name": "alpha", "url": "http://alpha:18789", "token": "..."}]'
+    fleet_gateways: list[GatewayTarget] = []
+    fleet_timeout_seconds: float = 5.0  # Per-gateway timeout for aggregated views
+    fleet_history_concurrency: int = 8  # Concurrent history fetches per gateway for fleet logs
+    
+    # Config mirror
+    config_mirror_ttl_seconds: float = 15.0  # How long reads are served from the mirror
+    config_patch_retries: int = 2  # Retries after a baseHash conflict
+    config_patch_debounce_ms: int = 300  # Window for coalescing patches (0 disables)
+    config_patch_max_wait_ms: int = 2000  # Longest a patch is held back
+    
+    # Cron
+    cron_bulk_concurrency: int = 8  # Max concurrent gateway calls for bulk job actions
+    cron_stats_window: int = 200  # Runs per job kept for rolling stats
+    cron_stats_last_n: int = 10  # Recent outcomes shown per job
+    cron_stats_refresh_seconds: float = 30.0  # Max age of the stats overview
+    cron_list_ttl_seconds: float = 10.0  # Max age of the cached job list (writes invalidate it)
+    
+    # Queue sampler
+    sampler_enabled: bool = True
+    sampler_interval_seconds: float = 10.0  # Base interval (adapts to agent activity)
+    sampler_capacity: int = 8640  # Raw samples kept in memory (24h at 10s; longer while polling backs off)
+    sampler_active_minutes: int = 5  # Window for counting a session as active
+    sampler_history_dir: str = ""  # Directory for downsampled history; empty keeps it in memory
+    
+    # Command dispatcher
+    command_max_in_flight: int = 8  # Concurrent chat completions across all sessions
+    command_session_concurrency: int = 1  # Concurrent chat completions per session
+    command_session_queue: int = 5  # Commands allowed to wait per session
+    command_global_queue: int = 50  # Commands allowed to wait overall
+    command_job_ttl_seconds: float = 3600.0  # How long async command results are kept
+    command_job_max: int = 500  # Max async command jobs kept
+    broadcast_concurrency: int = 8  # Concurrent sessions_send calls per broadcast
+    broadcast_rate_per_second: float = 10.0  # sessions_send calls started per second (0 = unlimited)
+    
+    # Sessions index
+    sessions_index_ttl_seconds: float = 5.0  # Max age before the index re-fetches sessions_list
+    
+    # Session history cache
+    history_cache_sessions: int = 200  # Sessions kept in memory (LRU)
+    history_cache_messages: int = 1000  # Messages kept per session
+    history_cache_fresh_seconds: float = 2.0  # Serve without any gateway call within this age
+    history_cache_dir: str = ""  # Directory to spill evicted sessions to; empty disables
+    
+    # Health probe
+    health_interval_seconds: float = 15.0  # Probe interval while healthy (shorter while the agent is active)
+    health_unhealthy_interval_seconds: float = 3.0  # Probe interval while unhealthy or flipping
+    health_probe_timeout_seconds: float = 5.0
+    health_fail_threshold: int = 2  # Consecutive failures before reporting unhealthy
+    health_recover_threshold: int = 2  # Consecutive successes before reporting healthy
+    
+    # Warm-up
+    warmup_enabled: bool = True  # Prefetch caches at startup and after a gateway restart
+    warmup_timeout_seconds: float = 10.0  # Per-cache timeout for one warm-up attempt
+    warmup_retry_seconds: float = 2.0  # First retry delay for caches that failed to warm (doubles)
+    warmup_retry_max_seconds: float = 30.0
+    warmup_restart_delay_seconds: float = 3.0  # Wait after a gateway restart before reconnecting
+    
+    # Adaptive polling (the sampler paces itself to agent activity; the health probe only speeds up)
+    polling_adaptive: bool = True
+    polling_active_speedup: float = 2.0  # Poll this much faster than the base interval while active
+    polling_active_window_seconds: float = 120.0  # Agent counts as active this long after lastActivity
+    polling_idle_backoff: float = 2.0  # Interval multiplier per idle round
+    polling_idle_max_seconds: float = 120.0  # Longest interval while idle with clients connected
+    polling_unwatched_max_seconds: float = 600.0  # Longest interval while idle and nobody is watching
+    polling_client_window_seconds: float = 60.0  # A client counts as connected this long after a request
+    
+    # Dashboard
+    dashboard_part_timeout_seconds: float = 5.0  # Per-section timeout for /api/dashboard
+    
+    # Gateway resilience
+    breaker_failure_threshold: int = 5  # Consecutive failures before a call's circuit opens
+    breaker_reset_seconds: float = 15.0  # How long a circuit stays open before a trial call
+    retry_max_attempts: int = 3  # Total attempts for idempotent reads
+    retry_backoff_base_seconds: float = 0.2
+    retry_backoff_max_seconds: float = 2.0
+    retry_budget_ratio: float = 0.1  # Retries allowed per gateway call, on average
+    retry_budget_max: float = 10.0  # Retries that can be banked for bursts
+    request_deadline_seconds: float = 30.0  # Deadline for gateway calls made by a request
+    command_deadline_seconds: float = 150.0  # Deadline for /api/command requests
+    gateway_max_connections: int = 20  # Pooled connections to the gateway
+    gateway_max_keepalive: int = 10  # Idle connections kept open for reuse
+    gateway_record_path: str = ""  # Append every gateway exchange to this file
+    gateway_replay_path: str = ""  # Serve gateway calls from this recording instead of the network
+    gateway_replay_speed: float = 0.0  # Replay at recorded speed x this (0 = no delay)
+    
+    # Admission control (priority lanes in front of each gateway)
+    admission_enabled: bool = True
+    admission_max_in_flight: int = 16  # Gateway calls admitted at once; higher lanes queue for a slot
+    admission_interactive_rate: float = 0.0  # Calls started per second per lane (0 = unlimited)
+    admission_write_rate: float = 10.0
+    admission_background_rate: float = 10.0
+    admission_poll_rate: float = 50.0  # A /api/logs load alone makes ~50 calls
+    admission_burst_seconds: float = 2.0  # Bucket size, in seconds of each lane's rate
+    admission_poll_shed_at: float = 0.5  # Shed polls above this fraction of max_in_flight
+    admission_background_shed_at: float = 0.8  # Shed background calls above this fraction
+    admission_stale_entries: int = 256  # Read responses kept for serving shed calls stale
+    
+    # Shared cache (for running several uvicorn workers)
+    cache_backend: str = "memory"  # "memory" (per process) or "sqlite" (shared across workers)
+    cache_path: str = ""  # SQLite cache file; defaults to scuttlebox-cache.db in the temp dir
+    leader_lock_path: str = ""  # Lock file for electing the polling worker; defaults next to the cache
+    leader_retry_seconds: float = 5.0  # How often followers try to take over leadership
+    
+    # Responses
+    compression_min_bytes: int = 1024  # Compress larger responses with gzip/zstd (0 disables)
+    
+    # Metrics
+    metrics_enabled: bool = True
+    loop_lag_interval_seconds: float = 0.5  # How often event loop lag is sampled
+    
+    # Tracing
+    tracing_enabled: bool = True  # Server-Timing breakdown on every response
+    slow_request_ms: int = 1000  # Requests running longer than this get profiled
+    profile_dir: str = ""  # Directory for slow-request stack profiles; empty disables profiling
+    profile_interval_ms: int = 5  # Stack sampling interval while profiling
+    
     # Server
     cors_origins: list[str] = ["http://localhost:5173", "http://127.0.0.1:5173"]
     
@@ -1,11 +1,32 @@
 """Scuttlebox Backend - FastAPI application."""
 
 from fastapi import FastAPI
+from fastapi.responses import JSONResponse, PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 
 from .config import get_settings
-from .routers import status, sessions, commands, files, config, cron, queue, logs
+from .middleware import (
+    ActivityMiddleware,
+    CompressionMiddleware,
+    DeadlineMiddleware,
+    ETagMiddleware,
+    MetricsMiddleware,
+    PriorityMiddleware,
+    TracingMiddleware,
+)
+from .responses import FastJSONResponse
+from .routers import status, sessions, commands, files, config, cron, queue, logs, dashboard, fleet
+from .services.cron_stats import get_cron_stats_store
+from .services.fleet import get_fleet
+from .services.health_probe import get_health_prober
+from .services.history_cache import get_history_cache
+from .services.leader import get_leader_elector
+from .services.metrics import REGISTRY, LoopLagMonitor
+from .services.openclaw import get_openclaw_client
+from .services.sampler import get_queue_sampler
+from .services.shared_cache import get_cache_backend
+from .services.warmup import get_cache_warmer
 
 
 @asynccontextmanager
@@ -16,9 +37,43 @@ async def lifespan(app: FastAPI):
     print(f"🎱 Scuttlebox Backend starting...")
     print(f"   Gateway: {settings.openclaw_gateway_url}")
     print(f"   Workspace: {settings.openclaw_workspace}")
+    
+    # Background workers (only in the elected worker when running several)
+    client = get_openclaw_client()
+    prober = get_health_prober()
+    sampler = get_queue_sampler()
+    elector = get_leader_elector()
+    warmer = get_cache_warmer()
+    cron_stats = get_cron_stats_store()
+    
+    # Prefetch caches in the background; /ready reports when they're warm
+    warmer.start(client)
+    
+    async def start_pollers():
+        prober.start(client)
+        if settings.sampler_enabled:
+            sampler.start(client)
+        if get_cache_backend().shared:
+            # Ingest cron runs here once instead of in every worker
+            cron_stats.start(client)
+    
+    elector.start(start_pollers)
+    lag_monitor = LoopLagMonitor(settings.loop_lag_interval_seconds)
+    if settings.metrics_enabled:
+        lag_monitor.start()
+    
     yield
     # Shutdown
     print("🎱 Scuttlebox Backend shutting down...")
+    await warmer.stop()
+    await elector.stop()
+    await sampler.stop()
+    await prober.stop()
+    await cron_stats.stop()
+    await lag_monitor.stop()
+    await get_history_cache().flush()
+    await get_fleet().aclose()
+    await client.aclose()
 
 
 app = FastAPI(
@@ -26,6 +81,7 @@ app = FastAPI(
     description="Backend API for the Scuttlebox web interface",
     version="0.1.0",
     lifespan=lifespan,
+    default_response_class=FastJSONResponse,
 )
 
 # CORS middleware
@@ -37,6 +93,15 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(DeadlineMiddleware)
+app.add_middleware(PriorityMiddleware)
+app.add_middleware(ActivityMiddleware)
+app.add_middleware(ETagMiddleware)
+app.add_middleware(CompressionMiddleware)
+if settings.tracing_enabled:
+    app.add_middleware(TracingMiddleware)
+if settings.metrics_enabled:
+    app.add_middleware(MetricsMiddleware)
 
 # Include routers
 app.include_router(status.router)
@@ -47,6 +112,8 @@ app.include_router(config.router)
 app.include_router(cron.router)
 app.include_router(queue.router)
 app.include_router(logs.router)
+app.include_router(dashboard.router)
+app.include_router(fleet.router)
 
 
 @app.get("/")
@@ -63,3 +130,16 @@ async def root():
 async def health():
     """Health check endpoint."""
     return {"ok": True}
+
+
+@app.get("/ready")
+async def ready():
+    """Readiness check: 200 once the startup caches are warm, 503 until then."""
+    snapshot = get_cache_warmer().snapshot()
+    return JSONResponse(snapshot, status_code=200 if snapshot["ready"] else 503)
+
+
+@app.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+async def metrics():
+    """Prometheus metrics."""
+    return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4")
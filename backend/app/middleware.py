@@ -0,0 +1,370 @@
+"""ASGI middleware."""
+
+import asyncio
+import gzip
+import json
+import re
+import time
+from pathlib import Path
+from typing import Optional
+import aiofiles
+from .config import get_settings
+from .responses import body_etag, etag_matches
+from .services.activity import get_activity_monitor
+from .services.admission import classify, priority_scope
+from .services.metrics import HTTP_IN_FLIGHT, HTTP_LATENCY
+from .services.resilience import deadline_scope
+from .services.tracing import StackSampler, Trace, trace_scope
+
+try:
+    import zstandard
+except ImportError:  # Optional; responses are gzipped without it
+    zstandard = None
+
+
+class DeadlineMiddleware:
+    """Gives each request a deadline that its gateway calls are bounded by.
+    
+    Clients can tighten it with an `X-Request-Timeout` header (seconds).
+    """
+    
+    def __init__(self, app):
+        self.app = app
+        self.settings = get_settings()
+    
+    def _deadline(self, scope) -> float:
+        if scope["path"].startswith("/api/command"):
+            deadline = self.settings.command_deadline_seconds
+        else:
+            deadline = self.settings.request_deadline_seconds
+        for name, value in scope.get("headers", []):
+            if name == b"x-request-timeout":
+                try:
+                    requested = float(value)
+                except ValueError:
+                    break
+                if requested > 0:
+                    deadline = min(deadline, requested)
+                break
+        return deadline
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        with deadline_scope(self._deadline(scope)):
+            await self.app(scope, receive, send)
+
+
+class ActivityMiddleware:
+    """Records API requests as client presence for adaptive background polling."""
+    
+    def __init__(self, app):
+        self.app = app
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not scope["path"].startswith("/api/"):
+            await self.app(scope, receive, send)
+            return
+        monitor = get_activity_monitor()
+        monitor.client_opened()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            monitor.client_closed()
+
+
+class PriorityMiddleware:
+    """Puts each request's gateway calls in a priority lane for admission control."""
+    
+    def __init__(self, app):
+        self.app = app
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        with priority_scope(classify(scope["method"], scope["path"])):
+            await self.app(scope, receive, send)
+
+
+class ETagMiddleware:
+    """Adds an ETag to JSON GET responses and answers matching If-None-Match with 304.
+    
+    Routes that know a cheaper version (like the gateway's config hash) set
+    their own ETag, which is used as is.
+    """
+    
+    def __init__(self, app):
+        self.app = app
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] not in ("GET", "HEAD") or not scope["path"].startswith("/api/"):
+            await self.app(scope, receive, send)
+            return
+        
+        if_none_match = None
+        for name, value in scope.get("headers", []):
+            if name == b"if-none-match":
+                if_none_match = value.decode("latin-1")
+                break
+        start = None
+        chunks: list[bytes] = []
+        
+        async def send_wrapper(message):
+            nonlocal start
+            if message["type"] == "http.response.start":
+                content_type = dict(message.get("headers", [])).get(b"content-type", b"")
+                if message["status"] == 200 and content_type.startswith(b"application/json"):
+                    start = message
+                    return
+            elif message["type"] == "http.response.body" and start is not None:
+                chunks.append(message.get("body", b""))
+                if message.get("more_body"):
+                    return
+                await self._send_tagged(send, start, b"".join(chunks), if_none_match)
+                return
+            await send(message)
+        
+        await self.app(scope, receive, send_wrapper)
+    
+    async def _send_tagged(self, send, start: dict, body: bytes, if_none_match: Optional[str]):
+        headers = list(start.get("headers", []))
+        etag = next((v.decode("latin-1") for k, v in headers if k == b"etag"), None)
+        if etag is None:
+            etag = body_etag(body)
+            headers.append((b"etag", etag.encode("latin-1")))
+        if etag_matches(if_none_match, etag):
+            headers = [(k, v) for k, v in headers if k not in (b"content-length", b"content-type")]
+            await send({**start, "status": 304, "headers": headers})
+            await send({"type": "http.response.body", "body": b""})
+            return
+        await send({**start, "headers": headers})
+        await send({"type": "http.response.body", "body": body})
+
+
+def accepted_encodings(accept_encoding: str) -> set[str]:
+    """Content codings a client accepts (q=0 excluded)."""
+    accepted = set()
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        q = params.strip()
+        if q.startswith("q=") and q[2:].strip() in ("0", "0.0", "0.00", "0.000"):
+            continue
+        if name:
+            accepted.add(name.strip().lower())
+    return accepted
+
+
+class CompressionMiddleware:
+    """Compresses JSON and text responses above a size threshold.
+    
+    zstd is preferred when the client accepts it and the zstandard package
+    is installed, then gzip. Compressed responses get a weak ETag, since
+    their bytes no longer match the body it was computed from.
+    """
+    
+    COMPRESSIBLE = (b"application/json", b"text/plain", b"text/html", b"text/css", b"application/javascript")
+    THREAD_BYTES = 1 << 20
+    
+    def __init__(self, app):
+        self.app = app
+        self.min_bytes = get_settings().compression_min_bytes
+    
+    def _encoding(self, scope) -> Optional[str]:
+        for name, value in scope.get("headers", []):
+            if name == b"accept-encoding":
+                accepted = accepted_encodings(value.decode("latin-1"))
+                if zstandard is not None and "zstd" in accepted:
+                    return "zstd"
+                if "gzip" in accepted:
+                    return "gzip"
+                return None
+        return None
+    
+    async def __call__(self, scope, receive, send):
+        encoding = self._encoding(scope) if scope["type"] == "http" and self.min_bytes > 0 else None
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        
+        start = None
+        chunks: list[bytes] = []
+        
+        async def send_wrapper(message):
+            nonlocal start
+            if message["type"] == "http.response.start":
+                headers = dict(message.get("headers", []))
+                content_type = headers.get(b"content-type", b"")
+                if b"content-encoding" not in headers and content_type.startswith(self.COMPRESSIBLE):
+                    start = message
+                    return
+            elif message["type"] == "http.response.body" and start is not None:
+                chunks.append(message.get("body", b""))
+                if message.get("more_body"):
+                    return
+                await self._send_compressed(send, start, b"".join(chunks), encoding)
+                return
+            await send(message)
+        
+        await self.app(scope, receive, send_wrapper)
+    
+    @staticmethod
+    def _compress(body: bytes, encoding: str) -> bytes:
+        if encoding == "zstd":
+            return zstandard.ZstdCompressor(level=3).compress(body)
+        return gzip.compress(body, compresslevel=6)
+    
+    async def _send_compressed(self, send, start: dict, body: bytes, encoding: str):
+        headers = list(start.get("headers", []))
+        if len(body) < self.min_bytes:
+            await send(start)
+            await send({"type": "http.response.body", "body": body})
+            return
+        if len(body) > self.THREAD_BYTES:
+            # Keep large compressions off the event loop
+            body = await asyncio.to_thread(self._compress, body, encoding)
+        else:
+            body = self._compress(body, encoding)
+        compressed_headers = []
+        for name, value in headers:
+            if name == b"content-length":
+                continue
+            if name == b"etag" and not value.startswith(b"W/"):
+                value = b"W/" + value
+            compressed_headers.append((name, value))
+        compressed_headers += [
+            (b"content-encoding", encoding.encode("latin-1")),
+            (b"content-length", str(len(body)).encode("latin-1")),
+            (b"vary", b"Accept-Encoding"),
+        ]
+        await send({**start, "headers": compressed_headers})
+        await send({"type": "http.response.body", "body": body})
+
+
+class MetricsMiddleware:
+    """Records request latency per route template (not raw path, to bound cardinality)."""
+    
+    def __init__(self, app):
+        self.app = app
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        status = 500
+        
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+        
+        HTTP_IN_FLIGHT.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            HTTP_IN_FLIGHT.dec()
+            route = scope.get("route")
+            HTTP_LATENCY.observe(
+                time.perf_counter() - started,
+                scope["method"],
+                getattr(route, "path", "unmatched"),
+                str(status),
+            )
+
+
+def server_timing(trace: Trace) -> str:
+    """Server-Timing header value for a trace, up to now."""
+    app_ms = (time.perf_counter() - trace.started) * 1000
+    summary = trace.summary()
+    gateway = summary.get("gateway", {"wallMs": 0.0, "count": 0})
+    serialize = summary.get("serialize", {"wallMs": 0.0})
+    normalize_ms = max(0.0, app_ms - gateway["wallMs"] - serialize["wallMs"])
+    return ", ".join([
+        f'gateway;dur={gateway["wallMs"]:.1f};desc="{gateway["count"]} calls"',
+        f'normalize;dur={normalize_ms:.1f}',
+        f'serialize;dur={serialize["wallMs"]:.1f}',
+        f'app;dur={app_ms:.1f}',
+    ])
+
+
+class TracingMiddleware:
+    """Traces each request and reports the breakdown in a Server-Timing header.
+    
+    Gateway calls and response rendering are recorded as spans; whatever
+    else the request spent is reported as `normalize` (parsing, filtering,
+    validation). Requests still running after the slow-request threshold get
+    a sampled stack profile written to the profile directory, one at a time.
+    """
+    
+    def __init__(self, app):
+        self.app = app
+        self.settings = get_settings()
+        profile_dir = self.settings.profile_dir
+        self._profile_dir = Path(profile_dir).expanduser() if profile_dir else None
+        self._profiling = False
+    
+    async def _write_profile(self, scope, trace: Trace, sampler: StackSampler):
+        """Write the folded stacks and a trace summary for a slow request."""
+        route = getattr(scope.get("route"), "path", scope["path"])
+        name = f"{int(time.time() * 1000)}-{scope['method']}-{re.sub(r'[^A-Za-z0-9]+', '_', route).strip('_')}"
+        summary = {
+            "method": scope["method"],
+            "path": scope["path"],
+            "route": route,
+            "durationMs": (time.perf_counter() - trace.started) * 1000,
+            "spans": trace.summary(),
+            "samples": sum(sampler.stacks.values()),
+        }
+        try:
+            self._profile_dir.mkdir(parents=True, exist_ok=True)
+            async with aiofiles.open(self._profile_dir / f"{name}.folded", "w", encoding="utf-8") as f:
+                await f.write(sampler.folded())
+            async with aiofiles.open(self._profile_dir / f"{name}.json", "w", encoding="utf-8") as f:
+                await f.write(json.dumps(summary, indent=2))
+        except OSError:
+            pass
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        sampler: Optional[StackSampler] = None
+        timer = None
+        if self._profile_dir is not None:
+            task = asyncio.current_task()
+            
+            def start_profile():
+                nonlocal sampler
+                if self._profiling:
+                    return
+                self._profiling = True
+                sampler = StackSampler(task, self.settings.profile_interval_ms / 1000)
+                sampler.start()
+            
+            timer = asyncio.get_running_loop().call_later(
+                self.settings.slow_request_ms / 1000, start_profile
+            )
+        
+        with trace_scope() as trace:
+            
+            async def send_wrapper(message):
+                if message["type"] == "http.response.start":
+                    headers = list(message.get("headers", []))
+                    headers.append((b"server-timing", server_timing(trace).encode("latin-1")))
+                    message = {**message, "headers": headers}
+                await send(message)
+            
+            try:
+                await self.app(scope, receive, send_wrapper)
+            finally:
+                if timer is not None:
+                    timer.cancel()
+                if sampler is not None:
+                    sampler.stop()
+                    self._profiling = False
+                    await self._write_profile(scope, trace, sampler)
@@ -20,6 +20,9 @@ class GatewayHealth(BaseModel):
     ok: bool
     uptime_seconds: Optional[float] = None
     channels: dict[str, Any] = Field(default_factory=dict)
+    last_checked_at: Optional[int] = None  # Epoch ms of the last background probe
+    latency_ms: Optional[int] = None
+    since: Optional[int] = None  # Epoch ms when the ok state last changed
 
 
 # --- Sessions ---
@@ -51,11 +54,23 @@ class CommandRequest(BaseModel):
     stream: bool = False
 
 
+class BroadcastRequest(BaseModel):
+    """Request to send one message to many sessions."""
+    message: str
+    channel: Optional[str] = None
+    label: Optional[str] = None
+    active_minutes: Optional[int] = None
+    session_keys: Optional[list[str]] = None  # Explicit targets (still filtered by the above)
+    dry_run: bool = False
+
+
 class CommandResponse(BaseModel):
     """Response from a command."""
     ok: bool
     response: Optional[str] = None
     error: Optional[str] = None
+    job_id: Optional[str] = None  # Set for async commands
+    status: Optional[str] = None
 
 
 # --- Files ---
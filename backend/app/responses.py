@@ -0,0 +1,98 @@
+"""Response classes and conditional-request helpers."""
+
+import hashlib
+from typing import Any, Iterable, Optional
+import orjson
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+from pydantic_core import to_jsonable_python
+from .services.tracing import span
+
+
+class TracedJSONResponse(JSONResponse):
+    """JSONResponse that records rendering as a `serialize` span."""
+    
+    def render(self, content: Any) -> bytes:
+        with span("serialize"):
+            return super().render(content)
+
+
+def _orjson_default(obj: Any) -> Any:
+    # Pydantic models (and anything else orjson doesn't know) go through
+    # pydantic's serializer, which dumps without validating again
+    return to_jsonable_python(obj)
+
+
+class FastJSONResponse(TracedJSONResponse):
+    """JSON response rendered with orjson.
+    
+    Used as the default response class. Handlers returning large or
+    already-validated data can return one directly, e.g.
+    `FastJSONResponse(LogsResponse(...))`, to skip FastAPI's response_model
+    validation and jsonable_encoder pass.
+    """
+    
+    def render(self, content: Any) -> bytes:
+        with span("serialize"):
+            if isinstance(content, BaseModel):
+                return content.__pydantic_serializer__.to_json(content)
+            return orjson.dumps(content, default=_orjson_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+def parse_fields(fields: Optional[str]) -> Optional[set[str]]:
+    """Field names from a comma-separated `?fields=` parameter (None means all)."""
+    if not fields:
+        return None
+    names = {name.strip() for name in fields.split(",")}
+    names.discard("")
+    return names or None
+
+
+def project(items: Iterable[Any], fields: Optional[set[str]]) -> list[Any]:
+    """Keep only `fields` of each item (dicts or pydantic models); None keeps everything."""
+    if fields is None:
+        return list(items)
+    return [
+        item.model_dump(include=fields) if isinstance(item, BaseModel)
+        else {k: v for k, v in item.items() if k in fields}
+        for item in items
+    ]
+
+
+def body_etag(body: bytes) -> str:
+    """Strong ETag for a response body (a short BLAKE2 digest)."""
+    return f'"{hashlib.blake2b(body, digest_size=12).hexdigest()}"'
+
+
+def _without(content: Any, ignore: set[str]) -> Any:
+    if isinstance(content, BaseModel):
+        content = content.model_dump()
+    if isinstance(content, dict):
+        return {k: _without(v, ignore) for k, v in content.items() if k not in ignore}
+    if isinstance(content, list):
+        return [_without(v, ignore) for v in content]
+    return content
+
+
+def content_etag(content: Any, ignore: Iterable[str] = ()) -> str:
+    """ETag for response content, leaving out `ignore` keys at any depth.
+    
+    For routes whose bodies carry clock-driven fields (fetch times,
+    latencies), so a client sees 304 while the data itself is unchanged.
+    """
+    body = orjson.dumps(
+        _without(content, set(ignore)),
+        default=_orjson_default,
+        option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SORT_KEYS,
+    )
+    return body_etag(body)
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Whether an If-None-Match header matches an ETag (weak comparison)."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == opaque for tag in if_none_match.split(","))
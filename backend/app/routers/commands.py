@@ -1,35 +1,117 @@
 """Command/chat endpoints."""
 
-from fastapi import APIRouter, HTTPException
+import asyncio
+import json
+from typing import Optional
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from ..services.command_jobs import get_command_job_store
+from ..services.dispatcher import DispatcherBusyError, get_command_dispatcher
+from ..config import get_settings
 from ..services.openclaw import get_openclaw_client
-from ..models.schemas import CommandRequest, CommandResponse
+from ..services.ratelimit import TokenBucket
+from ..models.schemas import BroadcastRequest, CommandRequest, CommandResponse
 
 router = APIRouter(prefix="/api/command", tags=["commands"])
 
 
+def _busy_error(e: DispatcherBusyError) -> HTTPException:
+    """429 response for a full command queue."""
+    return HTTPException(
+        status_code=429,
+        detail={"error": str(e), "retryAfter": e.retry_after, "queuePosition": e.position},
+        headers={"Retry-After": str(e.retry_after)},
+    )
+
+
+async def _complete(message: str, user: str) -> str:
+    """Run a chat completion and extract the reply text."""
+    client = get_openclaw_client()
+    result = await client.chat_completion(message=message, user=user)
+    
+    # Extract response from OpenAI-style response
+    choices = result.get("choices", [])
+    if not choices:
+        raise ValueError("No response received")
+    return choices[0].get("message", {}).get("content", "")
+
+
 @router.post("", response_model=CommandResponse)
-async def send_command(request: CommandRequest):
+async def send_command(
+    request: CommandRequest,
+    run_async: bool = Query(False, alias="async", description="Return a job id instead of waiting"),
+):
     """Send a command to the agent."""
-    client = get_openclaw_client()
+    user = request.session_key or "figgy-portal"
     
-    try:
-        result = await client.chat_completion(
-            message=request.message,
-            user=request.session_key or "figgy-portal",
-        )
-        
-        # Extract response from OpenAI-style response
-        choices = result.get("choices", [])
-        if choices:
-            content = choices[0].get("message", {}).get("content", "")
-            return CommandResponse(ok=True, response=content)
-        
-        return CommandResponse(ok=False, error="No response received")
+    if run_async:
+        store = get_command_job_store()
+        try:
+            job = store.submit(user, lambda: _complete(request.message, user))
+        except DispatcherBusyError as e:
+            raise _busy_error(e)
+        return CommandResponse(ok=True, job_id=job.id, status=job.status)
     
+    dispatcher = get_command_dispatcher()
+    try:
+        content = await dispatcher.run(user, lambda: _complete(request.message, user))
+        return CommandResponse(ok=True, response=content)
+    except DispatcherBusyError as e:
+        raise _busy_error(e)
     except Exception as e:
         return CommandResponse(ok=False, error=str(e))
 
 
+@router.get("/jobs/{job_id}")
+async def get_command_job(job_id: str):
+    """Get the status and result of an async command."""
+    store = get_command_job_store()
+    job = store.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return store.describe(job)
+
+
+@router.get("/jobs/{job_id}/events")
+async def stream_command_job(job_id: str):
+    """Stream status updates for an async command as server-sent events."""
+    store = get_command_job_store()
+    job = store.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    
+    async def events():
+        while True:
+            yield f"event: status\ndata: {json.dumps(store.describe(job))}\n\n"
+            if job.done:
+                return
+            # Wake on status change, or periodically to refresh the queue position
+            await job.wait_changed(timeout=15.0)
+    
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.delete("/jobs/{job_id}")
+async def cancel_command_job(job_id: str):
+    """Cancel a queued or running async command."""
+    store = get_command_job_store()
+    job = store.cancel(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return store.describe(job)
+
+
+@router.get("/queue")
+async def get_command_queue(session_key: Optional[str] = None):
+    """Get in-flight and queued command counts, overall and per session."""
+    dispatcher = get_command_dispatcher()
+    return dispatcher.snapshot(session_key)
+
+
 @router.post("/send")
 async def send_to_session(
     message: str,
@@ -48,3 +130,53 @@ async def send_to_session(
         return result
     except Exception as e:
         raise HTTPException(status_code=502, detail=f"Gateway error: {e}")
+
+
+@router.post("/broadcast")
+async def broadcast(request: BroadcastRequest):
+    """Send a message to every session matching the filters, concurrently."""
+    client = get_openclaw_client()
+    settings = get_settings()
+    
+    try:
+        sessions = await client.get_sessions(active_minutes=request.active_minutes)
+    except Exception as e:
+        raise HTTPException(status_code=502, detail=f"Gateway error: {e}")
+    
+    wanted = set(request.session_keys) if request.session_keys is not None else None
+    targets = [
+        session.get("key")
+        for session in sessions
+        if session.get("key")
+        and (wanted is None or session.get("key") in wanted)
+        and (request.channel is None or session.get("channel") == request.channel)
+        and (request.label is None or session.get("label") == request.label)
+    ]
+    
+    if request.dry_run or not targets:
+        return {"ok": True, "targets": targets, "delivered": 0, "failed": 0, "results": []}
+    
+    semaphore = asyncio.Semaphore(settings.broadcast_concurrency)
+    bucket = TokenBucket(settings.broadcast_rate_per_second)
+    
+    async def deliver(session_key: str) -> dict:
+        async with semaphore:
+            await bucket.acquire()
+            try:
+                result = await client.send_to_session(message=request.message, session_key=session_key)
+                if result.get("ok"):
+                    return {"sessionKey": session_key, "ok": True, "result": result.get("result")}
+                return {"sessionKey": session_key, "ok": False, "error": result.get("error", "Send failed")}
+            except Exception as e:
+                return {"sessionKey": session_key, "ok": False, "error": str(e)}
+    
+    results = await asyncio.gather(*(deliver(key) for key in targets))
+    failed = sum(1 for r in results if not r["ok"])
+    
+    return {
+        "ok": failed == 0,
+        "targets": targets,
+        "delivered": len(results) - failed,
+        "failed": failed,
+        "results": results,
+    }
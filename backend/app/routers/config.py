@@ -1,20 +1,40 @@
 """Gateway configuration endpoints."""
 
 import json
-from fastapi import APIRouter, HTTPException
+from typing import Optional
+from fastapi import APIRouter, Header, HTTPException, Response
+from ..responses import FastJSONResponse, etag_matches
+from ..services.config_batcher import get_config_batcher
+from ..services.config_mirror import ConfigConflictError, get_config_mirror
 from ..services.openclaw import get_openclaw_client
+from ..services.warmup import get_cache_warmer
 from ..models.schemas import ConfigResponse, ConfigPatchRequest
 
 router = APIRouter(prefix="/api/config", tags=["config"])
 
 
 @router.get("", response_model=ConfigResponse)
-async def get_config():
-    """Get current gateway configuration."""
+async def get_config(
+    response: Response,
+    refresh: bool = False,
+    if_none_match: Optional[str] = Header(None),
+):
+    """Get current gateway configuration.
+    
+    The ETag is the gateway's config hash, so an unchanged config is
+    answered with 304 before anything is serialized.
+    """
     client = get_openclaw_client()
+    mirror = get_config_mirror()
     
     try:
-        result = await client.get_config()
+        result = await mirror.get(client, force=refresh)
+        config_hash = result.get("hash", "")
+        if config_hash:
+            etag = f'"{config_hash}"'
+            if etag_matches(if_none_match, etag):
+                return Response(status_code=304, headers={"ETag": etag})
+            response.headers["ETag"] = etag
         return ConfigResponse(
             config=result.get("config", {}),
             hash=result.get("hash", ""),
@@ -27,33 +47,39 @@ async def get_config():
 async def patch_config(request: ConfigPatchRequest):
     """Patch gateway configuration."""
     client = get_openclaw_client()
+    batcher = get_config_batcher()
     
     try:
-        result = await client.patch_config(request.patch, request.base_hash)
+        result = await batcher.submit(client, request.patch, request.base_hash or None)
         return result
+    except ConfigConflictError as e:
+        raise HTTPException(status_code=409, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=502, detail=f"Gateway error: {e}")
 
 
 @router.post("/restart")
 async def restart_gateway():
-    """Restart the gateway."""
+    """Restart the gateway, then reconnect and re-warm caches in the background."""
     client = get_openclaw_client()
     
     try:
         result = await client.restart_gateway()
+        get_config_mirror().invalidate(schema=True)
+        get_cache_warmer().start(client, after_restart=True)
         return result
     except Exception as e:
         raise HTTPException(status_code=502, detail=f"Gateway error: {e}")
 
 
 @router.get("/schema")
-async def get_config_schema():
+async def get_config_schema(refresh: bool = False):
     """Get the configuration schema."""
     client = get_openclaw_client()
+    mirror = get_config_mirror()
     
     try:
-        result = await client.get_config_schema()
-        return result
+        result = await mirror.get_schema(client, force=refresh)
+        return FastJSONResponse(result)
     except Exception as e:
         raise HTTPException(status_code=502, detail=f"Gateway error: {e}")
@@ -1,9 +1,15 @@
 """Cron/scheduled tasks endpoints."""
 
+import asyncio
+import time
 from typing import Optional
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query
 from pydantic import BaseModel, Field
+from ..config import get_settings
+from ..responses import FastJSONResponse, parse_fields, project
+from ..services.cron_stats import get_cron_stats_store
 from ..services.openclaw import get_openclaw_client
+from ..services.schedule import build_timeline
 
 router = APIRouter(prefix="/api/cron", tags=["cron"])
 
@@ -65,6 +71,13 @@ class UpdateJobRequest(BaseModel):
     enabled: Optional[bool] = None
 
 
+class BulkJobRequest(BaseModel):
+    """Request to apply one action to many cron jobs."""
+    jobIds: list[str] = Field(..., min_length=1)
+    action: str = Field(..., pattern="^(pause|resume|delete|run)$")
+    concurrency: Optional[int] = Field(None, ge=1, le=64)
+
+
 # --- Endpoints ---
 
 @router.get("/status")
@@ -79,14 +92,69 @@ async def cron_status():
         raise HTTPException(status_code=502, detail=f"Gateway error: {e}")
 
 
-@router.get("/jobs")
-async def list_jobs(include_disabled: bool = False):
-    """List all cron jobs."""
+@router.get("/timeline")
+async def get_timeline(
+    from_ms: Optional[int] = Query(None, alias="from", description="Window start (epoch ms), default now"),
+    to_ms: Optional[int] = Query(None, alias="to", description="Window end (epoch ms), default from + 24h"),
+    limit: int = Query(50, ge=1, le=1000, description="Max fire times per job"),
+    burst_window_ms: int = Query(60_000, ge=1000, description="Window for burst detection"),
+    burst_threshold: int = Query(5, ge=2, description="Runs within the window that count as a burst"),
+    include_disabled: bool = False,
+):
+    """Get upcoming fire times for all jobs, evaluated locally, with burst detection."""
     client = get_openclaw_client()
     
+    if from_ms is None:
+        from_ms = int(time.time() * 1000)
+    if to_ms is None:
+        to_ms = from_ms + 24 * 60 * 60 * 1000
+    if to_ms < from_ms:
+        raise HTTPException(status_code=400, detail="'to' must not be before 'from'")
+    
     try:
         result = await client.cron_list(include_disabled=include_disabled)
-        return result
+    except Exception as e:
+        raise HTTPException(status_code=502, detail=f"Gateway error: {e}")
+    
+    return build_timeline(
+        result.get("jobs", []),
+        from_ms,
+        to_ms,
+        per_job_limit=limit,
+        burst_window_ms=burst_window_ms,
+        burst_threshold=burst_threshold,
+        include_disabled=include_disabled,
+    )
+
+
+@router.get("/stats")
+async def get_stats(refresh: bool = Query(False, description="Force an ingest before reading")):
+    """Get fleet-wide and per-job run statistics (failure rate, p50/p95 duration, last outcomes)."""
+    client = get_openclaw_client()
+    store = get_cron_stats_store()
+    
+    try:
+        return await store.get_overview(client, force=refresh)
+    except Exception as e:
+        raise HTTPException(status_code=502, detail=f"Gateway error: {e}")
+
+
+@router.get("/jobs")
+async def list_jobs(
+    include_disabled: bool = False,
+    fields: Optional[str] = Query(None, description="Comma-separated job fields to return"),
+):
+    """List all cron jobs (served from the cached job list)."""
+    client = get_openclaw_client()
+    
+    try:
+        result = await get_cron_stats_store().get_jobs(client)
+        if not include_disabled:
+            result = dict(result, jobs=[j for j in result.get("jobs", []) if j.get("enabled", True)])
+        selected = parse_fields(fields)
+        if selected is not None and "jobs" in result:
+            result = dict(result, jobs=project(result["jobs"], selected))
+        return FastJSONResponse(result)
     except Exception as e:
         raise HTTPException(status_code=502, detail=f"Gateway error: {e}")
 
@@ -118,11 +186,50 @@ async def create_job(request: CreateJobRequest):
             "enabled": request.enabled,
         }
         result = await client.cron_add(job)
+        await get_cron_stats_store().invalidate_jobs()
         return result
     except Exception as e:
         raise HTTPException(status_code=502, detail=f"Gateway error: {e}")
 
 
+@router.post("/jobs/bulk")
+async def bulk_jobs(request: BulkJobRequest):
+    """Pause, resume, delete or run many jobs concurrently."""
+    client = get_openclaw_client()
+    settings = get_settings()
+    
+    actions = {
+        "pause": lambda job_id: client.cron_update(job_id, {"enabled": False}),
+        "resume": lambda job_id: client.cron_update(job_id, {"enabled": True}),
+        "delete": client.cron_remove,
+        "run": client.cron_run,
+    }
+    call = actions[request.action]
+    semaphore = asyncio.Semaphore(request.concurrency or settings.cron_bulk_concurrency)
+    
+    async def apply(job_id: str) -> dict:
+        async with semaphore:
+            try:
+                result = await call(job_id)
+                return {"jobId": job_id, "ok": True, "result": result}
+            except Exception as e:
+                return {"jobId": job_id, "ok": False, "error": str(e)}
+    
+    # Deduplicate while keeping the caller's order
+    job_ids = list(dict.fromkeys(request.jobIds))
+    results = await asyncio.gather(*(apply(job_id) for job_id in job_ids))
+    await get_cron_stats_store().invalidate_jobs()
+    failed = sum(1 for r in results if not r["ok"])
+    
+    return {
+        "ok": failed == 0,
+        "action": request.action,
+        "succeeded": len(results) - failed,
+        "failed": failed,
+        "results": results,
+    }
+
+
 @router.get("/jobs/{job_id}")
 async def get_job(job_id: str):
     """Get a specific job's details."""
@@ -159,6 +266,7 @@ async def update_job(job_id: str, request: UpdateJobRequest):
             patch["enabled"] = request.enabled
         
         result = await client.cron_update(job_id, patch)
+        await get_cron_stats_store().invalidate_jobs()
         return result
     except Exception as e:
         raise HTTPException(status_code=502, detail=f"Gateway error: {e}")
@@ -171,6 +279,7 @@ async def delete_job(job_id: str):
     
     try:
         result = await client.cron_remove(job_id)
+        await get_cron_stats_store().invalidate_jobs()
         return result
     except Exception as e:
         raise HTTPException(status_code=502, detail=f"Gateway error: {e}")
@@ -183,6 +292,7 @@ async def run_job(job_id: str):
     
     try:
         result = await client.cron_run(job_id)
+        await get_cron_stats_store().invalidate_jobs()
         return result
     except Exception as e:
         raise HTTPException(status_code=502, detail=f"Gateway error: {e}")
@@ -195,6 +305,7 @@ async def pause_job(job_id: str):
     
     try:
         result = await client.cron_update(job_id, {"enabled": False})
+        await get_cron_stats_store().invalidate_jobs()
         return result
     except Exception as e:
         raise HTTPException(status_code=502, detail=f"Gateway error: {e}")
@@ -207,6 +318,7 @@ async def resume_job(job_id: str):
     
     try:
         result = await client.cron_update(job_id, {"enabled": True})
+        await get_cron_stats_store().invalidate_jobs()
         return result
     except Exception as e:
         raise HTTPException(status_code=502, detail=f"Gateway error: {e}")
@@ -0,0 +1,55 @@
+"""Composite dashboard snapshot endpoint."""
+
+import asyncio
+import time
+from typing import Any, Awaitable, Callable
+from fastapi import APIRouter, HTTPException
+from pydantic import BaseModel
+from ..config import get_settings
+from ..responses import FastJSONResponse, content_etag
+from . import cron, queue, status
+
+router = APIRouter(prefix="/api/dashboard", tags=["dashboard"])
+
+# Timing fields that differ on every call; left out of the ETag
+_CLOCK_FIELDS = ("generatedAt", "fetchedAt", "latencyMs", *status.HEALTH_CLOCK_FIELDS)
+
+
+async def _section(fetch: Callable[[], Awaitable[Any]], timeout: float) -> dict:
+    """Run one part of the snapshot, capturing errors and timing instead of raising."""
+    started = time.time()
+    try:
+        data = await asyncio.wait_for(fetch(), timeout)
+        if isinstance(data, BaseModel):
+            data = data.model_dump()
+        section = {"ok": True, "data": data}
+    except asyncio.TimeoutError:
+        section = {"ok": False, "error": f"Timed out after {timeout:g}s"}
+    except HTTPException as e:
+        section = {"ok": False, "error": e.detail}
+    except Exception as e:
+        section = {"ok": False, "error": str(e)}
+    finished = time.time()
+    section["fetchedAt"] = int(finished * 1000)
+    section["latencyMs"] = int((finished - started) * 1000)
+    return section
+
+
+@router.get("")
+async def get_dashboard():
+    """Get status, health, queue and cron status in one call, fetched concurrently.
+    
+    The ETag ignores the timing fields, so polling clients get 304 until
+    the data itself changes.
+    """
+    timeout = get_settings().dashboard_part_timeout_seconds
+    parts = {
+        "status": status.get_agent_status,
+        "health": status.gateway_health,
+        "queue": queue.get_queue_status,
+        "cron": cron.cron_status,
+    }
+    sections = await asyncio.gather(*(_section(fetch, timeout) for fetch in parts.values()))
+    result = dict(zip(parts, sections))
+    result["generatedAt"] = int(time.time() * 1000)
+    return FastJSONResponse(result, headers={"ETag": content_etag(result, _CLOCK_FIELDS)})
@@ -0,0 +1,132 @@
+"""Aggregated views across a fleet of gateways."""
+
+import asyncio
+import heapq
+import time
+from typing import Optional
+from fastapi import APIRouter, Query
+from ..config import get_settings
+from ..responses import FastJSONResponse, parse_fields, project
+from ..services.fleet import get_fleet
+from ..services.openclaw import OpenClawClient
+from .logs import to_log_message
+
+router = APIRouter(prefix="/api/fleet", tags=["fleet"])
+
+
+def _gateway_summary(results: list[dict]) -> list[dict]:
+    """Per-gateway outcome of a fan-out, without the data."""
+    return [
+        {"gateway": r["gateway"], "ok": r["ok"], "error": r["error"], "latencyMs": r["latencyMs"]}
+        for r in results
+    ]
+
+
+@router.get("")
+async def list_gateways():
+    """List the gateways in the fleet."""
+    return {"gateways": get_fleet().gateways()}
+
+
+@router.get("/status")
+async def get_fleet_status():
+    """Get agent status for every gateway, fetched concurrently."""
+    
+    async def fetch(client: OpenClawClient) -> dict:
+        status, sessions = await asyncio.gather(
+            client.get_session_status(),
+            client.get_sessions(active_minutes=5),
+        )
+        return {
+            "busy": status.get("busy", False),
+            "current_session": status.get("sessionKey"),
+            "last_activity": status.get("lastActivity"),
+            "active_sessions": len(sessions),
+            "model": status.get("model"),
+        }
+    
+    results = await get_fleet().fan_out(fetch)
+    ok = [r["data"] for r in results if r["ok"]]
+    return {
+        "gateways": results,
+        "busy": any(s["busy"] for s in ok),
+        "active_sessions": sum(s["active_sessions"] for s in ok),
+        "generatedAt": int(time.time() * 1000),
+    }
+
+
+@router.get("/sessions")
+async def get_fleet_sessions(
+    active_minutes: Optional[int] = Query(None, description="Only sessions active in the last N minutes"),
+    limit: int = Query(200, ge=1, le=5000),
+    fields: Optional[str] = Query(None, description="Comma-separated session fields to return"),
+):
+    """List sessions across the fleet, newest first, tagged with their gateway."""
+    results = await get_fleet().fan_out(lambda client: client.get_sessions(active_minutes=active_minutes))
+    sessions = [
+        dict(session, gateway=r["gateway"])
+        for r in results if r["ok"]
+        for session in r["data"]
+    ]
+    newest = heapq.nlargest(limit, sessions, key=lambda s: s.get("updatedAt") or 0)
+    return FastJSONResponse({
+        "sessions": project(newest, parse_fields(fields)),
+        "total": len(sessions),
+        "gateways": _gateway_summary(results),
+    })
+
+
+@router.get("/logs")
+async def get_fleet_logs(
+    role: Optional[str] = Query(None, description="Filter by role (user/assistant/system/tool)"),
+    search: Optional[str] = Query(None, description="Search in message content"),
+    limit: int = Query(100, ge=1, le=500),
+    sessions_per_gateway: int = Query(10, ge=1, le=50, description="Most recent sessions read per gateway"),
+    include_tools: bool = Query(False, description="Include tool call messages"),
+    fields: Optional[str] = Query(None, description="Comma-separated message fields to return"),
+):
+    """Get recent messages across the fleet, newest first."""
+    concurrency = get_settings().fleet_history_concurrency
+    
+    async def fetch(client: OpenClawClient) -> list[dict]:
+        sessions = await client.get_sessions()
+        recent = heapq.nlargest(sessions_per_gateway, sessions, key=lambda s: s.get("updatedAt") or 0)
+        semaphore = asyncio.Semaphore(concurrency)
+        
+        async def read(session: dict) -> list[dict]:
+            async with semaphore:
+                try:
+                    messages = await client.get_session_history(session.get("key", ""), 50, include_tools)
+                except Exception:
+                    # Skip sessions that fail to load
+                    return []
+            normalized = (to_log_message(m, session, role=role, search=search) for m in messages or [])
+            return [m.model_dump() for m in normalized if m is not None]
+        
+        batches = await asyncio.gather(*(read(s) for s in recent))
+        return [message for batch in batches for message in batch]
+    
+    results = await get_fleet().fan_out(fetch)
+    messages = [
+        dict(message, gateway=r["gateway"])
+        for r in results if r["ok"]
+        for message in r["data"]
+    ]
+    newest = heapq.nlargest(limit, messages, key=lambda m: m.get("timestamp") or 0)
+    return FastJSONResponse({
+        "messages": project(newest, parse_fields(fields)),
+        "total": len(messages),
+        "gateways": _gateway_summary(results),
+    })
+
+
+@router.get("/cron")
+async def get_fleet_cron(include_disabled: bool = False):
+    """List cron jobs across the fleet, tagged with their gateway."""
+    results = await get_fleet().fan_out(lambda client: client.cron_list(include_disabled=include_disabled))
+    jobs = [
+        dict(job, gateway=r["gateway"])
+        for r in results if r["ok"]
+        for job in r["data"].get("jobs", [])
+    ]
+    return {"jobs": jobs, "gateways": _gateway_summary(results)}
@@ -5,7 +5,9 @@ from typing import Optional, List
 from datetime import datetime
 from fastapi import APIRouter, HTTPException, Query
 from pydantic import BaseModel
+from ..responses import FastJSONResponse, parse_fields, project
 from ..services.openclaw import get_openclaw_client
+from ..services.sessions_index import get_sessions_index
 
 router = APIRouter(prefix="/api/logs", tags=["logs"])
 
@@ -31,6 +33,66 @@ class LogsResponse(BaseModel):
     has_more: bool
 
 
+def to_log_message(
+    msg: dict,
+    session: dict,
+    role: Optional[str] = None,
+    search: Optional[str] = None,
+) -> Optional[LogMessage]:
+    """Normalize a history message into a LogMessage.
+    
+    Returns None if the message has no content or doesn't match the filters.
+    """
+    sess_key = session.get("key", "")
+    msg_content = ""
+    msg_tool_name = None
+    
+    # Extract content based on message structure
+    content_field = msg.get("content")
+    if isinstance(content_field, str):
+        msg_content = content_field
+    elif isinstance(content_field, list):
+        # Handle content blocks
+        for block in content_field:
+            if isinstance(block, dict):
+                if block.get("type") == "text":
+                    msg_content += block.get("text", "")
+                elif block.get("type") == "toolCall":
+                    msg_tool_name = block.get("name")
+                    msg_content += f"[Tool: {msg_tool_name}]"
+                elif block.get("type") == "toolResult":
+                    msg_content += f"[Tool Result]"
+    
+    # Skip if no content
+    if not msg_content.strip():
+        return None
+    
+    # Apply role filter
+    msg_role = msg.get("role", "unknown")
+    if role and role != msg_role:
+        return None
+    
+    # Apply search filter
+    if search and search.lower() not in msg_content.lower():
+        return None
+    
+    # Get usage info if available
+    usage = msg.get("usage", {})
+    
+    return LogMessage(
+        session_key=sess_key,
+        session_name=session.get("displayName") or sess_key[:40],
+        channel=session.get("channel"),
+        role=msg_role,
+        content=msg_content[:2000],  # Truncate long messages
+        timestamp=msg.get("timestamp"),
+        model=msg.get("model") or session.get("model"),
+        tool_name=msg_tool_name,
+        tokens_in=usage.get("input"),
+        tokens_out=usage.get("output"),
+    )
+
+
 @router.get("", response_model=LogsResponse)
 async def get_logs(
     session_key: Optional[str] = Query(None, description="Filter by session key"),
@@ -40,6 +102,7 @@ async def get_logs(
     limit: int = Query(100, ge=1, le=500),
     offset: int = Query(0, ge=0),
     include_tools: bool = Query(False, description="Include tool call messages"),
+    fields: Optional[str] = Query(None, description="Comma-separated message fields to return"),
 ):
     """Get aggregated logs from all sessions with search and filtering."""
     client = get_openclaw_client()
@@ -53,8 +116,6 @@ async def get_logs(
         for session in sessions[:50]:  # Limit to 50 sessions for performance
             sess_key = session.get("key", "")
             sess_channel = session.get("channel")
-            sess_name = session.get("displayName") or sess_key[:40]
-            sess_model = session.get("model")
             
             # Apply session/channel filters early
             if session_key and session_key not in sess_key:
@@ -81,54 +142,9 @@ async def get_logs(
                 messages = details.get("messages", details.get("history", []))
                 
                 for msg in messages:
-                    msg_role = msg.get("role", "unknown")
-                    msg_content = ""
-                    msg_tool_name = None
-                    msg_timestamp = msg.get("timestamp")
-                    
-                    # Extract content based on message structure
-                    content_field = msg.get("content")
-                    if isinstance(content_field, str):
-                        msg_content = content_field
-                    elif isinstance(content_field, list):
-                        # Handle content blocks
-                        for block in content_field:
-                            if isinstance(block, dict):
-                                if block.get("type") == "text":
-                                    msg_content += block.get("text", "")
-                                elif block.get("type") == "toolCall":
-                                    msg_tool_name = block.get("name")
-                                    msg_content += f"[Tool: {msg_tool_name}]"
-                                elif block.get("type") == "toolResult":
-                                    msg_content += f"[Tool Result]"
-                    
-                    # Skip if no content
-                    if not msg_content.strip():
-                        continue
-                    
-                    # Apply role filter
-                    if role and role != msg_role:
-                        continue
-                    
-                    # Apply search filter
-                    if search and search.lower() not in msg_content.lower():
-                        continue
-                    
-                    # Get usage info if available
-                    usage = msg.get("usage", {})
-                    
-                    all_messages.append(LogMessage(
-                        session_key=sess_key,
-                        session_name=sess_name,
-                        channel=sess_channel,
-                        role=msg_role,
-                        content=msg_content[:2000],  # Truncate long messages
-                        timestamp=msg_timestamp,
-                        model=msg.get("model") or sess_model,
-                        tool_name=msg_tool_name,
-                        tokens_in=usage.get("input"),
-                        tokens_out=usage.get("output"),
-                    ))
+                    log_message = to_log_message(msg, session, role=role, search=search)
+                    if log_message is not None:
+                        all_messages.append(log_message)
             except Exception:
                 # Skip sessions that fail to load
                 continue
@@ -140,11 +156,19 @@ async def get_logs(
         total = len(all_messages)
         paginated = all_messages[offset:offset + limit]
         
-        return LogsResponse(
+        selected = parse_fields(fields)
+        if selected is not None:
+            return FastJSONResponse({
+                "messages": project(paginated, selected),
+                "total": total,
+                "has_more": (offset + limit) < total,
+            })
+        # Messages are already validated; skip response_model re-validation
+        return FastJSONResponse(LogsResponse(
             messages=paginated,
             total=total,
             has_more=(offset + limit) < total,
-        )
+        ))
     except Exception as e:
         raise HTTPException(status_code=502, detail=f"Gateway error: {e}")
 
@@ -153,12 +177,14 @@ async def get_logs(
 async def get_log_sessions():
     """Get list of sessions with message counts for log filtering."""
     client = get_openclaw_client()
+    index = get_sessions_index()
     
     try:
-        sessions = await client.get_sessions()
+        await index.refresh(client)
         
+        # Index is already ordered by most recent
         session_info = []
-        for session in sessions:
+        for session in index.recent():
             session_info.append({
                 "key": session.get("key"),
                 "displayName": session.get("displayName") or session.get("key", "")[:40],
@@ -167,9 +193,6 @@ async def get_log_sessions():
                 "updatedAt": session.get("updatedAt"),
             })
         
-        # Sort by most recent
-        session_info.sort(key=lambda s: s.get("updatedAt") or 0, reverse=True)
-        
         return {"sessions": session_info}
     except Exception as e:
         raise HTTPException(status_code=502, detail=f"Gateway error: {e}")
@@ -179,16 +202,10 @@ async def get_log_sessions():
 async def get_log_channels():
     """Get unique channels for filtering."""
     client = get_openclaw_client()
+    index = get_sessions_index()
     
     try:
-        sessions = await client.get_sessions()
-        channels = set()
-        
-        for session in sessions:
-            ch = session.get("channel")
-            if ch:
-                channels.add(ch)
-        
-        return {"channels": sorted(list(channels))}
+        await index.refresh(client)
+        return {"channels": index.channels()}
     except Exception as e:
         raise HTTPException(status_code=502, detail=f"Gateway error: {e}")
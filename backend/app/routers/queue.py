@@ -1,9 +1,15 @@
 """Queue status and configuration endpoints."""
 
+import asyncio
+import time
 from typing import Optional
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query
 from pydantic import BaseModel
+from ..services.config_batcher import get_config_batcher
+from ..services.config_mirror import ConfigConflictError, get_config_mirror
 from ..services.openclaw import get_openclaw_client
+from ..services.sampler import get_queue_sampler, session_queue_depth
+from ..services.sessions_index import get_sessions_index
 
 router = APIRouter(prefix="/api/queue", tags=["queue"])
 
@@ -20,18 +26,20 @@ class QueueConfigUpdate(BaseModel):
 async def get_queue_status():
     """Get queue status including active sessions and their queue info."""
     client = get_openclaw_client()
+    mirror = get_config_mirror()
+    index = get_sessions_index()
     
     try:
-        # Get current config for queue settings
-        config_result = await client.get_config()
+        # Get current config for queue settings and sessions for queue depth info
+        config_result, _ = await asyncio.gather(mirror.get(client), index.refresh(client))
         config = config_result.get("config", {})
         
         # Extract queue config
         messages_config = config.get("messages", {})
         queue_config = messages_config.get("queue", {})
         
-        # Get sessions to show queue depth info
-        sessions = await client.get_sessions()
+        # Most recently updated sessions first
+        sessions = index.recent()
         
         # Build queue status
         session_queue_info = []
@@ -43,6 +51,7 @@ async def get_queue_status():
                 "channel": session.get("channel"),
                 "updatedAt": session.get("updatedAt"),
                 "model": session.get("model"),
+                "queueDepth": session_queue_depth(session),
             })
         
         return {
@@ -59,10 +68,32 @@ async def get_queue_status():
         raise HTTPException(status_code=502, detail=f"Gateway error: {e}")
 
 
+@router.get("/history")
+async def get_queue_history(
+    from_ms: Optional[int] = Query(None, alias="from", description="Window start (epoch ms), default to - 1h"),
+    to_ms: Optional[int] = Query(None, alias="to", description="Window end (epoch ms), default now"),
+    resolution: Optional[str] = Query(None, pattern="^(raw|1m|15m)$", description="Default picks by window size"),
+    session_key: Optional[str] = Query(None, description="Include queue state for one session"),
+):
+    """Get sampled busy/active/queue history (served locally, no gateway calls)."""
+    sampler = get_queue_sampler()
+    
+    if to_ms is None:
+        to_ms = int(time.time() * 1000)
+    if from_ms is None:
+        from_ms = to_ms - 60 * 60 * 1000
+    if to_ms < from_ms:
+        raise HTTPException(status_code=400, detail="'to' must not be before 'from'")
+    
+    await sampler.sync()
+    return sampler.history(from_ms, to_ms, resolution=resolution, session_key=session_key)
+
+
 @router.patch("/config")
 async def update_queue_config(request: QueueConfigUpdate):
     """Update queue configuration."""
     client = get_openclaw_client()
+    batcher = get_config_batcher()
     
     try:
         # Build the patch for messages.queue
@@ -79,14 +110,12 @@ async def update_queue_config(request: QueueConfigUpdate):
         if not queue_patch:
             return {"ok": True, "message": "No changes"}
         
-        # Get current config hash
-        config_result = await client.get_config()
-        base_hash = config_result.get("hash", "")
-        
-        # Apply patch
+        # Apply patch (coalesced with other edits in the debounce window)
         patch = {"messages": {"queue": queue_patch}}
-        result = await client.patch_config(patch, base_hash)
+        result = await batcher.submit(client, patch)
         
         return {"ok": True, "result": result}
+    except ConfigConflictError as e:
+        raise HTTPException(status_code=409, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=502, detail=f"Gateway error: {e}")
@@ -2,7 +2,10 @@
 
 from fastapi import APIRouter, HTTPException, Query
 from typing import Optional
+from ..responses import FastJSONResponse, parse_fields, project
+from ..services.history_cache import get_history_cache
 from ..services.openclaw import get_openclaw_client
+from ..services.sessions_index import get_sessions_index
 from ..models.schemas import Session
 
 router = APIRouter(prefix="/api/sessions", tags=["sessions"])
@@ -11,15 +14,37 @@ router = APIRouter(prefix="/api/sessions", tags=["sessions"])
 @router.get("")
 async def list_sessions(
     active_minutes: Optional[int] = Query(None, description="Filter to recently active sessions"),
+    channel: Optional[str] = Query(None, description="Filter by channel"),
+    model: Optional[str] = Query(None, description="Filter by model"),
+    q: Optional[str] = Query(None, description="Prefix match on key or display name"),
+    sort: str = Query("-updatedAt", pattern="^-?(updatedAt|key|displayName)$"),
+    limit: Optional[int] = Query(None, ge=1, le=1000),
+    cursor: Optional[str] = Query(None, description="nextCursor from a previous page"),
+    fields: Optional[str] = Query(None, description="Comma-separated session fields to return"),
 ):
-    """List all sessions."""
+    """List sessions from the local index with filtering, sorting and pagination."""
     client = get_openclaw_client()
+    index = get_sessions_index()
     
     try:
-        sessions = await client.get_sessions(active_minutes=active_minutes)
-        return {"sessions": sessions}
+        await index.refresh(client)
     except Exception as e:
         raise HTTPException(status_code=502, detail=f"Gateway error: {e}")
+    
+    try:
+        result = index.query(
+            channel=channel,
+            model=model,
+            q=q,
+            active_minutes=active_minutes,
+            sort=sort,
+            limit=limit,
+            cursor=cursor,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    result["sessions"] = project(result["sessions"], parse_fields(fields))
+    return FastJSONResponse(result)
 
 
 @router.get("/{session_key:path}/status")
@@ -39,21 +64,24 @@ async def get_session_history(
     session_key: str,
     limit: int = Query(50, ge=1, le=500),
     include_tools: bool = Query(False),
+    since: Optional[str] = Query(None, description="Cursor from a previous response; only newer messages are returned"),
+    refresh: bool = Query(False, description="Bypass the cache and re-fetch the full window"),
 ):
-    """Get message history for a session."""
+    """Get message history for a session (cached, fetching only new messages)."""
     client = get_openclaw_client()
+    cache = get_history_cache()
     
     try:
-        result = await client.invoke_tool(
-            "sessions_history",
-            args={
-                "sessionKey": session_key,
-                "limit": limit,
-                "includeTools": include_tools,
-            },
+        result = await cache.get(
+            client,
+            session_key,
+            limit=limit,
+            include_tools=include_tools,
+            since=since,
+            refresh=refresh,
         )
-        if result.get("ok"):
-            return result.get("result", {})
+        if result is not None:
+            return result
         raise HTTPException(status_code=404, detail="Session not found")
     except HTTPException:
         raise
@@ -1,11 +1,18 @@
 """Status and health endpoints."""
 
-from fastapi import APIRouter, HTTPException
+import asyncio
+from fastapi import APIRouter, HTTPException, Response
+from ..responses import content_etag
+from ..services.activity import get_activity_monitor
+from ..services.health_probe import get_health_prober
 from ..services.openclaw import get_openclaw_client
 from ..models.schemas import AgentStatus, GatewayHealth
 
 router = APIRouter(prefix="/api/status", tags=["status"])
 
+# Health fields that change on every probe; left out of the ETag
+HEALTH_CLOCK_FIELDS = ("last_checked_at", "latency_ms", "uptime_seconds")
+
 
 @router.get("")
 async def get_agent_status():
@@ -13,9 +20,12 @@ async def get_agent_status():
     client = get_openclaw_client()
     
     try:
-        # Get session status
-        status = await client.get_session_status()
-        sessions = await client.get_sessions(active_minutes=5)
+        # Get session status and recent sessions concurrently
+        status, sessions = await asyncio.gather(
+            client.get_session_status(),
+            client.get_sessions(active_minutes=5),
+        )
+        get_activity_monitor().note_status(status)
         
         # Find busy sessions - check for running/busy status
         busy_sessions = []
@@ -50,12 +60,25 @@ async def get_agent_status():
 
 
 @router.get("/health", response_model=GatewayHealth)
-async def get_gateway_health():
-    """Get gateway health information."""
+async def get_gateway_health(response: Response):
+    """Get gateway health information (cached from the background probe)."""
+    health = await gateway_health()
+    response.headers["ETag"] = content_etag(health, HEALTH_CLOCK_FIELDS)
+    return health
+
+
+async def gateway_health() -> GatewayHealth:
+    """Gateway health from the background probe, as returned by /api/status/health."""
     client = get_openclaw_client()
+    prober = get_health_prober()
     
     try:
-        health = await client.health_check()
+        health = await prober.get(client)
+        probe_info = {
+            "last_checked_at": health.get("lastCheckedAt"),
+            "latency_ms": health.get("latencyMs"),
+            "since": health.get("since"),
+        }
         
         if health.get("ok"):
             data = health.get("data", {})
@@ -63,11 +86,13 @@ async def get_gateway_health():
                 ok=True,
                 uptime_seconds=data.get("uptimeSeconds") or data.get("uptime_seconds"),
                 channels=data.get("channels", {}),
+                **probe_info,
             )
         else:
             return GatewayHealth(
                 ok=False,
-                channels={"error": health.get("error", "Unknown error")},
+                channels={"error": health.get("error") or "Unknown error"},
+                **probe_info,
             )
     except Exception as e:
         return GatewayHealth(ok=False, channels={"error": str(e)})
@@ -0,0 +1,150 @@
+"""Agent activity and client presence, for pacing background gateway polling."""
+
+import asyncio
+import time
+from typing import Optional
+from ..config import get_settings
+from .shared_cache import get_cache_backend
+
+
+# How often a worker publishes "a client was seen" to the shared cache
+_PUBLISH_SECONDS = 10.0
+
+
+class ActivityMonitor:
+    """Tracks whether the agent is active and whether anyone is watching.
+    
+    Agent activity comes from session status (`busy`, `lastActivity`) seen
+    by any poller or request. Clients count as connected while a request is
+    open (e.g. an event stream) or for a while after their last request.
+    With a shared cache backend, client presence is published so the worker
+    running the pollers sees clients served by the other workers.
+    """
+    
+    def __init__(self):
+        self.settings = get_settings()
+        self.busy = False
+        self.last_activity_ms: Optional[float] = None
+        self.open_requests = 0
+        self.last_client_seen = 0.0
+        self._published_at = 0.0
+        self._wake = asyncio.Event()
+    
+    def _notify(self):
+        """Wake sleeping pollers so they re-evaluate their interval now."""
+        self._wake.set()
+        self._wake.clear()
+    
+    def agent_active(self) -> bool:
+        if self.busy:
+            return True
+        if self.last_activity_ms is None:
+            return False
+        return time.time() * 1000 - self.last_activity_ms <= self.settings.polling_active_window_seconds * 1000
+    
+    def note_status(self, status: dict):
+        """Record agent activity from a session_status result."""
+        was_active = self.agent_active()
+        self.busy = bool(status.get("busy", False))
+        last_activity = status.get("lastActivity")
+        if isinstance(last_activity, (int, float)):
+            self.last_activity_ms = max(self.last_activity_ms or 0, last_activity)
+        if self.agent_active() and not was_active:
+            self._notify()
+    
+    def _clients_seen_locally(self) -> bool:
+        return (
+            self.open_requests > 0
+            or time.time() - self.last_client_seen <= self.settings.polling_client_window_seconds
+        )
+    
+    def client_opened(self):
+        """Record the start of an API request."""
+        was_watched = self._clients_seen_locally()
+        self.open_requests += 1
+        self.last_client_seen = time.time()
+        if not was_watched:
+            self._notify()
+        backend = get_cache_backend()
+        if backend.shared and self.last_client_seen - self._published_at >= _PUBLISH_SECONDS:
+            self._published_at = self.last_client_seen
+            asyncio.create_task(backend.set("clients_seen", self.last_client_seen))
+    
+    def client_closed(self):
+        """Record the end of an API request."""
+        self.open_requests = max(0, self.open_requests - 1)
+        self.last_client_seen = time.time()
+    
+    async def clients_connected(self) -> bool:
+        """Whether any client has used the API recently (on any worker)."""
+        if self._clients_seen_locally():
+            return True
+        backend = get_cache_backend()
+        if backend.shared:
+            entry = await backend.get("clients_seen")
+            if entry is not None:
+                return time.time() - entry[0] <= self.settings.polling_client_window_seconds
+        return False
+    
+    async def wait(self, timeout: float) -> bool:
+        """Sleep up to `timeout`; returns True if woken early by new activity."""
+        try:
+            await asyncio.wait_for(self._wake.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+
+class AdaptiveSchedule:
+    """Polling interval for one background poller.
+    
+    While the agent is active the poller runs at `base` divided by the
+    speedup. While idle the interval starts at `base` and doubles (by the
+    backoff factor) each idle round, up to one cap while clients are
+    connected and a longer one while nobody is watching, and never past
+    `max_interval` if given. New activity or a returning client wakes the
+    poller immediately.
+    """
+    
+    def __init__(self, base: float, max_interval: Optional[float] = None):
+        self.settings = get_settings()
+        self.base = base
+        self.max_interval = max_interval
+        self._idle_rounds = 0
+    
+    def next_interval(self, agent_active: bool, clients: bool) -> float:
+        settings = self.settings
+        if not settings.polling_adaptive:
+            return self.base
+        if agent_active:
+            self._idle_rounds = 0
+            return self.base / max(1.0, settings.polling_active_speedup)
+        cap = settings.polling_idle_max_seconds if clients else settings.polling_unwatched_max_seconds
+        cap = max(cap, self.base)
+        if self.max_interval is not None:
+            cap = min(cap, self.max_interval)
+        interval = min(self.base * settings.polling_idle_backoff ** self._idle_rounds, cap)
+        if interval < cap:
+            self._idle_rounds += 1
+        return interval
+    
+    async def sleep(self, monitor: ActivityMonitor) -> float:
+        """Sleep until the next poll is due. Returns the planned interval."""
+        interval = self.next_interval(monitor.agent_active(), await monitor.clients_connected())
+        if not self.settings.polling_adaptive:
+            await asyncio.sleep(interval)
+        elif await monitor.wait(interval):
+            self._idle_rounds = 0
+        return interval
+
+
+# Singleton instance
+_monitor: Optional[ActivityMonitor] = None
+
+
+def get_activity_monitor() -> ActivityMonitor:
+    """Get or create activity monitor instance."""
+    global _monitor
+    if _monitor is None:
+        _monitor = ActivityMonitor()
+    return _monitor
@@ -0,0 +1,217 @@
+"""Admission control for gateway calls: priority lanes, rate limits and load shedding."""
+
+import asyncio
+import heapq
+import itertools
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Iterator, Optional
+from ..config import get_settings
+from .metrics import GATEWAY_ADMISSIONS
+from .ratelimit import TokenBucket
+from .resilience import DeadlineExceededError, LoadShedError, remaining_time
+
+
+INTERACTIVE = "interactive"
+WRITE = "write"
+BACKGROUND = "background"
+POLL = "poll"
+
+# Highest priority first
+PRIORITIES = (INTERACTIVE, WRITE, BACKGROUND, POLL)
+
+# GET routes that dashboards poll on a timer
+POLL_ROUTES = {
+    "/api/status",
+    "/api/status/health",
+    "/api/sessions",
+    "/api/queue/status",
+    "/api/cron/status",
+    "/api/cron/timeline",
+    "/api/cron/stats",
+    "/api/cron/jobs",
+    "/api/logs",
+    "/api/logs/sessions",
+    "/api/logs/channels",
+    "/api/dashboard",
+}
+
+# Lane for gateway calls made in this context; work outside a request is background
+_priority: ContextVar[str] = ContextVar("gateway_priority", default=BACKGROUND)
+
+# Whether shed reads made in this context may be answered with a stale response
+_stale_ok: ContextVar[bool] = ContextVar("gateway_stale_ok", default=True)
+
+
+def classify(method: str, path: str) -> str:
+    """Priority lane for an API request."""
+    path = path.rstrip("/") or "/"
+    if path.startswith("/api/command"):
+        return INTERACTIVE
+    if method not in ("GET", "HEAD"):
+        return WRITE
+    if path in POLL_ROUTES or path.startswith("/api/fleet"):
+        return POLL
+    return INTERACTIVE
+
+
+@contextmanager
+def priority_scope(priority: str) -> Iterator[None]:
+    """Set the lane for gateway calls made in this context."""
+    token = _priority.set(priority)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+def current_priority() -> str:
+    return _priority.get()
+
+
+@contextmanager
+def fresh_scope() -> Iterator[None]:
+    """Never answer gateway reads made in this context with a stale response.
+    
+    For work whose point is the gateway's current state (health probes,
+    samples, cache warm-up): its calls queue for admission instead of being
+    shed.
+    """
+    token = _stale_ok.set(False)
+    try:
+        yield
+    finally:
+        _stale_ok.reset(token)
+
+
+def stale_allowed() -> bool:
+    return _stale_ok.get()
+
+
+class AdmissionController:
+    """Admits gateway calls by priority lane.
+    
+    Every lane has a token bucket capping how fast it starts calls, and all
+    lanes share `max_in_flight` slots. Interactive and write calls wait for
+    a token and a slot (bounded by the request deadline), and freed slots go
+    to the highest-priority waiter first. Poll and background calls that
+    have a stale response to fall back on are shed instead of waiting, once
+    their bucket is empty or in-flight calls pass their lane's threshold
+    (polls first). Without one, or inside a `fresh_scope`, they queue behind
+    the higher lanes.
+    """
+    
+    def __init__(self):
+        self.settings = get_settings()
+        self.enabled = self.settings.admission_enabled
+        self.max_in_flight = max(1, self.settings.admission_max_in_flight)
+        rates = {
+            INTERACTIVE: self.settings.admission_interactive_rate,
+            WRITE: self.settings.admission_write_rate,
+            BACKGROUND: self.settings.admission_background_rate,
+            POLL: self.settings.admission_poll_rate,
+        }
+        self.buckets = {
+            priority: TokenBucket(rate, rate * self.settings.admission_burst_seconds)
+            for priority, rate in rates.items()
+        }
+        self.shed_at = {
+            BACKGROUND: self.settings.admission_background_shed_at * self.max_in_flight,
+            POLL: self.settings.admission_poll_shed_at * self.max_in_flight,
+        }
+        self.in_flight = 0
+        self._waiters: list[tuple[int, int, asyncio.Future]] = []
+        self._seq = itertools.count()
+    
+    def _shed(self, priority: str) -> bool:
+        """Whether a sheddable call should be dropped right now."""
+        if self._waiters or self.in_flight >= self.shed_at[priority]:
+            return True
+        return not self.buckets[priority].try_acquire()
+    
+    async def acquire(self, priority: str, sheddable: bool = True):
+        """Take a slot for a gateway call, waiting or shedding as the lane dictates.
+        
+        `sheddable` says whether the caller can do without the call (e.g. it
+        has a stale response to serve).
+        """
+        if not self.enabled:
+            return
+        if priority in self.shed_at and sheddable:
+            if self._shed(priority):
+                GATEWAY_ADMISSIONS.inc(priority, "shed")
+                raise LoadShedError(priority)
+        else:
+            try:
+                await asyncio.wait_for(self.buckets[priority].acquire(), remaining_time())
+            except asyncio.TimeoutError:
+                raise DeadlineExceededError("Request deadline exceeded waiting for gateway admission")
+        if self.in_flight < self.max_in_flight and not self._waiters:
+            self.in_flight += 1
+            GATEWAY_ADMISSIONS.inc(priority, "admitted")
+            return
+        
+        GATEWAY_ADMISSIONS.inc(priority, "queued")
+        waiter = asyncio.get_running_loop().create_future()
+        entry = (PRIORITIES.index(priority), next(self._seq), waiter)
+        heapq.heappush(self._waiters, entry)
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter), remaining_time())
+        except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+            if waiter.done() and not waiter.cancelled():
+                # The slot was handed over just as we gave up
+                self.release()
+            else:
+                waiter.cancel()
+                self._waiters.remove(entry)
+                heapq.heapify(self._waiters)
+            if isinstance(e, asyncio.TimeoutError):
+                raise DeadlineExceededError("Request deadline exceeded waiting for gateway admission")
+            raise
+    
+    def release(self):
+        """Free a slot, handing it to the highest-priority waiter if any."""
+        if not self.enabled:
+            return
+        while self._waiters:
+            _, _, waiter = heapq.heappop(self._waiters)
+            if not waiter.done():
+                # The slot passes straight to the waiter; in_flight is unchanged
+                waiter.set_result(None)
+                return
+        self.in_flight = max(0, self.in_flight - 1)
+    
+    def snapshot(self) -> dict:
+        waiting = {priority: 0 for priority in PRIORITIES}
+        for rank, _, _ in self._waiters:
+            waiting[PRIORITIES[rank]] += 1
+        return {"inFlight": self.in_flight, "max": self.max_in_flight, "waiting": waiting}
+
+
+class StaleResponses:
+    """Last good response per read request (LRU), served when a call is shed.
+    
+    Served responses are copies marked `"stale": True`.
+    """
+    
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, Any] = OrderedDict()
+    
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries
+    
+    def get(self, key: str) -> Optional[Any]:
+        value = self._entries.get(key)
+        if value is not None:
+            self._entries.move_to_end(key)
+        return value
+    
+    def put(self, key: str, value: Any):
+        if self.max_entries <= 0:
+            return
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
@@ -0,0 +1,152 @@
+"""Background command jobs with a bounded, TTL-evicted result store."""
+
+import asyncio
+import time
+import uuid
+from collections import OrderedDict
+from typing import Awaitable, Callable, Optional
+from ..config import get_settings
+from .dispatcher import CommandDispatcher, get_command_dispatcher
+from .resilience import deadline_scope
+
+
+TERMINAL_STATUSES = {"succeeded", "failed", "cancelled"}
+
+
+class CommandJob:
+    """A command running (or finished) in the background."""
+    
+    def __init__(self, session_key: str, ticket: int):
+        self.id = uuid.uuid4().hex
+        self.session_key = session_key
+        self.ticket = ticket
+        self.status = "queued"
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.response: Optional[str] = None
+        self.error: Optional[str] = None
+        self.task: Optional[asyncio.Task] = None
+        self._changed = asyncio.Event()
+    
+    @property
+    def done(self) -> bool:
+        return self.status in TERMINAL_STATUSES
+    
+    def _set_status(self, status: str):
+        """Update status and wake anyone waiting for a change."""
+        self.status = status
+        if status == "running":
+            self.started_at = time.time()
+        elif status in TERMINAL_STATUSES:
+            self.finished_at = time.time()
+        self._changed.set()
+        self._changed = asyncio.Event()
+    
+    async def wait_changed(self, timeout: float) -> bool:
+        """Wait for the next status change. Returns False on timeout."""
+        try:
+            await asyncio.wait_for(self._changed.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+
+class CommandJobStore:
+    """Runs commands as background jobs and keeps their results for a while.
+    
+    Jobs go through the command dispatcher, so they share its per-session and
+    global limits; admission happens when the job is submitted. Finished jobs
+    are evicted after a TTL, and the oldest finished jobs go first when the
+    store is full.
+    """
+    
+    def __init__(self, dispatcher: CommandDispatcher):
+        self.settings = get_settings()
+        self.dispatcher = dispatcher
+        self._jobs: OrderedDict[str, CommandJob] = OrderedDict()
+    
+    def _evict(self):
+        """Drop expired finished jobs, then the oldest finished jobs over capacity."""
+        now = time.time()
+        ttl = self.settings.command_job_ttl_seconds
+        for job_id, job in list(self._jobs.items()):
+            if job.done and now - job.finished_at > ttl:
+                del self._jobs[job_id]
+        overflow = len(self._jobs) - self.settings.command_job_max
+        if overflow > 0:
+            for job_id, job in list(self._jobs.items()):
+                if overflow <= 0:
+                    break
+                if job.done:
+                    del self._jobs[job_id]
+                    overflow -= 1
+    
+    def submit(self, session_key: str, call: Callable[[], Awaitable[str]]) -> CommandJob:
+        """Start a job. Raises DispatcherBusyError if the session queue is full."""
+        self._evict()
+        ticket = self.dispatcher.reserve(session_key)
+        job = CommandJob(session_key, ticket)
+        
+        async def execute():
+            async def start():
+                job._set_status("running")
+                return await call()
+            
+            try:
+                # Outlives the request that submitted it, so drop its deadline
+                with deadline_scope(None):
+                    job.response = await self.dispatcher.run(session_key, start, ticket=ticket)
+                job._set_status("succeeded")
+            except asyncio.CancelledError:
+                job._set_status("cancelled")
+            except Exception as e:
+                job.error = str(e)
+                job._set_status("failed")
+        
+        job.task = asyncio.create_task(execute())
+        # Covers a job cancelled before it started running
+        job.task.add_done_callback(lambda _: self.dispatcher.release(session_key, ticket))
+        self._jobs[job.id] = job
+        return job
+    
+    def get(self, job_id: str) -> Optional[CommandJob]:
+        """Look up a job."""
+        self._evict()
+        return self._jobs.get(job_id)
+    
+    def cancel(self, job_id: str) -> Optional[CommandJob]:
+        """Cancel a queued or running job."""
+        job = self.get(job_id)
+        if job is None:
+            return None
+        if not job.done and job.task:
+            job.task.cancel()
+            job._set_status("cancelled")
+        return job
+    
+    def describe(self, job: CommandJob) -> dict:
+        """JSON-friendly view of a job."""
+        return {
+            "jobId": job.id,
+            "sessionKey": job.session_key,
+            "status": job.status,
+            "queuePosition": self.dispatcher.position(job.session_key, job.ticket),
+            "createdAt": int(job.created_at * 1000),
+            "startedAt": int(job.started_at * 1000) if job.started_at else None,
+            "finishedAt": int(job.finished_at * 1000) if job.finished_at else None,
+            "response": job.response,
+            "error": job.error,
+        }
+
+
+# Singleton instance
+_store: Optional[CommandJobStore] = None
+
+
+def get_command_job_store() -> CommandJobStore:
+    """Get or create command job store instance."""
+    global _store
+    if _store is None:
+        _store = CommandJobStore(get_command_dispatcher())
+    return _store
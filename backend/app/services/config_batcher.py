@@ -0,0 +1,130 @@
+"""Debounced coalescing of gateway config patches."""
+
+import asyncio
+import copy
+from typing import Any, Optional
+from ..config import get_settings
+from .config_mirror import ConfigMirror, get_config_mirror
+from .openclaw import OpenClawClient
+
+
+def combine_patches(first: dict, second: dict) -> dict:
+    """Compose two merge patches into one (later values win, nulls kept as deletes)."""
+    result = copy.deepcopy(first)
+    for key, value in second.items():
+        if isinstance(value, dict) and isinstance(result.get(key), dict):
+            result[key] = combine_patches(result[key], value)
+        else:
+            result[key] = copy.deepcopy(value)
+    return result
+
+
+def _composable(first: dict, second: dict) -> bool:
+    """Whether composing the patches gives the same result as applying them in turn.
+    
+    A delete or scalar set followed by a nested set can't be expressed as one
+    merge patch: in turn, the nested set replaces the scalar, but merged it
+    would be deep-merged into the original value.
+    """
+    for key, value in second.items():
+        if not isinstance(value, dict) or key not in first:
+            continue
+        if not isinstance(first[key], dict) or not _composable(first[key], value):
+            return False
+    return True
+
+
+class _Batch:
+    """Patches waiting to be sent together against the same base hash."""
+    
+    def __init__(self, base_hash: Optional[str], started: float):
+        self.base_hash = base_hash
+        self.started = started
+        self.patch: dict[str, Any] = {}
+        self.waiters: list[asyncio.Future] = []
+        self.timer: Optional[asyncio.TimerHandle] = None
+
+
+class ConfigPatchBatcher:
+    """Write-behind batcher for config patches.
+    
+    Patches arriving within the debounce window are deep-merged and sent as a
+    single config.patch through the config mirror; every waiting caller gets
+    the combined result. The window restarts on each patch but a batch is
+    never held longer than the max wait.
+    """
+    
+    def __init__(self, mirror: ConfigMirror):
+        self.settings = get_settings()
+        self.mirror = mirror
+        self._pending: dict[Optional[str], _Batch] = {}
+        self._sending: set[asyncio.Task] = set()
+    
+    async def submit(
+        self,
+        client: OpenClawClient,
+        patch: dict,
+        base_hash: Optional[str] = None,
+    ) -> dict:
+        """Queue a patch and wait for the batched gateway result."""
+        if self.settings.config_patch_debounce_ms <= 0:
+            return await self.mirror.patch(client, patch, base_hash)
+        
+        loop = asyncio.get_running_loop()
+        batch = self._pending.get(base_hash)
+        if batch is not None and not _composable(batch.patch, patch):
+            self._flush(client, base_hash)
+            batch = None
+        if batch is None:
+            batch = self._pending[base_hash] = _Batch(base_hash, loop.time())
+        
+        batch.patch = combine_patches(batch.patch, patch)
+        waiter = loop.create_future()
+        batch.waiters.append(waiter)
+        
+        # Restart the debounce window, capped by the max wait for this batch
+        if batch.timer:
+            batch.timer.cancel()
+        window = self.settings.config_patch_debounce_ms / 1000
+        remaining = self.settings.config_patch_max_wait_ms / 1000 - (loop.time() - batch.started)
+        batch.timer = loop.call_later(
+            max(0.0, min(window, remaining)), self._flush, client, base_hash
+        )
+        
+        return await waiter
+    
+    def _flush(self, client: OpenClawClient, base_hash: Optional[str]):
+        """Send the pending batch for a base hash."""
+        batch = self._pending.pop(base_hash, None)
+        if batch is None:
+            return
+        if batch.timer:
+            batch.timer.cancel()
+        task = asyncio.ensure_future(self._send(client, batch))
+        self._sending.add(task)
+        task.add_done_callback(self._sending.discard)
+    
+    async def _send(self, client: OpenClawClient, batch: _Batch):
+        """Apply a batch and complete its waiters."""
+        try:
+            result = await self.mirror.patch(client, batch.patch, batch.base_hash)
+        except Exception as e:
+            for waiter in batch.waiters:
+                if not waiter.done():
+                    waiter.set_exception(e)
+            return
+        for waiter in batch.waiters:
+            if not waiter.done():
+                waiter.set_result(result)
+
+
+# Singleton instance
+_batcher: Optional[ConfigPatchBatcher] = None
+
+
+def get_config_batcher() -> ConfigPatchBatcher:
+    """Get or create config patch batcher instance."""
+    global _batcher
+    if _batcher is None:
+        _batcher = ConfigPatchBatcher(get_config_mirror())
+    return _batcher
@@ -0,0 +1,247 @@
+"""Local mirror of the gateway config with hash tracking."""
+
+import asyncio
+import copy
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+import httpx
+from ..config import get_settings
+from .metrics import CACHE_REQUESTS
+from .openclaw import OpenClawClient
+from .shared_cache import get_cache_backend
+
+
+# Sentinel for "path not present" when comparing configs
+_MISSING = object()
+
+# Number of recent config versions kept for conflict checks
+_SNAPSHOT_HISTORY = 8
+
+# What the gateway says when a patch's baseHash is stale
+_CONFLICT_MESSAGE = "config changed since last load"
+
+
+class ConfigConflictError(Exception):
+    """Raised when a patch conflicts with a concurrent edit and can't be retried."""
+
+
+def merge_patch(target: Any, patch: Any) -> Any:
+    """Apply a JSON merge patch (RFC 7386) and return the result as a new value."""
+    if not isinstance(patch, dict):
+        return copy.deepcopy(patch)
+    result = copy.deepcopy(target) if isinstance(target, dict) else {}
+    for key, value in patch.items():
+        if value is None:
+            result.pop(key, None)
+        else:
+            result[key] = merge_patch(result.get(key), value)
+    return result
+
+
+def _patch_paths(patch: dict, prefix: tuple = ()) -> list[tuple]:
+    """Leaf paths touched by a merge patch."""
+    paths = []
+    for key, value in patch.items():
+        path = prefix + (key,)
+        if isinstance(value, dict) and value:
+            paths.extend(_patch_paths(value, path))
+        else:
+            paths.append(path)
+    return paths
+
+
+def _get_path(config: Any, path: tuple) -> Any:
+    """Value at a path, or _MISSING."""
+    for key in path:
+        if not isinstance(config, dict) or key not in config:
+            return _MISSING
+        config = config[key]
+    return config
+
+
+def _is_conflict(error: Any) -> bool:
+    """Whether a gateway error is a stale baseHash rejection."""
+    if isinstance(error, httpx.HTTPStatusError):
+        if error.response.status_code == 409:
+            return True
+        error = error.response.text
+    elif isinstance(error, dict):
+        error = error.get("message") or ""
+    return _CONFLICT_MESSAGE in str(error).lower()
+
+
+def _unwrap(result: dict) -> dict:
+    """Get the inner result payload of a gateway config action."""
+    details = result.get("result", {}).get("details", {})
+    return details.get("result", details) if isinstance(details, dict) else {}
+
+
+class ConfigMirror:
+    """Mirror of the gateway config that tracks the current base hash.
+    
+    Readers are served from the mirror while it is fresh. Patches use the
+    tracked hash, so they normally need a single gateway call, and the mirror
+    is updated from the patch response. If the gateway rejects a patch because
+    the config changed underneath it, the config is re-fetched and the patch
+    retried, as long as the concurrent edit didn't touch the same keys.
+    """
+    
+    def __init__(self):
+        self.settings = get_settings()
+        self._config: Optional[dict] = None
+        self._hash = ""
+        self._fetched_at = 0.0
+        self._snapshots: OrderedDict[str, dict] = OrderedDict()
+        self._schema: Optional[dict] = None
+        self._fetch_lock = asyncio.Lock()
+        self._patch_lock = asyncio.Lock()
+    
+    def _store(self, config: dict, config_hash: str):
+        """Record a config version as the current mirror state."""
+        self._config = config
+        self._hash = config_hash
+        self._fetched_at = time.time()
+        if config_hash:
+            self._snapshots[config_hash] = config
+            self._snapshots.move_to_end(config_hash)
+            while len(self._snapshots) > _SNAPSHOT_HISTORY:
+                self._snapshots.popitem(last=False)
+    
+    def _current(self) -> dict:
+        """The mirrored config and hash, copied so callers can't modify the mirror."""
+        return {"config": copy.deepcopy(self._config), "hash": self._hash}
+    
+    def _is_fresh(self) -> bool:
+        """Whether the mirror can serve reads without a gateway call."""
+        return (
+            self._config is not None
+            and time.time() - self._fetched_at <= self.settings.config_mirror_ttl_seconds
+        )
+    
+    def invalidate(self, schema: bool = False):
+        """Force the next read (and optionally schema read) to go to the gateway."""
+        self._fetched_at = 0.0
+        if schema:
+            self._schema = None
+    
+    async def _publish(self):
+        """Share the current config with other workers."""
+        backend = get_cache_backend()
+        if backend.shared and self._config is not None and self._fetched_at:
+            await backend.set("config", {"config": self._config, "hash": self._hash})
+    
+    async def refresh(self, client: OpenClawClient) -> dict:
+        """Fetch the config from the gateway into the mirror."""
+        result = await client.get_config()
+        self._store(result.get("config", {}), result.get("hash", ""))
+        await self._publish()
+        return self._current()
+    
+    async def get(self, client: OpenClawClient, force: bool = False) -> dict:
+        """Get (a copy of) the config and hash, from the mirror if fresh."""
+        if not force and self._is_fresh():
+            CACHE_REQUESTS.inc("config_mirror", "hit")
+            return self._current()
+        async with self._fetch_lock:
+            # Another caller may have refreshed while we waited
+            if not force and self._is_fresh():
+                CACHE_REQUESTS.inc("config_mirror", "hit")
+                return self._current()
+            backend = get_cache_backend()
+            if backend.shared and not force:
+                # Another worker may have fetched (or patched) it recently
+                entry = await backend.get("config")
+                if entry is not None and time.time() - entry[1] <= self.settings.config_mirror_ttl_seconds:
+                    CACHE_REQUESTS.inc("config_mirror", "shared_hit")
+                    self._store(entry[0]["config"], entry[0]["hash"])
+                    self._fetched_at = entry[1]
+                    return self._current()
+            CACHE_REQUESTS.inc("config_mirror", "miss")
+            return await self.refresh(client)
+    
+    async def get_schema(self, client: OpenClawClient, force: bool = False) -> dict:
+        """Get the config schema and uiHints, cached until invalidated (it only changes on upgrade)."""
+        if not force and self._schema is not None:
+            CACHE_REQUESTS.inc("config_schema", "hit")
+            return self._schema
+        CACHE_REQUESTS.inc("config_schema", "miss")
+        schema = await client.get_config_schema()
+        if schema.get("schema"):
+            self._schema = schema
+        return schema
+    
+    def _mergeable(self, patch: dict, base_hash: str) -> bool:
+        """Whether a patch based on `base_hash` can be re-applied to the current config."""
+        base = self._snapshots.get(base_hash)
+        if base is None or self._config is None:
+            return False
+        return all(
+            _get_path(base, path) == _get_path(self._config, path)
+            for path in _patch_paths(patch)
+        )
+    
+    def _apply_result(self, patch: dict, base_hash: str, result: dict):
+        """Update the mirror from a successful patch response."""
+        inner = _unwrap(result)
+        new_hash = inner.get("hash") if isinstance(inner, dict) else None
+        new_config = inner.get("config") if isinstance(inner, dict) else None
+        base = self._snapshots.get(base_hash)
+        
+        if new_hash and isinstance(new_config, dict):
+            self._store(new_config, new_hash)
+        elif new_hash and base is not None:
+            self._store(merge_patch(base, patch), new_hash)
+        else:
+            self.invalidate()
+    
+    async def patch(
+        self,
+        client: OpenClawClient,
+        patch: dict,
+        base_hash: Optional[str] = None,
+    ) -> dict:
+        """Patch the config using the tracked hash, retrying on mergeable conflicts."""
+        async with self._patch_lock:
+            if base_hash is None:
+                base_hash = (await self.get(client))["hash"]
+            
+            attempts = self.settings.config_patch_retries + 1
+            for attempt in range(attempts):
+                try:
+                    result = await client.patch_config(patch, base_hash)
+                    error = None if result.get("ok", True) else result.get("error")
+                except httpx.HTTPStatusError as e:
+                    result, error = None, e
+                
+                if error is None:
+                    self._apply_result(patch, base_hash, result)
+                    await self._publish()
+                    return result
+                if not _is_conflict(error) or attempt == attempts - 1:
+                    break
+                
+                # Stale hash: re-fetch, and retry only if the other edit didn't touch our keys
+                await self.refresh(client)
+                if not self._mergeable(patch, base_hash):
+                    raise ConfigConflictError(
+                        "Config was changed concurrently on the same keys; reload and retry"
+                    )
+                base_hash = self._hash
+            
+            if result is None:
+                raise error
+            self.invalidate()
+            return result
+
+
+# Singleton instance
+_mirror: Optional[ConfigMirror] = None
+
+
+def get_config_mirror() -> ConfigMirror:
+    """Get or create config mirror instance."""
+    global _mirror
+    if _mirror is None:
+        _mirror = ConfigMirror()
+    return _mirror
@@ -0,0 +1,349 @@
+"""Incrementally maintained cron run statistics."""
+
+import asyncio
+import math
+import time
+from bisect import bisect_left, insort
+from collections import deque
+from typing import Optional
+from ..config import get_settings
+from .metrics import CACHE_REQUESTS
+from .openclaw import OpenClawClient
+from .shared_cache import get_cache_backend
+
+
+_FAILED_STATUSES = {"error", "failed", "failure", "timeout"}
+# Runs without a final outcome yet; they're re-read until they finish
+_PENDING_STATUSES = {"running", "pending", "queued", "started", "in_progress", "in-progress"}
+
+
+def _record_time(run: dict) -> int:
+    """Best-effort run timestamp (epoch ms) from a gateway run record."""
+    for key in ("runAtMs", "startedAtMs", "ts", "finishedAtMs"):
+        value = run.get(key)
+        if isinstance(value, (int, float)):
+            return int(value)
+    return 0
+
+
+def _record_duration(run: dict) -> Optional[int]:
+    """Best-effort run duration (ms) from a gateway run record."""
+    duration = run.get("durationMs")
+    if isinstance(duration, (int, float)):
+        return int(duration)
+    started, finished = run.get("startedAtMs"), run.get("finishedAtMs")
+    if isinstance(started, (int, float)) and isinstance(finished, (int, float)):
+        return int(finished - started)
+    return None
+
+
+def _record_status(run: dict) -> str:
+    """Normalize a run record's outcome to ok/error/<gateway status>."""
+    status = run.get("status")
+    if isinstance(status, str) and status:
+        return "error" if status.lower() in _FAILED_STATUSES else status.lower()
+    if run.get("ok") is False or run.get("error"):
+        return "error"
+    return "ok"
+
+
+def _percentile(sorted_values: list[int], pct: float) -> Optional[int]:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return None
+    rank = math.ceil(pct / 100 * len(sorted_values))
+    return sorted_values[max(0, min(len(sorted_values), rank) - 1)]
+
+
+class _JobStats:
+    """Rolling window of run records for a single job."""
+    
+    def __init__(self, window: int):
+        self.name: Optional[str] = None
+        self.high_water_ms = 0
+        self.records: deque[dict] = deque()
+        self.window = window
+        self.durations: list[int] = []  # Sorted durations within the window
+        self.failures = 0
+    
+    def add(self, record: dict) -> Optional[dict]:
+        """Append a record, returning the record evicted from the window (if any)."""
+        self.records.append(record)
+        if record["durationMs"] is not None:
+            insort(self.durations, record["durationMs"])
+        if record["status"] == "error":
+            self.failures += 1
+        self.high_water_ms = max(self.high_water_ms, record["atMs"])
+        
+        if len(self.records) <= self.window:
+            return None
+        evicted = self.records.popleft()
+        if evicted["durationMs"] is not None:
+            del self.durations[bisect_left(self.durations, evicted["durationMs"])]
+        if evicted["status"] == "error":
+            self.failures -= 1
+        return evicted
+    
+    def summary(self, job_id: str, last_n: int) -> dict:
+        """Aggregates for this job's window."""
+        runs = len(self.records)
+        return {
+            "jobId": job_id,
+            "name": self.name,
+            "runs": runs,
+            "failures": self.failures,
+            "failureRate": self.failures / runs if runs else None,
+            "p50DurationMs": _percentile(self.durations, 50),
+            "p95DurationMs": _percentile(self.durations, 95),
+            "lastRunAtMs": self.high_water_ms or None,
+            "lastOutcomes": list(self.records)[-last_n:][::-1],
+        }
+
+
+class CronStatsStore:
+    """Local store of cron run records with rolling fleet-wide aggregates.
+    
+    Run history is ingested per job above a high-water mark, so each refresh
+    only processes new runs, and jobs whose last run is already ingested are
+    not fetched at all. The overview is rebuilt after each ingest and served
+    as-is. The job list itself is cached briefly too, for the jobs route.
+    
+    With a shared cache backend, only the leader worker ingests: it
+    refreshes in the background and publishes the overview, which the other
+    workers serve (they only ingest themselves if it goes stale, e.g. the
+    leader died). The job list is shared too.
+    """
+    
+    def __init__(self):
+        self.settings = get_settings()
+        self._jobs: dict[str, _JobStats] = {}
+        self._fleet_durations: list[int] = []
+        self._fleet_runs = 0
+        self._fleet_failures = 0
+        self._overview: Optional[dict] = None
+        self._refreshed_at = 0.0
+        self._lock = asyncio.Lock()
+        self._job_list: Optional[dict] = None
+        self._job_list_at = 0.0
+        self._job_list_lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+    
+    def _job_list_fresh(self) -> bool:
+        return (
+            self._job_list is not None
+            and time.time() - self._job_list_at <= self.settings.cron_list_ttl_seconds
+        )
+    
+    async def get_jobs(self, client: OpenClawClient, force: bool = False) -> dict:
+        """Get the gateway's job list (including disabled jobs), cached for a short TTL."""
+        if not force and self._job_list_fresh():
+            CACHE_REQUESTS.inc("cron_list", "hit")
+            return self._job_list
+        async with self._job_list_lock:
+            if not force and self._job_list_fresh():
+                CACHE_REQUESTS.inc("cron_list", "hit")
+                return self._job_list
+            backend = get_cache_backend()
+            if backend.shared and not force:
+                entry = await backend.get("cron_jobs")
+                if entry is not None and entry[0] is not None and time.time() - entry[1] <= self.settings.cron_list_ttl_seconds:
+                    CACHE_REQUESTS.inc("cron_list", "shared_hit")
+                    self._job_list, self._job_list_at = entry
+                    return self._job_list
+            CACHE_REQUESTS.inc("cron_list", "miss")
+            self._job_list = await client.cron_list(include_disabled=True)
+            self._job_list_at = time.time()
+            if backend.shared:
+                await backend.set("cron_jobs", self._job_list)
+            return self._job_list
+    
+    async def invalidate_jobs(self):
+        """Drop the cached job list (after a job is created, changed or run), on every worker."""
+        self._job_list = None
+        backend = get_cache_backend()
+        if backend.shared:
+            await backend.set("cron_jobs", None)
+    
+    def _ingest(self, job_id: str, runs: list[dict]) -> int:
+        """Add runs newer than the job's high-water mark. Returns count added.
+        
+        Ingestion stops at the oldest run that hasn't finished, so the
+        high-water mark stays below it and it's read again next time.
+        """
+        stats = self._jobs[job_id]
+        records = []
+        for run in runs:
+            at_ms = _record_time(run)
+            if at_ms <= stats.high_water_ms:
+                continue
+            records.append({
+                "atMs": at_ms,
+                "status": _record_status(run),
+                "durationMs": _record_duration(run),
+                "error": run.get("error"),
+            })
+        records.sort(key=lambda r: r["atMs"])
+        for i, record in enumerate(records):
+            if record["status"] in _PENDING_STATUSES:
+                records = records[:i]
+                break
+        
+        for record in records:
+            self._fleet_runs += 1
+            if record["durationMs"] is not None:
+                insort(self._fleet_durations, record["durationMs"])
+            if record["status"] == "error":
+                self._fleet_failures += 1
+            evicted = stats.add(record)
+            if evicted:
+                self._forget(evicted)
+        return len(records)
+    
+    def _forget(self, record: dict):
+        """Remove a record from the fleet aggregates."""
+        self._fleet_runs -= 1
+        if record["durationMs"] is not None:
+            del self._fleet_durations[bisect_left(self._fleet_durations, record["durationMs"])]
+        if record["status"] == "error":
+            self._fleet_failures -= 1
+    
+    def _drop_job(self, job_id: str):
+        """Remove a job that no longer exists on the gateway."""
+        stats = self._jobs.pop(job_id)
+        for record in stats.records:
+            self._forget(record)
+    
+    def _build_overview(self) -> dict:
+        """Assemble the overview payload from the maintained aggregates."""
+        last_n = self.settings.cron_stats_last_n
+        runs = self._fleet_runs
+        return {
+            "updatedAt": int(self._refreshed_at * 1000),
+            "fleet": {
+                "jobs": len(self._jobs),
+                "runs": runs,
+                "failures": self._fleet_failures,
+                "failureRate": self._fleet_failures / runs if runs else None,
+                "p50DurationMs": _percentile(self._fleet_durations, 50),
+                "p95DurationMs": _percentile(self._fleet_durations, 95),
+            },
+            "jobs": [
+                stats.summary(job_id, last_n) for job_id, stats in self._jobs.items()
+            ],
+        }
+    
+    def _is_fresh(self, max_age: float) -> bool:
+        """Whether the overview was built within the last `max_age` seconds."""
+        return self._overview is not None and time.time() - self._refreshed_at <= max_age
+    
+    async def refresh(self, client: OpenClawClient, max_age: Optional[float] = None):
+        """Fetch new run history for jobs that have run since the last ingest.
+        
+        With `max_age`, concurrent callers that waited on an in-flight refresh
+        reuse its result instead of refreshing again.
+        """
+        async with self._lock:
+            if max_age is not None and self._is_fresh(max_age):
+                return
+            result = await self.get_jobs(client)
+            jobs = result.get("jobs", [])
+            
+            seen = set()
+            to_fetch = []
+            for job in jobs:
+                job_id = job.get("id") or job.get("jobId")
+                if not job_id:
+                    continue
+                seen.add(job_id)
+                stats = self._jobs.get(job_id)
+                if stats is None:
+                    stats = self._jobs[job_id] = _JobStats(self.settings.cron_stats_window)
+                stats.name = job.get("name")
+                
+                # Skip the history fetch when the job's last run is already ingested
+                last_run = (job.get("state") or {}).get("lastRunAtMs")
+                if isinstance(last_run, (int, float)) and last_run <= stats.high_water_ms:
+                    continue
+                to_fetch.append(job_id)
+            
+            for job_id in list(self._jobs):
+                if job_id not in seen:
+                    self._drop_job(job_id)
+            
+            semaphore = asyncio.Semaphore(self.settings.cron_bulk_concurrency)
+            
+            async def fetch(job_id: str):
+                async with semaphore:
+                    try:
+                        return job_id, await client.cron_runs(job_id)
+                    except Exception:
+                        return job_id, None
+            
+            for job_id, history in await asyncio.gather(*(fetch(j) for j in to_fetch)):
+                if history is not None:
+                    self._ingest(job_id, history.get("runs", history.get("entries", [])))
+            
+            self._refreshed_at = time.time()
+            self._overview = self._build_overview()
+        backend = get_cache_backend()
+        if backend.shared:
+            await backend.set("cron_stats", self._overview)
+    
+    async def get_overview(self, client: OpenClawClient, force: bool = False) -> dict:
+        """Get the stats overview, refreshing first if it is stale.
+        
+        Workers that aren't ingesting serve the leader's overview, and only
+        refresh themselves if it's missing or older than two refresh periods.
+        """
+        max_age = self.settings.cron_stats_refresh_seconds
+        backend = get_cache_backend()
+        if backend.shared and self._task is None:
+            entry = await backend.get("cron_stats")
+            if entry is not None and time.time() - entry[1] <= 2 * max_age:
+                CACHE_REQUESTS.inc("cron_stats", "shared_hit")
+                return entry[0]
+        if force:
+            await self.refresh(client)
+        elif not self._is_fresh(max_age):
+            CACHE_REQUESTS.inc("cron_stats", "miss")
+            await self.refresh(client, max_age=max_age)
+        else:
+            CACHE_REQUESTS.inc("cron_stats", "hit")
+        return self._overview
+    
+    async def _run(self, client: OpenClawClient):
+        """Ingestion loop (leader only)."""
+        while True:
+            try:
+                await self.refresh(client)
+            except Exception:
+                # Gateway unavailable; try again next interval
+                pass
+            await asyncio.sleep(self.settings.cron_stats_refresh_seconds)
+    
+    def start(self, client: OpenClawClient):
+        """Start ingesting in the background (in the leader, with a shared backend)."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(client))
+    
+    async def stop(self):
+        """Stop the background ingestion task."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+# Singleton instance
+_store: Optional[CronStatsStore] = None
+
+
+def get_cron_stats_store() -> CronStatsStore:
+    """Get or create cron stats store instance."""
+    global _store
+    if _store is None:
+        _store = CronStatsStore()
+    return _store
@@ -0,0 +1,172 @@
+"""Command dispatcher with per-session and global concurrency limits."""
+
+import asyncio
+import itertools
+import math
+import time
+from collections import deque
+from typing import Awaitable, Callable, Optional, TypeVar
+from ..config import get_settings
+
+
+T = TypeVar("T")
+
+# Assumed command duration before any have completed
+_INITIAL_DURATION_SECONDS = 10.0
+# Weight of the latest duration in the moving average
+_DURATION_ALPHA = 0.2
+
+
+class DispatcherBusyError(Exception):
+    """Raised when a command can't be queued because the limits are reached."""
+    
+    def __init__(self, message: str, retry_after: int, position: int):
+        super().__init__(message)
+        self.retry_after = retry_after
+        self.position = position
+
+
+class _Lane:
+    """Per-session concurrency slot and FIFO of waiting commands."""
+    
+    def __init__(self, limit: int):
+        self.semaphore = asyncio.Semaphore(limit)
+        self.waiting: deque[int] = deque()
+        self.running = 0
+
+
+class CommandDispatcher:
+    """Bounds in-flight agent commands per session and overall.
+    
+    Each session gets a small number of concurrent slots and a bounded queue;
+    a global semaphore caps gateway completions across all sessions. When a
+    queue is full the caller gets a DispatcherBusyError with a Retry-After
+    estimate based on recent command durations.
+    """
+    
+    def __init__(self):
+        self.settings = get_settings()
+        self._lanes: dict[str, _Lane] = {}
+        self._global = asyncio.Semaphore(self.settings.command_max_in_flight)
+        self._tickets = itertools.count()
+        self._waiting_total = 0
+        self._running_total = 0
+        self._avg_duration = _INITIAL_DURATION_SECONDS
+    
+    def _retry_after(self, lane: _Lane) -> int:
+        """Estimate seconds until a slot frees up for this session."""
+        ahead = len(lane.waiting) + lane.running
+        per_slot = ahead / max(1, self.settings.command_session_concurrency)
+        return max(1, math.ceil(self._avg_duration * max(1.0, per_slot)))
+    
+    def reserve(self, session_key: str) -> int:
+        """Take a place in the session's queue, or raise DispatcherBusyError if full.
+        
+        Returns a ticket to pass to `run`.
+        """
+        lane = self._lanes.get(session_key)
+        if lane is None:
+            lane = self._lanes[session_key] = _Lane(self.settings.command_session_concurrency)
+        
+        if len(lane.waiting) >= self.settings.command_session_queue:
+            raise DispatcherBusyError(
+                f"Too many queued commands for session '{session_key}'",
+                retry_after=self._retry_after(lane),
+                position=len(lane.waiting) + 1,
+            )
+        if self._waiting_total >= self.settings.command_global_queue:
+            raise DispatcherBusyError(
+                "Too many queued commands",
+                retry_after=self._retry_after(lane),
+                position=len(lane.waiting) + 1,
+            )
+        
+        ticket = next(self._tickets)
+        lane.waiting.append(ticket)
+        self._waiting_total += 1
+        return ticket
+    
+    def position(self, session_key: str, ticket: int) -> Optional[int]:
+        """1-based queue position of a waiting ticket, or None if not waiting."""
+        lane = self._lanes.get(session_key)
+        if lane is None or ticket not in lane.waiting:
+            return None
+        return lane.waiting.index(ticket) + 1
+    
+    def release(self, session_key: str, ticket: int):
+        """Give up a reserved place that will never be run (no-op if already gone)."""
+        lane = self._lanes.get(session_key)
+        if lane is None or ticket not in lane.waiting:
+            return
+        lane.waiting.remove(ticket)
+        self._waiting_total -= 1
+        if not lane.waiting and not lane.running:
+            del self._lanes[session_key]
+    
+    async def run(
+        self,
+        session_key: str,
+        call: Callable[[], Awaitable[T]],
+        ticket: Optional[int] = None,
+    ) -> T:
+        """Run `call` once a session slot and a global slot are available."""
+        if ticket is None:
+            ticket = self.reserve(session_key)
+        lane = self._lanes[session_key]
+        
+        dequeued = False
+        try:
+            async with lane.semaphore:
+                async with self._global:
+                    lane.waiting.remove(ticket)
+                    self._waiting_total -= 1
+                    dequeued = True
+                    lane.running += 1
+                    self._running_total += 1
+                    started = time.monotonic()
+                    try:
+                        return await call()
+                    finally:
+                        lane.running -= 1
+                        self._running_total -= 1
+                        duration = time.monotonic() - started
+                        self._avg_duration += _DURATION_ALPHA * (duration - self._avg_duration)
+        finally:
+            if not dequeued:
+                lane.waiting.remove(ticket)
+                self._waiting_total -= 1
+            if not lane.waiting and not lane.running and self._lanes.get(session_key) is lane:
+                del self._lanes[session_key]
+    
+    def snapshot(self, session_key: Optional[str] = None) -> dict:
+        """Current in-flight and queued counts."""
+        lanes = self._lanes.items()
+        if session_key is not None:
+            lanes = [(k, v) for k, v in lanes if k == session_key]
+        return {
+            "inFlight": self._running_total,
+            "waiting": self._waiting_total,
+            "maxInFlight": self.settings.command_max_in_flight,
+            "avgDurationSeconds": round(self._avg_duration, 2),
+            "sessions": [
+                {
+                    "sessionKey": key,
+                    "running": lane.running,
+                    "waiting": len(lane.waiting),
+                    "retryAfter": self._retry_after(lane),
+                }
+                for key, lane in lanes
+            ],
+        }
+
+
+# Singleton instance
+_dispatcher: Optional[CommandDispatcher] = None
+
+
+def get_command_dispatcher() -> CommandDispatcher:
+    """Get or create command dispatcher instance."""
+    global _dispatcher
+    if _dispatcher is None:
+        _dispatcher = CommandDispatcher()
+    return _dispatcher
@@ -0,0 +1,75 @@
+"""Fleet of OpenClaw gateways with concurrent fan-out."""
+
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Optional
+from ..config import get_settings
+from .openclaw import OpenClawClient, get_openclaw_client
+
+
+class Fleet:
+    """One pooled client per gateway: the default gateway plus the configured extras.
+    
+    Without extras configured, the fleet is just the default gateway, so the
+    aggregated views work the same on a single node. An extra with the
+    default gateway's URL is skipped rather than queried twice.
+    """
+    
+    def __init__(self):
+        self.settings = get_settings()
+        default = get_openclaw_client()
+        self.clients: dict[str, OpenClawClient] = {"default": default}
+        for target in self.settings.fleet_gateways:
+            if target.url.rstrip("/") == default.base_url.rstrip("/"):
+                continue
+            if target.name in self.clients:
+                raise ValueError(f"Duplicate fleet gateway name '{target.name}'")
+            self.clients[target.name] = OpenClawClient(target.url, target.token)
+    
+    def gateways(self) -> list[dict]:
+        return [{"name": name, "url": client.base_url} for name, client in self.clients.items()]
+    
+    async def fan_out(
+        self,
+        fetch: Callable[[OpenClawClient], Awaitable[Any]],
+        timeout: Optional[float] = None,
+    ) -> list[dict]:
+        """Run `fetch` against every gateway concurrently, each with its own timeout.
+        
+        Returns one entry per gateway with ok/data/error and latency, so a
+        slow or failing gateway only affects its own entry.
+        """
+        timeout = timeout or self.settings.fleet_timeout_seconds
+        
+        async def one(name: str, client: OpenClawClient) -> dict:
+            started = time.monotonic()
+            try:
+                data = await asyncio.wait_for(fetch(client), timeout)
+                result = {"gateway": name, "ok": True, "data": data, "error": None}
+            except asyncio.TimeoutError:
+                result = {"gateway": name, "ok": False, "data": None, "error": f"Timed out after {timeout:g}s"}
+            except Exception as e:
+                result = {"gateway": name, "ok": False, "data": None, "error": str(e)}
+            result["latencyMs"] = int((time.monotonic() - started) * 1000)
+            return result
+        
+        return await asyncio.gather(*(one(name, client) for name, client in self.clients.items()))
+    
+    async def aclose(self):
+        """Close connection pools of the fleet's own clients."""
+        default = get_openclaw_client()
+        for client in self.clients.values():
+            if client is not default:
+                await client.aclose()
+
+
+# Singleton instance
+_fleet: Optional[Fleet] = None
+
+
+def get_fleet() -> Fleet:
+    """Get or create fleet instance."""
+    global _fleet
+    if _fleet is None:
+        _fleet = Fleet()
+    return _fleet
@@ -0,0 +1,150 @@
+"""Background gateway health probe with hysteresis."""
+
+import asyncio
+import time
+from typing import Optional
+from ..config import get_settings
+from .activity import AdaptiveSchedule, get_activity_monitor
+from .openclaw import OpenClawClient
+from .shared_cache import get_cache_backend
+
+
+class HealthProber:
+    """Probes gateway health in the background and caches the result.
+    
+    The reported state only flips after several consecutive results agree,
+    so a single slow or failed probe doesn't make the UI flap. Probes run
+    fast while unhealthy (or while a flip is pending), so recovery is noticed
+    quickly. While healthy they run every `health_interval_seconds`, and
+    faster while the agent is active; they never back off further, so the
+    shared result stays fresh for the other workers.
+    """
+    
+    def __init__(self):
+        self.settings = get_settings()
+        self.healthy: Optional[bool] = None
+        self.data: dict = {}
+        self.error: Optional[str] = None
+        self.last_checked: Optional[float] = None
+        self.latency_ms: Optional[int] = None
+        self.changed_at: Optional[float] = None
+        self._streak = 0  # Consecutive results disagreeing with the reported state
+        interval = self.settings.health_interval_seconds
+        self._schedule = AdaptiveSchedule(interval, max_interval=interval)
+        self._task: Optional[asyncio.Task] = None
+        self._lock = asyncio.Lock()
+    
+    def _record(self, ok: bool, data: dict, error: Optional[str]):
+        """Fold a probe result into the reported state."""
+        if ok:
+            self.data = data
+        if self.healthy is None:
+            self.healthy, self.changed_at = ok, time.time()
+        elif ok == self.healthy:
+            self._streak = 0
+        else:
+            self._streak += 1
+            threshold = (
+                self.settings.health_recover_threshold if ok
+                else self.settings.health_fail_threshold
+            )
+            if self._streak >= threshold:
+                self.healthy, self.changed_at = ok, time.time()
+                self._streak = 0
+        if self.healthy:
+            self.error = None
+        elif not ok:
+            self.error = error
+    
+    async def probe(self, client: OpenClawClient) -> None:
+        """Run one health check now."""
+        async with self._lock:
+            started = time.monotonic()
+            try:
+                result = await asyncio.wait_for(
+                    client.health_check(), self.settings.health_probe_timeout_seconds
+                )
+            except asyncio.TimeoutError:
+                result = {"ok": False, "error": "Gateway timeout"}
+            self.latency_ms = int((time.monotonic() - started) * 1000)
+            self.last_checked = time.time()
+            if result.get("ok"):
+                # The health check is a session_status call
+                get_activity_monitor().note_status(result.get("data", {}))
+            self._record(bool(result.get("ok")), result.get("data", {}), result.get("error"))
+        backend = get_cache_backend()
+        if backend.shared:
+            await backend.set("health", self._snapshot())
+    
+    async def _sleep(self):
+        """Wait until the next probe is due."""
+        if self.healthy and not self._streak:
+            await self._schedule.sleep(get_activity_monitor())
+        else:
+            await asyncio.sleep(self.settings.health_unhealthy_interval_seconds)
+    
+    async def _run(self, client: OpenClawClient):
+        """Probe loop."""
+        while True:
+            try:
+                await self.probe(client)
+            except Exception:
+                pass
+            await self._sleep()
+    
+    def start(self, client: OpenClawClient):
+        """Start the background probe task."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(client))
+    
+    async def stop(self):
+        """Stop the background probe task."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+    
+    async def get(self, client: OpenClawClient) -> dict:
+        """Get the cached health, probing once if nothing has been checked yet.
+        
+        Workers that aren't running the probe read the leader's result from
+        the shared cache, and probe for themselves if it's missing or older
+        than two probe intervals (e.g. the leader died).
+        """
+        backend = get_cache_backend()
+        if backend.shared and self._task is None:
+            max_age = 2 * self.settings.health_interval_seconds
+            entry = await backend.get("health")
+            if entry is not None and time.time() - entry[1] <= max_age:
+                return entry[0]
+            if self.last_checked is None or time.time() - self.last_checked > max_age:
+                await self.probe(client)
+            return self._snapshot()
+        if self.last_checked is None:
+            await self.probe(client)
+        return self._snapshot()
+    
+    def _snapshot(self) -> dict:
+        return {
+            "ok": bool(self.healthy),
+            "data": self.data,
+            "error": self.error,
+            "lastCheckedAt": int(self.last_checked * 1000),
+            "latencyMs": self.latency_ms,
+            "since": int(self.changed_at * 1000) if self.changed_at else None,
+        }
+
+
+# Singleton instance
+_prober: Optional[HealthProber] = None
+
+
+def get_health_prober() -> HealthProber:
+    """Get or create health prober instance."""
+    global _prober
+    if _prober is None:
+        _prober = HealthProber()
+    return _prober
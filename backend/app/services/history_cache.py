@@ -0,0 +1,229 @@
+"""Per-session message history cache with incremental delta fetches."""
+
+import asyncio
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional
+import aiofiles
+from ..config import get_settings
+from .metrics import CACHE_REQUESTS
+from .openclaw import OpenClawClient
+
+
+# Messages requested by the first delta fetch; grows if no overlap is found
+_DELTA_LIMIT = 20
+_DELTA_GROWTH = 4
+
+
+def message_key(message: dict) -> str:
+    """Stable identity for a history message (gateway id, else a content hash)."""
+    for field in ("id", "messageId"):
+        if message.get(field):
+            return str(message[field])
+    raw = json.dumps(
+        [message.get("timestamp"), message.get("role"), message.get("content")],
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:16]
+
+
+class _Entry:
+    """Cached history for one session."""
+    
+    def __init__(self, messages: list[dict], complete: bool):
+        self.messages = messages
+        self.keys = [message_key(m) for m in messages]
+        self.complete = complete  # True if this is the session's entire history
+        self.fetched_at = time.time()
+    
+    def to_json(self) -> dict:
+        return {"messages": self.messages, "complete": self.complete, "fetchedAt": self.fetched_at}
+    
+    @classmethod
+    def from_json(cls, data: dict) -> "_Entry":
+        entry = cls(data.get("messages", []), data.get("complete", False))
+        entry.fetched_at = data.get("fetchedAt", 0.0)
+        return entry
+
+
+class SessionHistoryCache:
+    """LRU cache of session histories.
+    
+    A repeat view fetches a small window of recent messages and merges it in
+    after the last cached message, widening the window only if there's no
+    overlap. Cold sessions are evicted from memory (and spilled to disk when
+    a cache directory is configured).
+    """
+    
+    def __init__(self):
+        self.settings = get_settings()
+        self._entries: OrderedDict[tuple[str, bool], _Entry] = OrderedDict()
+        self._locks: dict[tuple[str, bool], asyncio.Lock] = {}
+        cache_dir = self.settings.history_cache_dir
+        self._dir = Path(cache_dir).expanduser() if cache_dir else None
+    
+    def _path(self, key: tuple[str, bool]) -> Path:
+        digest = hashlib.sha1(f"{key[0]}|{int(key[1])}".encode("utf-8")).hexdigest()
+        return self._dir / f"{digest}.json"
+    
+    async def _load(self, key: tuple[str, bool]) -> Optional[_Entry]:
+        """Load a spilled entry from disk."""
+        if not self._dir:
+            return None
+        path = self._path(key)
+        if not path.exists():
+            return None
+        try:
+            async with aiofiles.open(path, "r", encoding="utf-8") as f:
+                return _Entry.from_json(json.loads(await f.read()))
+        except (OSError, ValueError):
+            return None
+    
+    async def _spill(self, key: tuple[str, bool], entry: _Entry):
+        """Write an entry to disk."""
+        if not self._dir:
+            return
+        try:
+            self._dir.mkdir(parents=True, exist_ok=True)
+            async with aiofiles.open(self._path(key), "w", encoding="utf-8") as f:
+                await f.write(json.dumps(entry.to_json()))
+        except OSError:
+            pass
+    
+    async def _store(self, key: tuple[str, bool], entry: _Entry):
+        """Insert an entry as most recently used and evict cold sessions."""
+        max_messages = self.settings.history_cache_messages
+        if len(entry.messages) > max_messages:
+            entry.messages = entry.messages[-max_messages:]
+            entry.keys = entry.keys[-max_messages:]
+            entry.complete = False
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.settings.history_cache_sessions:
+            cold_key, cold = self._entries.popitem(last=False)
+            self._locks.pop(cold_key, None)
+            await self._spill(cold_key, cold)
+    
+    def _forget(self, key: tuple[str, bool], lock: asyncio.Lock, drop_entry: bool):
+        """Release a session's lock (and optionally its entry) after a failed fetch."""
+        if drop_entry:
+            self._entries.pop(key, None)
+        if key not in self._entries and self._locks.get(key) is lock:
+            self._locks.pop(key, None)
+    
+    async def flush(self):
+        """Spill all in-memory entries to disk (on shutdown)."""
+        for key, entry in list(self._entries.items()):
+            await self._spill(key, entry)
+    
+    async def _fetch_delta(
+        self,
+        client: OpenClawClient,
+        session_key: str,
+        include_tools: bool,
+        entry: _Entry,
+        limit: int,
+    ) -> Optional[_Entry]:
+        """Fetch messages newer than the cached ones and merge them in."""
+        window = _DELTA_LIMIT
+        max_window = max(limit, self.settings.history_cache_messages)
+        last_key = entry.keys[-1] if entry.keys else None
+        
+        while True:
+            fetched = await client.get_session_history(session_key, window, include_tools)
+            if fetched is None:
+                return None
+            keys = [message_key(m) for m in fetched]
+            
+            overlap = None
+            if last_key is not None:
+                for i in range(len(keys) - 1, -1, -1):
+                    if keys[i] == last_key:
+                        overlap = i
+                        break
+            
+            if overlap is not None:
+                entry.messages.extend(fetched[overlap + 1:])
+                entry.keys.extend(keys[overlap + 1:])
+                entry.fetched_at = time.time()
+                return entry
+            if len(fetched) < window or window >= max_window:
+                # Whole history returned without our last message (reset/compacted), or too far behind
+                return _Entry(fetched, complete=len(fetched) < window)
+            window = min(window * _DELTA_GROWTH, max_window)
+    
+    async def get(
+        self,
+        client: OpenClawClient,
+        session_key: str,
+        limit: int = 50,
+        include_tools: bool = False,
+        since: Optional[str] = None,
+        refresh: bool = False,
+    ) -> Optional[dict]:
+        """Get a session's history, fetching only what's new. None if the session isn't found."""
+        key = (session_key, include_tools)
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        
+        async with lock:
+            try:
+                entry = self._entries.get(key)
+                if entry is None and not refresh:
+                    entry = await self._load(key)
+                
+                fresh = entry is not None and time.time() - entry.fetched_at <= self.settings.history_cache_fresh_seconds
+                has_enough = entry is not None and (entry.complete or len(entry.messages) >= limit)
+                
+                if refresh or not has_enough:
+                    CACHE_REQUESTS.inc("session_history", "miss")
+                    fetched = await client.get_session_history(session_key, limit, include_tools)
+                    if fetched is None:
+                        self._forget(key, lock, drop_entry=True)
+                        return None
+                    entry = _Entry(fetched, complete=len(fetched) < limit)
+                elif not fresh:
+                    CACHE_REQUESTS.inc("session_history", "partial")
+                    entry = await self._fetch_delta(client, session_key, include_tools, entry, limit)
+                    if entry is None:
+                        self._forget(key, lock, drop_entry=True)
+                        return None
+                else:
+                    CACHE_REQUESTS.inc("session_history", "hit")
+                await self._store(key, entry)
+                
+                messages, keys = entry.messages[-limit:], entry.keys[-limit:]
+                reset = False
+                if since is not None:
+                    try:
+                        start = len(entry.keys) - 1 - entry.keys[::-1].index(since)
+                        messages = entry.messages[start + 1:][-limit:]
+                    except ValueError:
+                        # Cursor is no longer in the cache; send the latest window instead
+                        reset = True
+                
+                return {
+                    "messages": messages,
+                    "cursor": keys[-1] if keys else since,
+                    "reset": reset,
+                    "complete": entry.complete and len(entry.messages) <= limit,
+                }
+            except Exception:
+                # Don't keep a lock around for a session we never managed to cache
+                self._forget(key, lock, drop_entry=False)
+                raise
+
+
+# Singleton instance
+_cache: Optional[SessionHistoryCache] = None
+
+
+def get_history_cache() -> SessionHistoryCache:
+    """Get or create session history cache instance."""
+    global _cache
+    if _cache is None:
+        _cache = SessionHistoryCache()
+    return _cache
@@ -0,0 +1,91 @@
+"""Leader election between worker processes on the same host."""
+
+import asyncio
+import fcntl
+import os
+from pathlib import Path
+from typing import Awaitable, Callable, Optional
+from ..config import get_settings
+from .shared_cache import default_cache_path, get_cache_backend
+
+
+class LeaderElector:
+    """Elects one worker to run background pollers, via an exclusive file lock.
+    
+    The lock is released by the OS when the holding process exits, so a
+    follower that keeps retrying takes over when the leader dies. Without a
+    shared cache backend there is nothing to coordinate and every process is
+    its own leader.
+    """
+    
+    def __init__(self):
+        self.settings = get_settings()
+        self.is_leader = False
+        self._fd: Optional[int] = None
+        self._task: Optional[asyncio.Task] = None
+        if get_cache_backend().shared:
+            lock_path = self.settings.leader_lock_path or (self.settings.cache_path or default_cache_path()) + ".leader"
+            self._lock_path: Optional[Path] = Path(lock_path).expanduser()
+        else:
+            self._lock_path = None
+    
+    def try_acquire(self) -> bool:
+        """Take leadership if no other process holds it."""
+        if self.is_leader:
+            return True
+        if self._lock_path is None:
+            self.is_leader = True
+            return True
+        fd = os.open(self._lock_path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            os.close(fd)
+            return False
+        os.ftruncate(fd, 0)
+        os.write(fd, str(os.getpid()).encode("ascii"))
+        self._fd = fd
+        self.is_leader = True
+        return True
+    
+    def release(self):
+        """Give up leadership."""
+        if self._fd is not None:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+            os.close(self._fd)
+            self._fd = None
+        self.is_leader = False
+    
+    async def _run(self, on_elected: Callable[[], Awaitable[None]]):
+        """Retry until elected, then run the callback."""
+        while not self.try_acquire():
+            await asyncio.sleep(self.settings.leader_retry_seconds)
+        await on_elected()
+    
+    def start(self, on_elected: Callable[[], Awaitable[None]]):
+        """Campaign for leadership in the background, calling `on_elected` once elected."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(on_elected))
+    
+    async def stop(self):
+        """Stop campaigning and release leadership."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self.release()
+
+
+# Singleton instance
+_elector: Optional[LeaderElector] = None
+
+
+def get_leader_elector() -> LeaderElector:
+    """Get or create leader elector instance."""
+    global _elector
+    if _elector is None:
+        _elector = LeaderElector()
+    return _elector
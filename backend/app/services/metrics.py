@@ -0,0 +1,232 @@
+"""In-process metrics with Prometheus text exposition."""
+
+import asyncio
+import time
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from typing import Callable, Iterable, Optional
+
+
+# Seconds; covers fast cache hits through slow chat completions
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: tuple[str, ...], values: tuple, extra: str = "") -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric(ABC):
+    """A named metric family with fixed label names.
+    
+    Label values are passed positionally to keep the hot path to a tuple
+    and a dict lookup.
+    """
+    
+    type = "untyped"
+    
+    def __init__(self, name: str, help: str, labels: tuple[str, ...] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = labels
+    
+    @abstractmethod
+    def _samples(self) -> Iterable[str]:
+        """Exposition lines for the metric's current values."""
+    
+    def render(self) -> Iterable[str]:
+        yield f"# HELP {self.name} {self.help}"
+        yield f"# TYPE {self.name} {self.type}"
+        yield from self._samples()
+
+
+class Counter(_Metric):
+    type = "counter"
+    
+    def __init__(self, name: str, help: str, labels: tuple[str, ...] = ()):
+        super().__init__(name, help, labels)
+        self._values: dict[tuple, float] = {}
+    
+    def inc(self, *labels, amount: float = 1):
+        self._values[labels] = self._values.get(labels, 0) + amount
+    
+    def _samples(self):
+        for labels, value in self._values.items():
+            yield f"{self.name}{_labels(self.labelnames, labels)} {_number(value)}"
+
+
+class Gauge(_Metric):
+    """Gauge set directly, or computed at scrape time from `collect`."""
+    
+    type = "gauge"
+    
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labels: tuple[str, ...] = (),
+        collect: Optional[Callable[[], Iterable[tuple[tuple, float]]]] = None,
+    ):
+        super().__init__(name, help, labels)
+        self._values: dict[tuple, float] = {}
+        self._collect = collect
+    
+    def set(self, value: float, *labels):
+        self._values[labels] = value
+    
+    def inc(self, *labels, amount: float = 1):
+        self._values[labels] = self._values.get(labels, 0) + amount
+    
+    def dec(self, *labels, amount: float = 1):
+        self._values[labels] = self._values.get(labels, 0) - amount
+    
+    def _samples(self):
+        values = self._values.items() if self._collect is None else self._collect()
+        for labels, value in values:
+            yield f"{self.name}{_labels(self.labelnames, labels)} {_number(value)}"
+
+
+class Histogram(_Metric):
+    type = "histogram"
+    
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labels: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, help, labels)
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: [bucket counts..., +Inf count, sum]
+        self._values: dict[tuple, list] = {}
+    
+    def observe(self, value: float, *labels):
+        state = self._values.get(labels)
+        if state is None:
+            state = self._values[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+        state[bisect_left(self.buckets, value)] += 1
+        state[-1] += value
+    
+    def _samples(self):
+        for labels, state in self._values.items():
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), state):
+                cumulative += count
+                le = f'le="{_number(bound)}"'
+                yield f"{self.name}_bucket{_labels(self.labelnames, labels, le)} {cumulative}"
+            label_str = _labels(self.labelnames, labels)
+            yield f"{self.name}_sum{label_str} {_number(state[-1])}"
+            yield f"{self.name}_count{label_str} {cumulative}"
+
+
+class Registry:
+    """Collection of metrics rendered together."""
+    
+    def __init__(self):
+        self._metrics: list[_Metric] = []
+    
+    def register(self, metric: _Metric) -> _Metric:
+        self._metrics.append(metric)
+        return metric
+    
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+GATEWAY_LATENCY = REGISTRY.register(Histogram(
+    "scuttlebox_gateway_call_seconds",
+    "Latency of gateway HTTP calls (per attempt)",
+    ("call",),
+))
+GATEWAY_ERRORS = REGISTRY.register(Counter(
+    "scuttlebox_gateway_call_errors_total",
+    "Failed gateway calls by kind",
+    ("call", "kind"),
+))
+GATEWAY_RETRIES = REGISTRY.register(Counter(
+    "scuttlebox_gateway_call_retries_total",
+    "Retried gateway calls",
+    ("call",),
+))
+GATEWAY_IN_FLIGHT = REGISTRY.register(Gauge(
+    "scuttlebox_gateway_in_flight",
+    "Gateway calls currently in flight",
+    ("call",),
+))
+GATEWAY_ADMISSIONS = REGISTRY.register(Counter(
+    "scuttlebox_gateway_admissions_total",
+    "Gateway calls by priority lane and admission outcome (admitted, queued, shed, stale)",
+    ("priority", "outcome"),
+))
+HTTP_LATENCY = REGISTRY.register(Histogram(
+    "scuttlebox_http_request_seconds",
+    "Latency of API requests by route",
+    ("method", "route", "status"),
+))
+HTTP_IN_FLIGHT = REGISTRY.register(Gauge(
+    "scuttlebox_http_in_flight",
+    "API requests currently being handled",
+))
+CACHE_REQUESTS = REGISTRY.register(Counter(
+    "scuttlebox_cache_requests_total",
+    "Cache lookups by result (hit, shared_hit from another worker, miss, or partial)",
+    ("cache", "result"),
+))
+LOOP_LAG = REGISTRY.register(Histogram(
+    "scuttlebox_event_loop_lag_seconds",
+    "How late the event loop ran a scheduled wakeup",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0),
+))
+LOOP_LAG_LAST = REGISTRY.register(Gauge(
+    "scuttlebox_event_loop_lag_last_seconds",
+    "Most recently measured event loop lag",
+))
+
+
+class LoopLagMonitor:
+    """Measures event loop lag by timing a periodic sleep."""
+    
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._task: Optional[asyncio.Task] = None
+    
+    async def _run(self):
+        while True:
+            started = time.monotonic()
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, time.monotonic() - started - self.interval)
+            LOOP_LAG.observe(lag)
+            LOOP_LAG_LAST.set(lag)
+    
+    def start(self):
+        """Start the background monitor task."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+    
+    async def stop(self):
+        """Stop the background monitor task."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
@@ -1,17 +1,141 @@
 """OpenClaw Gateway client service."""
 
+import asyncio
+import time
 import httpx
 from typing import Any, Optional
 from ..config import get_settings
+from .admission import AdmissionController, StaleResponses, current_priority, fresh_scope, stale_allowed
+from .metrics import (
+    GATEWAY_ADMISSIONS,
+    GATEWAY_ERRORS,
+    GATEWAY_IN_FLIGHT,
+    GATEWAY_LATENCY,
+    GATEWAY_RETRIES,
+    REGISTRY,
+    Gauge,
+)
+from .recording import GatewayRecorder, GatewayReplayer, request_key
+from .resilience import (
+    CircuitBreaker,
+    GatewayUnavailableError,
+    LoadShedError,
+    RetryBudget,
+    backoff_delay,
+    call_timeout,
+    error_kind,
+    is_gateway_failure,
+    remaining_time,
+)
+from .tracing import span
+
+
+# Read-only calls that are safe to retry (see call_name)
+IDEMPOTENT_CALLS = {
+    "sessions_list",
+    "sessions_history",
+    "session_status",
+    "gateway:config.get",
+    "gateway:config.schema",
+    "cron:status",
+    "cron:list",
+    "cron:runs",
+}
+
+
+def call_name(tool: str, action: Optional[str] = None) -> str:
+    """Name identifying a gateway call for circuit breaking and retries."""
+    return f"{tool}:{action}" if action else tool
 
 
 class OpenClawClient:
-    """Client for interacting with OpenClaw Gateway HTTP APIs."""
+    """Client for interacting with OpenClaw Gateway HTTP APIs.
+    
+    Defaults to the configured gateway. Clients for other gateways (fleet
+    mode) pass their own URL and token and don't record or replay traffic.
+    """
     
-    def __init__(self):
+    def __init__(self, base_url: Optional[str] = None, token: Optional[str] = None):
         self.settings = get_settings()
-        self.base_url = self.settings.openclaw_gateway_url
-        self.token = self.settings.openclaw_gateway_token
+        self.base_url = base_url or self.settings.openclaw_gateway_url
+        self.token = self.settings.openclaw_gateway_token if token is None else token
+        self._http_client: Optional[httpx.AsyncClient] = None
+        self._http_calls: dict[httpx.AsyncClient, int] = {}  # In-flight calls per pool
+        self._retired: set[httpx.AsyncClient] = set()  # Replaced pools waiting to drain
+        self._breakers: dict[str, CircuitBreaker] = {}
+        self.retry_budget = RetryBudget(
+            self.settings.retry_budget_ratio, self.settings.retry_budget_max
+        )
+        self.admission = AdmissionController()
+        self.stale = StaleResponses(self.settings.admission_stale_entries)
+        self.recorder: Optional[GatewayRecorder] = None
+        self.replayer: Optional[GatewayReplayer] = None
+        if base_url is None and self.settings.gateway_replay_path:
+            self.replayer = GatewayReplayer(
+                self.settings.gateway_replay_path, self.settings.gateway_replay_speed
+            )
+        elif base_url is None and self.settings.gateway_record_path:
+            self.recorder = GatewayRecorder(self.settings.gateway_record_path)
+    
+    def _http(self) -> httpx.AsyncClient:
+        """Shared HTTP client, so gateway connections are pooled and kept alive."""
+        if self._http_client is None:
+            self._http_client = httpx.AsyncClient(
+                timeout=30.0,
+                limits=httpx.Limits(
+                    max_connections=self.settings.gateway_max_connections,
+                    max_keepalive_connections=self.settings.gateway_max_keepalive,
+                ),
+            )
+        return self._http_client
+    
+    async def reconnect(self):
+        """Switch to a fresh connection pool (e.g. after a gateway restart).
+        
+        Calls already in flight finish on the old pool, which is closed once
+        they're done.
+        """
+        old, self._http_client = self._http_client, None
+        if old is None:
+            return
+        if self._http_calls.get(old):
+            self._retired.add(old)
+        else:
+            await old.aclose()
+    
+    async def _release_http(self, http: httpx.AsyncClient):
+        """Count a call on `http` as finished, closing the pool if it was retired and is now idle."""
+        self._http_calls[http] -= 1
+        if self._http_calls[http] == 0:
+            del self._http_calls[http]
+            if http in self._retired:
+                self._retired.discard(http)
+                await http.aclose()
+    
+    async def aclose(self):
+        """Close pooled gateway connections and any recording or replay file."""
+        await self.reconnect()
+        for http in self._retired:
+            await http.aclose()
+        self._retired.clear()
+        if self.recorder is not None:
+            self.recorder.close()
+        if self.replayer is not None:
+            self.replayer.close()
+    
+    def pool_stats(self) -> dict:
+        """Connection pool usage (best effort; the pool is an httpcore internal)."""
+        connections = []
+        if self._http_client is not None:
+            pool = getattr(self._http_client._transport, "_pool", None)
+            connections = list(getattr(pool, "connections", []))
+        idle = sum(1 for c in connections if c.is_idle())
+        return {
+            "max": self.settings.gateway_max_connections,
+            "open": len(connections),
+            "idle": idle,
+            "active": len(connections) - idle,
+        }
     
     def _headers(self) -> dict[str, str]:
         """Get auth headers."""
@@ -20,6 +144,113 @@ class OpenClawClient:
             headers["Authorization"] = f"Bearer {self.token}"
         return headers
     
+    def breaker(self, name: str) -> CircuitBreaker:
+        """Circuit breaker for a gateway call."""
+        breaker = self._breakers.get(name)
+        if breaker is None:
+            breaker = self._breakers[name] = CircuitBreaker(
+                name,
+                self.settings.breaker_failure_threshold,
+                self.settings.breaker_reset_seconds,
+            )
+        return breaker
+    
+    def breakers(self) -> list[dict]:
+        """State of every circuit breaker seen so far."""
+        return [b.snapshot() for b in self._breakers.values()]
+    
+    async def _send(self, path: str, payload: dict, name: str, timeout: float) -> httpx.Response:
+        """Send one request to the gateway (or serve it from a recording)."""
+        url = f"{self.base_url}{path}"
+        if self.replayer is not None:
+            return await self.replayer.replay(url, path, payload, name)
+        started = time.perf_counter()
+        http = self._http()
+        self._http_calls[http] = self._http_calls.get(http, 0) + 1
+        try:
+            resp = await http.post(url, headers=self._headers(), json=payload, timeout=timeout)
+        finally:
+            await self._release_http(http)
+        if self.recorder is not None:
+            await self.recorder.record(path, payload, name, resp, time.perf_counter() - started)
+        return resp
+    
+    async def _post(self, path: str, payload: dict, name: str, timeout: float) -> dict:
+        """POST to the gateway through admission control and the call's circuit breaker.
+        
+        The timeout is capped by the current request's deadline. Idempotent
+        reads are retried on gateway failures with jittered backoff, as long
+        as the retry budget and the deadline allow. A read shed by admission
+        control is answered with its last good response, if there is one,
+        marked `"stale": True`. Outside a `fresh_scope` only.
+        """
+        breaker = self.breaker(name)
+        retryable = name in IDEMPOTENT_CALLS
+        priority = current_priority()
+        key = request_key(path, payload) if retryable else None
+        sheddable = key is not None and stale_allowed()
+        self.retry_budget.deposit()
+        attempt = 1
+        while True:
+            try:
+                await self.admission.acquire(priority, sheddable=sheddable and key in self.stale)
+            except LoadShedError as e:
+                GATEWAY_ERRORS.inc(name, error_kind(e))
+                stale = self.stale.get(key) if key else None
+                if stale is None:
+                    raise
+                GATEWAY_ADMISSIONS.inc(priority, "stale")
+                return {**stale, "stale": True}
+            except GatewayUnavailableError as e:
+                GATEWAY_ERRORS.inc(name, error_kind(e))
+                raise
+            try:
+                request_timeout = call_timeout(timeout)
+                breaker.before_call()
+            except GatewayUnavailableError as e:
+                self.admission.release()
+                GATEWAY_ERRORS.inc(name, error_kind(e))
+                raise
+            GATEWAY_IN_FLIGHT.inc(name)
+            started = time.perf_counter()
+            try:
+                with span("gateway"):
+                    resp = await self._send(path, payload, name, request_timeout)
+                resp.raise_for_status()
+                breaker.record_success()
+                data = resp.json()
+                if key:
+                    self.stale.put(key, data)
+                return data
+            except asyncio.CancelledError:
+                breaker.record_cancelled()
+                raise
+            except Exception as e:
+                GATEWAY_ERRORS.inc(name, error_kind(e))
+                if not is_gateway_failure(e):
+                    breaker.record_success()
+                    raise
+                breaker.record_failure()
+                if not retryable or attempt >= self.settings.retry_max_attempts:
+                    raise
+                delay = backoff_delay(
+                    attempt,
+                    self.settings.retry_backoff_base_seconds,
+                    self.settings.retry_backoff_max_seconds,
+                )
+                remaining = remaining_time()
+                if remaining is not None and remaining <= delay:
+                    raise
+                if not self.retry_budget.withdraw():
+                    raise
+            finally:
+                self.admission.release()
+                GATEWAY_IN_FLIGHT.dec(name)
+                GATEWAY_LATENCY.observe(time.perf_counter() - started, name)
+            GATEWAY_RETRIES.inc(name)
+            await asyncio.sleep(delay)
+            attempt += 1
+    
     async def invoke_tool(
         self,
         tool: str,
@@ -36,14 +267,8 @@ class OpenClawClient:
         if action:
             payload["action"] = action
         
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            resp = await client.post(
-                f"{self.base_url}/tools/invoke",
-                headers=self._headers(),
-                json=payload,
-            )
-            resp.raise_for_status()
-            return resp.json()
+        name = call_name(tool, action or (args or {}).get("action"))
+        return await self._post("/tools/invoke", payload, name, 30.0)
     
     async def chat_completion(
         self,
@@ -58,14 +283,7 @@ class OpenClawClient:
             "user": user,  # Creates a stable session key from this user string
         }
         
-        async with httpx.AsyncClient(timeout=120.0) as client:
-            resp = await client.post(
-                f"{self.base_url}/v1/chat/completions",
-                headers=self._headers(),
-                json=payload,
-            )
-            resp.raise_for_status()
-            return resp.json()
+        return await self._post("/v1/chat/completions", payload, "chat_completion", 120.0)
     
     async def get_sessions(self, active_minutes: int = None) -> list[dict]:
         """Get list of sessions."""
@@ -92,6 +310,27 @@ class OpenClawClient:
             return result.get("result", {})
         return {}
     
+    async def get_session_history(
+        self,
+        session_key: str,
+        limit: int = 50,
+        include_tools: bool = False,
+    ) -> Optional[list[dict]]:
+        """Get recent messages for a session (oldest first), or None if not found."""
+        result = await self.invoke_tool(
+            "sessions_history",
+            args={
+                "sessionKey": session_key,
+                "limit": limit,
+                "includeTools": include_tools,
+            },
+        )
+        if not result.get("ok"):
+            return None
+        history = result.get("result", {})
+        details = history.get("details", history)
+        return details.get("messages", details.get("history", []))
+    
     async def send_to_session(
         self,
         message: str,
@@ -216,8 +455,9 @@ class OpenClawClient:
     async def health_check(self) -> dict:
         """Check gateway health by trying to invoke a simple tool."""
         try:
-            # Try to get session status as a health check
-            result = await self.invoke_tool("session_status", args={})
+            # Try to get session status as a health check; a stale answer proves nothing
+            with fresh_scope():
+                result = await self.invoke_tool("session_status", args={})
             if result.get("ok"):
                 return {
                     "ok": True,
@@ -242,3 +482,37 @@ def get_openclaw_client() -> OpenClawClient:
     if _client is None:
         _client = OpenClawClient()
     return _client
+
+
+def _pool_samples():
+    stats = get_openclaw_client().pool_stats()
+    return [((state,), stats[state]) for state in ("max", "open", "idle", "active")]
+
+
+def _breaker_samples():
+    return [((b["name"],), int(b["state"] != "closed")) for b in get_openclaw_client().breakers()]
+
+
+def _admission_samples():
+    snapshot = get_openclaw_client().admission.snapshot()
+    return [((priority,), count) for priority, count in snapshot["waiting"].items()]
+
+
+REGISTRY.register(Gauge(
+    "scuttlebox_gateway_pool_connections",
+    "Gateway connection pool usage",
+    ("state",),
+    collect=_pool_samples,
+))
+REGISTRY.register(Gauge(
+    "scuttlebox_gateway_circuit_open",
+    "Whether a gateway call's circuit breaker is open (or half-open)",
+    ("call",),
+    collect=_breaker_samples,
+))
+REGISTRY.register(Gauge(
+    "scuttlebox_gateway_admission_waiting",
+    "Gateway calls queued for an admission slot, by priority lane",
+    ("priority",),
+    collect=_admission_samples,
+))
@@ -0,0 +1,126 @@
+"""Record gateway traffic to a file and replay it without a gateway.
+
+Each exchange is one line, tab-separated so replay can index a recording
+without parsing the JSON bodies:
+
+    ts_ms  key  call  status  duration_ms  request_json  response_json
+
+`key` identifies the request (path plus canonical payload). Replay builds
+a key -> [byte offset] index up front and reads a response body only when
+it's served.
+"""
+
+import asyncio
+import hashlib
+import json
+import time
+from pathlib import Path
+import httpx
+from .resilience import GatewayUnavailableError
+
+
+class ReplayMissError(GatewayUnavailableError):
+    """Raised when a replayed request has no recording."""
+
+
+def request_key(path: str, payload: dict) -> str:
+    raw = path + json.dumps(payload, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:16]
+
+
+class GatewayRecorder:
+    """Appends gateway exchanges to a recording file."""
+    
+    def __init__(self, path: str):
+        self.path = Path(path).expanduser()
+        self._file = None
+        self._lock = asyncio.Lock()
+    
+    def _write(self, line: str):
+        if self._file is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = open(self.path, "a", encoding="utf-8")
+        self._file.write(line)
+        self._file.flush()
+    
+    async def record(self, path: str, payload: dict, name: str, resp: httpx.Response, duration: float):
+        try:
+            body = json.dumps(json.loads(resp.content or b"null"), separators=(",", ":"))
+        except ValueError:
+            body = json.dumps(resp.text)
+        line = "\t".join([
+            str(int(time.time() * 1000)),
+            request_key(path, payload),
+            name,
+            str(resp.status_code),
+            str(int(duration * 1000)),
+            json.dumps(payload, separators=(",", ":")),
+            body,
+        ]) + "\n"
+        async with self._lock:
+            await asyncio.to_thread(self._write, line)
+    
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class GatewayReplayer:
+    """Serves gateway responses from a recording.
+    
+    Repeated requests cycle through their recorded responses in order. A
+    request that was never recorded falls back to the latest recording of
+    the same call (tool and action), so lookups keyed on volatile arguments
+    still get a realistically shaped response. With `speed` > 0, responses
+    are delayed by their recorded duration divided by `speed`.
+    """
+    
+    def __init__(self, path: str, speed: float = 0.0):
+        self.path = Path(path).expanduser()
+        self.speed = speed
+        self._by_key: dict[str, list[int]] = {}
+        self._by_call: dict[str, int] = {}
+        self._cursor: dict[str, int] = {}
+        self._file = open(self.path, "rb")
+        self._index()
+    
+    def _index(self):
+        offset = 0
+        for line in self._file:
+            fields = line.split(b"\t", 3)
+            if len(fields) == 4:
+                key, call = fields[1].decode(), fields[2].decode()
+                self._by_key.setdefault(key, []).append(offset)
+                self._by_call[call] = offset
+            offset += len(line)
+    
+    def _read(self, offset: int) -> tuple[int, int, bytes]:
+        """(status, duration_ms, response body) of the exchange at `offset`."""
+        self._file.seek(offset)
+        fields = self._file.readline().rstrip(b"\n").split(b"\t", 6)
+        return int(fields[3]), int(fields[4]), fields[6]
+    
+    async def replay(self, url: str, path: str, payload: dict, name: str) -> httpx.Response:
+        key = request_key(path, payload)
+        offsets = self._by_key.get(key)
+        if offsets:
+            i = self._cursor.get(key, 0)
+            self._cursor[key] = (i + 1) % len(offsets)
+            offset = offsets[i]
+        elif name in self._by_call:
+            offset = self._by_call[name]
+        else:
+            raise ReplayMissError(f"No recorded gateway response for {name}")
+        status, duration_ms, body = self._read(offset)
+        if self.speed > 0 and duration_ms:
+            await asyncio.sleep(duration_ms / 1000 / self.speed)
+        return httpx.Response(
+            status,
+            content=body,
+            headers={"Content-Type": "application/json"},
+            request=httpx.Request("POST", url, json=payload),
+        )
+    
+    def close(self):
+        self._file.close()
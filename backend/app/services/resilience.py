@@ -0,0 +1,159 @@
+"""Circuit breaking, retry budgeting and deadline propagation for gateway calls."""
+
+import random
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional
+import httpx
+
+
+# Absolute time.monotonic() deadline for the current request, if any
+_deadline: ContextVar[Optional[float]] = ContextVar("gateway_deadline", default=None)
+
+
+class GatewayUnavailableError(Exception):
+    """Base class for gateway calls refused before reaching the network."""
+
+
+class CircuitOpenError(GatewayUnavailableError):
+    """Raised when the circuit for a gateway call is open."""
+    
+    def __init__(self, name: str, retry_after: float):
+        super().__init__(f"Gateway circuit open for {name}; retry in {retry_after:.0f}s")
+        self.name = name
+        self.retry_after = retry_after
+
+
+class DeadlineExceededError(GatewayUnavailableError):
+    """Raised when the request's deadline has passed before a gateway call."""
+
+
+class LoadShedError(GatewayUnavailableError):
+    """Raised when admission control sheds a low-priority gateway call."""
+    
+    def __init__(self, priority: str):
+        super().__init__(f"Gateway busy; {priority} call shed")
+        self.priority = priority
+
+
+@contextmanager
+def deadline_scope(seconds: Optional[float]) -> Iterator[None]:
+    """Set the deadline for gateway calls made in this context (None clears it)."""
+    token = _deadline.set(time.monotonic() + seconds if seconds is not None else None)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def remaining_time() -> Optional[float]:
+    """Seconds left before the current deadline, or None if there is none."""
+    deadline = _deadline.get()
+    return None if deadline is None else deadline - time.monotonic()
+
+
+def call_timeout(default: float) -> float:
+    """Timeout for a gateway call: the default, capped by the remaining deadline."""
+    remaining = remaining_time()
+    if remaining is None:
+        return default
+    if remaining <= 0:
+        raise DeadlineExceededError("Request deadline exceeded before gateway call")
+    return min(default, remaining)
+
+
+def is_gateway_failure(error: Exception) -> bool:
+    """Whether an error indicates the gateway is unhealthy (vs. a bad request)."""
+    if isinstance(error, httpx.HTTPStatusError):
+        return error.response.status_code >= 500
+    return isinstance(error, httpx.TransportError)
+
+
+def error_kind(error: Exception) -> str:
+    """Short label classifying a gateway call error."""
+    if isinstance(error, CircuitOpenError):
+        return "circuit_open"
+    if isinstance(error, DeadlineExceededError):
+        return "deadline"
+    if isinstance(error, LoadShedError):
+        return "shed"
+    if isinstance(error, httpx.HTTPStatusError):
+        return f"http_{error.response.status_code // 100}xx"
+    if isinstance(error, httpx.TimeoutException):
+        return "timeout"
+    if isinstance(error, httpx.TransportError):
+        return "transport"
+    return "other"
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker with a single half-open trial call."""
+    
+    def __init__(self, name: str, failure_threshold: int, reset_seconds: float):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at = 0.0
+        self._trial_in_flight = False
+    
+    def before_call(self):
+        """Raise CircuitOpenError unless a call may go through now."""
+        if self.state == "closed":
+            return
+        elapsed = time.monotonic() - self.opened_at
+        if self.state == "open" and elapsed >= self.reset_seconds:
+            self.state = "half_open"
+        if self.state == "half_open" and not self._trial_in_flight:
+            self._trial_in_flight = True
+            return
+        raise CircuitOpenError(self.name, max(0.0, self.reset_seconds - elapsed))
+    
+    def record_success(self):
+        self.state = "closed"
+        self.failures = 0
+        self._trial_in_flight = False
+    
+    def record_failure(self):
+        self.failures += 1
+        self._trial_in_flight = False
+        if self.state == "half_open" or self.failures >= self.failure_threshold:
+            self.state = "open"
+            self.opened_at = time.monotonic()
+    
+    def record_cancelled(self):
+        """A call was abandoned without an outcome; let another trial through."""
+        self._trial_in_flight = False
+    
+    def snapshot(self) -> dict:
+        return {"name": self.name, "state": self.state, "failures": self.failures}
+
+
+class RetryBudget:
+    """Caps retries to a fraction of overall call volume.
+    
+    Every call deposits `ratio` tokens (up to `max_tokens`); every retry
+    withdraws one. When the gateway is failing broadly, the budget drains
+    and calls stop being retried instead of multiplying the load.
+    """
+    
+    def __init__(self, ratio: float, max_tokens: float):
+        self.ratio = ratio
+        self.max_tokens = max_tokens
+        self.tokens = max_tokens
+    
+    def deposit(self):
+        self.tokens = min(self.max_tokens, self.tokens + self.ratio)
+    
+    def withdraw(self) -> bool:
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return True
+        return False
+
+
+def backoff_delay(attempt: int, base: float, cap: float) -> float:
+    """Full-jitter exponential backoff for the given retry attempt (1-based)."""
+    return random.uniform(0, min(cap, base * 2 ** (attempt - 1)))
@@ -0,0 +1,418 @@
+"""Background sampler for agent busy state and session queue history."""
+
+import asyncio
+import json
+import statistics
+import time
+from array import array
+from pathlib import Path
+from typing import Any, Optional
+from ..config import get_settings
+from .activity import AdaptiveSchedule, get_activity_monitor
+from .admission import fresh_scope
+from .openclaw import OpenClawClient
+from .shared_cache import get_cache_backend
+
+
+# Session fields the gateway may use to report pending queued messages
+_QUEUE_DEPTH_FIELDS = ("queueDepth", "queued", "queueSize", "pending")
+
+# Max per-session entries kept in each raw sample
+_MAX_SESSIONS_PER_SAMPLE = 50
+
+_RAW_COLUMNS = {"ts": "d", "busy": "b", "active": "l", "queued": "l", "sessions": "O"}
+_TIER_COLUMNS = {
+    "ts": "d",
+    "busy_ratio": "d",
+    "active_avg": "d",
+    "active_max": "l",
+    "queued_max": "l",
+    "samples": "l",
+}
+
+# (name, bucket size in ms, buckets kept)
+_TIERS = (
+    ("1m", 60_000, 7 * 24 * 60),
+    ("15m", 15 * 60_000, 90 * 24 * 4),
+)
+
+
+def session_queue_depth(session: dict) -> Optional[int]:
+    """Pending queued messages for a session, or None if the gateway doesn't report it."""
+    for field in _QUEUE_DEPTH_FIELDS:
+        value = session.get(field)
+        if isinstance(value, int):
+            return value
+        if isinstance(value, list):
+            return len(value)
+    return None
+
+
+class RingBuffer:
+    """Fixed-capacity ring buffer with one typed array per column.
+    
+    Typecode "O" stores arbitrary objects in a plain list. Rows must be
+    appended in timestamp order ("ts" column) so range reads can bisect.
+    """
+    
+    def __init__(self, capacity: int, columns: dict[str, str]):
+        self.capacity = capacity
+        self._columns: dict[str, Any] = {
+            name: [None] * capacity if code == "O" else array(code, [0]) * capacity
+            for name, code in columns.items()
+        }
+        self._start = 0
+        self._size = 0
+    
+    def __len__(self) -> int:
+        return self._size
+    
+    def _slot(self, i: int) -> int:
+        """Physical slot of the i-th oldest row."""
+        return (self._start + i) % self.capacity
+    
+    def append(self, **values: Any):
+        """Append a row, overwriting the oldest when full."""
+        if self._size < self.capacity:
+            slot = self._slot(self._size)
+            self._size += 1
+        else:
+            slot = self._start
+            self._start = (self._start + 1) % self.capacity
+        for name, column in self._columns.items():
+            column[slot] = values[name]
+    
+    def _row(self, i: int) -> dict[str, Any]:
+        slot = self._slot(i)
+        return {name: column[slot] for name, column in self._columns.items()}
+    
+    def _bisect(self, ts: float) -> int:
+        """Logical index of the first row with ts >= `ts`."""
+        column = self._columns["ts"]
+        lo, hi = 0, self._size
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if column[self._slot(mid)] < ts:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+    
+    def rows(self, start_ts: Optional[float] = None, end_ts: Optional[float] = None) -> list[dict]:
+        """Rows with start_ts <= ts <= end_ts, oldest first."""
+        first = 0 if start_ts is None else self._bisect(start_ts)
+        last = self._size if end_ts is None else self._bisect(end_ts + 1e-6)
+        return [self._row(i) for i in range(first, last)]
+    
+    def last(self) -> Optional[dict]:
+        """Most recent row."""
+        return self._row(self._size - 1) if self._size else None
+    
+    def first_ts(self) -> Optional[float]:
+        """Timestamp of the oldest row."""
+        return self._columns["ts"][self._start] if self._size else None
+
+
+class _Tier:
+    """Downsampled history tier, optionally persisted as JSON lines.
+    
+    Samples are weighted by how long they held (the sampling interval
+    varies with agent activity), so busy ratios and averages are
+    time-weighted.
+    """
+    
+    def __init__(self, name: str, bucket_ms: int, capacity: int, path: Optional[Path]):
+        self.name = name
+        self.bucket_ms = bucket_ms
+        self.buffer = RingBuffer(capacity, _TIER_COLUMNS)
+        self.path = path
+        self._lines = 0
+        self._bucket: Optional[float] = None
+        self._samples = 0
+        self._weight = 0.0
+        self._busy = 0.0
+        self._active_sum = 0.0
+        self._active_max = 0
+        self._queued_max = 0
+    
+    def load(self):
+        """Load persisted buckets from disk."""
+        if not self.path or not self.path.exists():
+            return
+        with open(self.path, "r", encoding="utf-8") as f:
+            lines = f.readlines()
+        self._lines = len(lines)
+        for line in lines[-self.buffer.capacity:]:
+            try:
+                self.buffer.append(**json.loads(line))
+            except (ValueError, TypeError, KeyError):
+                continue
+    
+    def add(self, ts: float, busy: bool, active: int, queued: int, weight: float, persist: bool = True):
+        """Fold a raw sample held for `weight` ms into the current bucket, closing it if the bucket changed."""
+        bucket = ts - ts % self.bucket_ms
+        if self._bucket is not None and bucket != self._bucket:
+            self._close(persist)
+        self._bucket = bucket
+        self._samples += 1
+        self._weight += weight
+        self._busy += int(busy) * weight
+        self._active_sum += active * weight
+        self._active_max = max(self._active_max, active)
+        self._queued_max = max(self._queued_max, queued)
+    
+    def _close(self, persist: bool = True):
+        """Write the finished bucket to the buffer (and disk)."""
+        row = {
+            "ts": self._bucket,
+            "busy_ratio": self._busy / self._weight,
+            "active_avg": self._active_sum / self._weight,
+            "active_max": self._active_max,
+            "queued_max": self._queued_max,
+            "samples": self._samples,
+        }
+        last = self.buffer.last()
+        if last is None or row["ts"] > last["ts"]:
+            self.buffer.append(**row)
+            if persist:
+                self._persist(row)
+        self._samples = self._active_max = self._queued_max = 0
+        self._weight = self._busy = self._active_sum = 0.0
+    
+    def flush(self, persist: bool = True):
+        """Close the open bucket early (e.g. on shutdown) so it isn't lost."""
+        if self._bucket is not None and self._samples:
+            self._close(persist)
+        self._bucket = None
+    
+    def _persist(self, row: dict):
+        """Append a bucket to the tier file, compacting when it grows too long."""
+        if not self.path:
+            return
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            if self._lines >= 2 * self.buffer.capacity:
+                rows = self.buffer.rows()
+                with open(self.path, "w", encoding="utf-8") as f:
+                    f.writelines(json.dumps(r) + "\n" for r in rows)
+                self._lines = len(rows)
+            else:
+                with open(self.path, "a", encoding="utf-8") as f:
+                    f.write(json.dumps(row) + "\n")
+                self._lines += 1
+        except OSError:
+            pass
+
+
+class QueueSampler:
+    """Periodically records busy state, active sessions and queue depth.
+    
+    Raw samples live in a fixed-size ring buffer; 1-minute and 15-minute
+    rollups are kept alongside and, if a history directory is configured,
+    persisted so utilization charts survive restarts. With a shared cache
+    backend, only the leader worker samples; it publishes each sample and the
+    other workers replay them into their own buffers (see sync).
+    """
+    
+    def __init__(self):
+        self.settings = get_settings()
+        self.raw = RingBuffer(self.settings.sampler_capacity, _RAW_COLUMNS)
+        
+        history_dir = self.settings.sampler_history_dir
+        directory = Path(history_dir).expanduser() if history_dir else None
+        self.tiers = {
+            name: _Tier(name, bucket_ms, capacity, directory / f"queue-{name}.jsonl" if directory else None)
+            for name, bucket_ms, capacity in _TIERS
+        }
+        for tier in self.tiers.values():
+            tier.load()
+        # Latest sample, folded into the rollups once we know how long it held
+        self._held: Optional[tuple[float, bool, int, int]] = None
+        self._task: Optional[asyncio.Task] = None
+    
+    async def sample(self, client: OpenClawClient):
+        """Take one sample from the gateway."""
+        with fresh_scope():
+            status, sessions = await asyncio.gather(
+                client.get_session_status(),
+                client.get_sessions(active_minutes=self.settings.sampler_active_minutes),
+            )
+        get_activity_monitor().note_status(status)
+        ts = time.time() * 1000
+        busy = bool(status.get("busy", False))
+        session_states = tuple(
+            (session.get("key", ""), session_queue_depth(session))
+            for session in sessions[:_MAX_SESSIONS_PER_SAMPLE]
+        )
+        # Sessions with an unknown depth don't count towards the total
+        queued = sum(depth for _, depth in session_states if depth is not None)
+        
+        self._ingest(ts, busy, len(sessions), queued, session_states)
+        backend = get_cache_backend()
+        if backend.shared:
+            await backend.append(
+                "queue_samples",
+                ts,
+                [busy, len(sessions), queued, session_states],
+                keep=self.settings.sampler_capacity,
+            )
+    
+    def _ingest(self, ts: float, busy: bool, active: int, queued: int, session_states: tuple, persist: bool = True):
+        """Add a sample to the raw buffer, and the previous one to the rollups."""
+        self.raw.append(ts=ts, busy=busy, active=active, queued=queued, sessions=session_states)
+        self._fold_held(ts, persist)
+        self._held = (ts, busy, active, queued)
+    
+    def _fold_held(self, until_ts: float, persist: bool = True):
+        """Add the held sample to the rollups, weighted by the time until `until_ts`."""
+        if self._held is None:
+            return
+        ts, busy, active, queued = self._held
+        settings = self.settings
+        # A gap longer than the slowest polling interval means we weren't sampling
+        max_gap_s = max(
+            settings.sampler_interval_seconds,
+            settings.polling_idle_max_seconds,
+            settings.polling_unwatched_max_seconds,
+        )
+        weight = min(max(until_ts - ts, 1.0), max_gap_s * 1000)
+        for tier in self.tiers.values():
+            tier.add(ts, busy, active, queued, weight, persist)
+        self._held = None
+    
+    async def sync(self):
+        """Pull in samples published by the leader worker (no-op on the leader)."""
+        backend = get_cache_backend()
+        if not backend.shared or self._task is not None:
+            return
+        latest = self.raw.last()
+        for ts, (busy, active, queued, session_states) in await backend.since(
+            "queue_samples", latest["ts"] if latest else 0
+        ):
+            states = tuple((key, depth) for key, depth in session_states)
+            self._ingest(ts, busy, active, queued, states, persist=False)
+    
+    async def _run(self, client: OpenClawClient):
+        """Sampling loop, paced by agent activity."""
+        monitor = get_activity_monitor()
+        schedule = AdaptiveSchedule(self.settings.sampler_interval_seconds)
+        while True:
+            try:
+                await self.sample(client)
+            except Exception:
+                # Gateway unavailable; try again next interval
+                pass
+            await schedule.sleep(monitor)
+    
+    def start(self, client: OpenClawClient):
+        """Start the background sampling task."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(client))
+    
+    async def stop(self):
+        """Stop the background sampling task."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+            self._fold_held(time.time() * 1000)
+            for tier in self.tiers.values():
+                tier.flush()
+    
+    def _pick_resolution(self, from_ms: float, to_ms: float) -> str:
+        """Choose the finest tier that covers the requested window."""
+        oldest_raw = self.raw.first_ts()
+        span = to_ms - from_ms
+        if span <= 2 * 60 * 60 * 1000 and oldest_raw is not None and oldest_raw <= from_ms:
+            return "raw"
+        if span <= 2 * 24 * 60 * 60 * 1000:
+            return "1m"
+        return "15m"
+    
+    def history(
+        self,
+        from_ms: float,
+        to_ms: float,
+        resolution: Optional[str] = None,
+        session_key: Optional[str] = None,
+    ) -> dict:
+        """Get utilization points for a time window."""
+        resolution = resolution or self._pick_resolution(from_ms, to_ms)
+        
+        if resolution == "raw":
+            rows = self.raw.rows(from_ms, to_ms)
+            points = [
+                {
+                    "ts": int(r["ts"]),
+                    "busyRatio": float(r["busy"]),
+                    "activeSessions": r["active"],
+                    "activeSessionsMax": r["active"],
+                    "queued": r["queued"],
+                    "samples": 1,
+                }
+                for r in rows
+            ]
+            # Actual spacing, since the interval adapts to agent activity
+            gaps = [b["ts"] - a["ts"] for a, b in zip(rows, rows[1:])]
+            interval_ms = int(statistics.median(gaps)) if gaps else int(self.settings.sampler_interval_seconds * 1000)
+        else:
+            tier = self.tiers[resolution]
+            points = [
+                {
+                    "ts": int(r["ts"]),
+                    "busyRatio": r["busy_ratio"],
+                    "activeSessions": r["active_avg"],
+                    "activeSessionsMax": r["active_max"],
+                    "queued": r["queued_max"],
+                    "samples": r["samples"],
+                }
+                for r in tier.buffer.rows(from_ms, to_ms)
+            ]
+            interval_ms = tier.bucket_ms
+        
+        result = {
+            "from": int(from_ms),
+            "to": int(to_ms),
+            "resolution": resolution,
+            "intervalMs": interval_ms,
+            "points": points,
+        }
+        
+        if session_key:
+            # Per-session queue state is only kept at raw resolution
+            result["session"] = [
+                {
+                    "ts": int(r["ts"]),
+                    "active": any(key == session_key for key, _ in r["sessions"]),
+                    "queueDepth": next((d for key, d in r["sessions"] if key == session_key), 0),
+                }
+                for r in self.raw.rows(from_ms, to_ms)
+            ]
+        
+        latest = self.raw.last()
+        if latest:
+            result["latest"] = {
+                "ts": int(latest["ts"]),
+                "busy": bool(latest["busy"]),
+                "activeSessions": latest["active"],
+                "queued": latest["queued"],
+                "sessions": [
+                    {"sessionKey": key, "queueDepth": depth} for key, depth in latest["sessions"]
+                ],
+            }
+        return result
+
+
+# Singleton instance
+_sampler: Optional[QueueSampler] = None
+
+
+def get_queue_sampler() -> QueueSampler:
+    """Get or create queue sampler instance."""
+    global _sampler
+    if _sampler is None:
+        _sampler = QueueSampler()
+    return _sampler
@@ -0,0 +1,328 @@
+"""Local evaluation of cron job schedules for upcoming-run timelines."""
+
+import math
+from bisect import bisect_left
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from functools import lru_cache
+from typing import Any, Optional
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+
+_MONTH_NAMES = {
+    name: i + 1
+    for i, name in enumerate(
+        ["jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec"]
+    )
+}
+_DOW_NAMES = {
+    name: i for i, name in enumerate(["sun", "mon", "tue", "wed", "thu", "fri", "sat"])
+}
+_MACROS = {
+    "@yearly": "0 0 1 1 *",
+    "@annually": "0 0 1 1 *",
+    "@monthly": "0 0 1 * *",
+    "@weekly": "0 0 * * 0",
+    "@daily": "0 0 * * *",
+    "@midnight": "0 0 * * *",
+    "@hourly": "0 * * * *",
+}
+
+# Don't search further ahead than this for a matching cron time
+_MAX_SEARCH_YEARS = 5
+
+
+@dataclass(frozen=True)
+class CronExpr:
+    """A parsed cron expression (fields stored as sorted value lists)."""
+    seconds: tuple[int, ...]
+    minutes: tuple[int, ...]
+    hours: tuple[int, ...]
+    days: frozenset[int]
+    months: frozenset[int]
+    weekdays: frozenset[int]  # 0 = Sunday
+    any_day: bool
+    any_weekday: bool
+
+    def day_matches(self, dt: datetime) -> bool:
+        """Check day-of-month/day-of-week using standard cron OR semantics."""
+        dom_ok = dt.day in self.days
+        dow_ok = dt.isoweekday() % 7 in self.weekdays
+        if self.any_day and self.any_weekday:
+            return True
+        if self.any_day:
+            return dow_ok
+        if self.any_weekday:
+            return dom_ok
+        return dom_ok or dow_ok
+
+
+def _parse_value(text: str, names: Optional[dict[str, int]]) -> int:
+    """Parse a single numeric or named field value."""
+    if names and text.lower() in names:
+        return names[text.lower()]
+    return int(text)
+
+
+def _parse_field(
+    text: str,
+    lo: int,
+    hi: int,
+    names: Optional[dict[str, int]] = None,
+) -> set[int]:
+    """Parse one cron field (lists, ranges, steps, names) into a value set."""
+    values: set[int] = set()
+    for part in text.split(","):
+        step = 1
+        if "/" in part:
+            part, step_text = part.split("/", 1)
+            step = int(step_text)
+            if step < 1:
+                raise ValueError(f"Invalid step in cron field '{text}'")
+
+        if part in ("*", "?"):
+            start, end = lo, hi
+        elif "-" in part:
+            start_text, end_text = part.split("-", 1)
+            start, end = _parse_value(start_text, names), _parse_value(end_text, names)
+        else:
+            start = _parse_value(part, names)
+            # "5/15" means "starting at 5, every 15"
+            end = hi if step > 1 else start
+
+        if start < lo or end > hi or start > end:
+            raise ValueError(f"Cron field '{text}' out of range {lo}-{hi}")
+        values.update(range(start, end + 1, step))
+    return values
+
+
+@lru_cache(maxsize=512)
+def parse_cron(expr: str) -> CronExpr:
+    """Parse a 5-field (or 6-field, with seconds) cron expression."""
+    text = _MACROS.get(expr.strip().lower(), expr.strip())
+    fields = text.split()
+    if len(fields) == 5:
+        fields = ["0"] + fields
+    if len(fields) != 6:
+        raise ValueError(f"Invalid cron expression '{expr}'")
+
+    sec, minute, hour, dom, month, dow = fields
+    weekdays = {d % 7 for d in _parse_field(dow, 0, 7, _DOW_NAMES)}  # 7 is also Sunday
+    return CronExpr(
+        seconds=tuple(sorted(_parse_field(sec, 0, 59))),
+        minutes=tuple(sorted(_parse_field(minute, 0, 59))),
+        hours=tuple(sorted(_parse_field(hour, 0, 23))),
+        days=frozenset(_parse_field(dom, 1, 31)),
+        months=frozenset(_parse_field(month, 1, 12, _MONTH_NAMES)),
+        weekdays=frozenset(weekdays),
+        any_day=dom in ("*", "?"),
+        any_weekday=dow in ("*", "?"),
+    )
+
+
+@lru_cache(maxsize=64)
+def _get_zone(tz: str) -> ZoneInfo:
+    """Resolve an IANA timezone name."""
+    try:
+        return ZoneInfo(tz)
+    except (ZoneInfoNotFoundError, ValueError):
+        raise ValueError(f"Unknown timezone '{tz}'")
+
+
+def _to_local(ms: int, zone: Optional[ZoneInfo]) -> datetime:
+    """Convert epoch ms to naive wall-clock time (host local time if no zone)."""
+    if zone is None:
+        return datetime.fromtimestamp(ms / 1000)
+    return datetime.fromtimestamp(ms / 1000, zone).replace(tzinfo=None)
+
+
+def _to_ms(local: datetime, zone: Optional[ZoneInfo]) -> Optional[int]:
+    """Convert naive wall-clock time to epoch ms, or None if skipped by a DST gap."""
+    ts = local.timestamp() if zone is None else local.replace(tzinfo=zone).timestamp()
+    if _to_local(int(ts * 1000), zone) != local:
+        return None
+    return int(ts * 1000)
+
+
+def _next_in(values: tuple[int, ...], current: int) -> Optional[int]:
+    """Smallest value >= current, or None."""
+    i = bisect_left(values, current)
+    return values[i] if i < len(values) else None
+
+
+def _cron_next(cron: CronExpr, start: datetime) -> Optional[datetime]:
+    """First wall-clock time >= start matching the expression."""
+    t = start
+    if t.microsecond:
+        t = t.replace(microsecond=0) + timedelta(seconds=1)
+    limit_year = t.year + _MAX_SEARCH_YEARS
+
+    while t.year <= limit_year:
+        if t.month not in cron.months:
+            year, month = (t.year + 1, 1) if t.month == 12 else (t.year, t.month + 1)
+            t = datetime(year, month, 1)
+            continue
+        if not cron.day_matches(t):
+            t = datetime(t.year, t.month, t.day) + timedelta(days=1)
+            continue
+        hour = _next_in(cron.hours, t.hour)
+        if hour is None:
+            t = datetime(t.year, t.month, t.day) + timedelta(days=1)
+            continue
+        if hour != t.hour:
+            t = t.replace(hour=hour, minute=0, second=0)
+        minute = _next_in(cron.minutes, t.minute)
+        if minute is None:
+            t = t.replace(minute=0, second=0) + timedelta(hours=1)
+            continue
+        if minute != t.minute:
+            t = t.replace(minute=minute, second=0)
+        second = _next_in(cron.seconds, t.second)
+        if second is None:
+            t = t.replace(second=0) + timedelta(minutes=1)
+            continue
+        return t.replace(second=second)
+    return None
+
+
+def next_fire_times(
+    schedule: dict[str, Any],
+    from_ms: int,
+    to_ms: int,
+    limit: int = 50,
+    default_anchor_ms: Optional[int] = None,
+) -> list[int]:
+    """Compute up to `limit` fire times (epoch ms) in [from_ms, to_ms] for a schedule."""
+    kind = schedule.get("kind")
+
+    if kind == "at":
+        at_ms = schedule.get("atMs")
+        if at_ms is not None and from_ms <= at_ms <= to_ms:
+            return [int(at_ms)]
+        return []
+
+    if kind == "every":
+        every_ms = int(schedule.get("everyMs") or 0)
+        if every_ms <= 0:
+            raise ValueError("everyMs must be positive")
+        anchor = schedule.get("anchorMs")
+        if anchor is None:
+            anchor = default_anchor_ms if default_anchor_ms is not None else from_ms
+        if anchor >= from_ms:
+            first = anchor
+        else:
+            first = anchor + math.ceil((from_ms - anchor) / every_ms) * every_ms
+        times = []
+        t = first
+        while t <= to_ms and len(times) < limit:
+            times.append(int(t))
+            t += every_ms
+        return times
+
+    if kind == "cron":
+        cron = parse_cron(schedule.get("expr") or "")
+        zone = _get_zone(schedule["tz"]) if schedule.get("tz") else None
+        times = []
+        local = _to_local(from_ms, zone)
+        while len(times) < limit:
+            match = _cron_next(cron, local)
+            if match is None:
+                break
+            ms = _to_ms(match, zone)
+            if ms is not None:
+                if ms > to_ms:
+                    break
+                if ms >= from_ms:
+                    times.append(ms)
+            local = match + timedelta(seconds=1)
+        return times
+
+    raise ValueError(f"Unknown schedule kind '{kind}'")
+
+
+def find_bursts(
+    events: list[dict[str, Any]],
+    window_ms: int,
+    threshold: int,
+) -> list[dict[str, Any]]:
+    """Find windows where at least `threshold` events fire within `window_ms`.
+
+    `events` must be sorted by atMs. Overlapping windows are merged into one burst.
+    """
+    bursts: list[list[int]] = []  # [start index, end index (exclusive)]
+    j = 0
+    for i in range(len(events)):
+        j = max(j, i)
+        while j < len(events) and events[j]["atMs"] - events[i]["atMs"] < window_ms:
+            j += 1
+        if j - i < threshold:
+            continue
+        if bursts and i < bursts[-1][1]:
+            bursts[-1][1] = j
+        else:
+            bursts.append([i, j])
+
+    result = []
+    for start, end in bursts:
+        window = events[start:end]
+        result.append({
+            "startMs": window[0]["atMs"],
+            "endMs": window[-1]["atMs"],
+            "count": len(window),
+            "jobIds": list(dict.fromkeys(e["jobId"] for e in window)),
+        })
+    return result
+
+
+def build_timeline(
+    jobs: list[dict[str, Any]],
+    from_ms: int,
+    to_ms: int,
+    per_job_limit: int = 50,
+    burst_window_ms: int = 60_000,
+    burst_threshold: int = 5,
+    include_disabled: bool = False,
+) -> dict[str, Any]:
+    """Evaluate all job schedules in one pass and build a merged timeline."""
+    job_runs = []
+    events = []
+    errors = []
+
+    for job in jobs:
+        job_id = job.get("id") or job.get("jobId")
+        enabled = job.get("enabled", True)
+        if not enabled and not include_disabled:
+            continue
+        schedule = job.get("schedule") or {}
+        try:
+            times = next_fire_times(
+                schedule,
+                from_ms,
+                to_ms,
+                limit=per_job_limit,
+                default_anchor_ms=job.get("createdAtMs"),
+            )
+        except (ValueError, TypeError) as e:
+            errors.append({"jobId": job_id, "error": str(e)})
+            continue
+
+        job_runs.append({
+            "jobId": job_id,
+            "name": job.get("name"),
+            "enabled": enabled,
+            "schedule": schedule,
+            "nextRuns": times,
+        })
+        for at_ms in times:
+            events.append({"atMs": at_ms, "jobId": job_id, "name": job.get("name")})
+
+    events.sort(key=lambda e: e["atMs"])
+
+    return {
+        "from": from_ms,
+        "to": to_ms,
+        "jobs": job_runs,
+        "events": events,
+        "bursts": find_bursts(events, burst_window_ms, burst_threshold),
+        "errors": errors,
+    }
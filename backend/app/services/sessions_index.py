@@ -0,0 +1,236 @@
+"""In-memory sessions index with secondary indexes, filtering and keyset pagination."""
+
+import asyncio
+import base64
+import json
+import time
+from bisect import bisect_left
+from typing import Any, Optional
+from ..config import get_settings
+from .metrics import CACHE_REQUESTS
+from .openclaw import OpenClawClient
+from .shared_cache import get_cache_backend
+
+
+SORT_FIELDS = ("updatedAt", "key", "displayName")
+
+
+def _display_name(session: dict) -> str:
+    return session.get("displayName") or session.get("key", "")[:40]
+
+
+def _sort_value(session: dict, field: str) -> Any:
+    if field == "updatedAt":
+        return session.get("updatedAt") or 0
+    if field == "displayName":
+        return _display_name(session).lower()
+    return session.get("key", "")
+
+
+def encode_cursor(sort: str, value: Any, key: str) -> str:
+    """Opaque keyset cursor for the last item of a page in the given sort order."""
+    raw = json.dumps([sort, value, key]).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, sort: str) -> tuple[Any, str]:
+    """Decode a cursor from encode_cursor for the given sort order.
+    
+    Raises ValueError if it's malformed or was issued for a different sort.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        cursor_sort, value, key = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except Exception:
+        raise ValueError("Invalid cursor")
+    expected = (int, float) if sort.lstrip("-") == "updatedAt" else str
+    if cursor_sort != sort or not isinstance(value, expected) or not isinstance(key, str):
+        raise ValueError("Cursor doesn't match the requested sort")
+    return value, key
+
+
+class SessionsIndex:
+    """Sessions list mirrored from the gateway and indexed for querying.
+    
+    Every refresh stores the fresh session dicts, but the secondary indexes
+    are rebuilt only when an indexed field (key, updatedAt, display name,
+    channel or model) changed. Channel and model map to key sets, keys and
+    display names are kept sorted for prefix search, and the updatedAt
+    ordering is precomputed for the default listing.
+    """
+    
+    def __init__(self):
+        self.settings = get_settings()
+        self._sessions: dict[str, dict] = {}
+        self._by_channel: dict[str, set[str]] = {}
+        self._by_model: dict[str, set[str]] = {}
+        self._keys_sorted: list[str] = []
+        self._names_sorted: list[tuple[str, str]] = []  # (lowercased display name, key)
+        self._recent: list[str] = []  # Keys by updatedAt, newest first
+        self._signature: Optional[tuple] = None
+        self._refreshed_at = 0.0
+        self._lock = asyncio.Lock()
+    
+    def _rebuild(self, sessions: list[dict]):
+        """Rebuild all indexes from a sessions list."""
+        by_key = {s["key"]: s for s in sessions if s.get("key")}
+        by_channel: dict[str, set[str]] = {}
+        by_model: dict[str, set[str]] = {}
+        for key, session in by_key.items():
+            if session.get("channel"):
+                by_channel.setdefault(session["channel"], set()).add(key)
+            if session.get("model"):
+                by_model.setdefault(session["model"], set()).add(key)
+        
+        self._sessions = by_key
+        self._by_channel = by_channel
+        self._by_model = by_model
+        self._keys_sorted = sorted(by_key)
+        self._names_sorted = sorted((_display_name(s).lower(), k) for k, s in by_key.items())
+        self._recent = sorted(by_key, key=lambda k: (by_key[k].get("updatedAt") or 0, k), reverse=True)
+    
+    def update(self, sessions: list[dict]):
+        """Apply a fresh sessions list, rebuilding the indexes only if indexed fields changed."""
+        signature = tuple(sorted(
+            (s.get("key", ""), s.get("updatedAt") or 0, _display_name(s), s.get("channel") or "", s.get("model") or "")
+            for s in sessions
+        ))
+        if signature != self._signature:
+            self._rebuild(sessions)
+            self._signature = signature
+        else:
+            # Same keys and ordering; still serve the fresh dicts (labels, usage, ...)
+            self._sessions = {s["key"]: s for s in sessions if s.get("key")}
+        self._refreshed_at = time.time()
+    
+    async def refresh(self, client: OpenClawClient, force: bool = False):
+        """Refresh from the gateway if the index is older than the TTL."""
+        ttl = self.settings.sessions_index_ttl_seconds
+        if not force and self._signature is not None and time.time() - self._refreshed_at <= ttl:
+            CACHE_REQUESTS.inc("sessions_index", "hit")
+            return
+        async with self._lock:
+            if not force and self._signature is not None and time.time() - self._refreshed_at <= ttl:
+                CACHE_REQUESTS.inc("sessions_index", "hit")
+                return
+            backend = get_cache_backend()
+            if backend.shared and not force:
+                # Another worker may have fetched it recently
+                entry = await backend.get("sessions_list")
+                if entry is not None and time.time() - entry[1] <= ttl:
+                    CACHE_REQUESTS.inc("sessions_index", "shared_hit")
+                    self.update(entry[0])
+                    self._refreshed_at = entry[1]
+                    return
+            CACHE_REQUESTS.inc("sessions_index", "miss")
+            sessions = await client.get_sessions()
+            self.update(sessions)
+            if backend.shared:
+                await backend.set("sessions_list", sessions)
+    
+    def channels(self) -> list[str]:
+        """Distinct channels."""
+        return sorted(self._by_channel)
+    
+    def recent(self) -> list[dict]:
+        """All sessions, newest first."""
+        return [self._sessions[k] for k in self._recent]
+    
+    def _prefix_keys(self, q: str) -> set[str]:
+        """Keys whose key or display name starts with `q` (case-insensitive for names)."""
+        matches = set()
+        i = bisect_left(self._keys_sorted, q)
+        while i < len(self._keys_sorted) and self._keys_sorted[i].startswith(q):
+            matches.add(self._keys_sorted[i])
+            i += 1
+        q_lower = q.lower()
+        i = bisect_left(self._names_sorted, (q_lower, ""))
+        while i < len(self._names_sorted) and self._names_sorted[i][0].startswith(q_lower):
+            matches.add(self._names_sorted[i][1])
+            i += 1
+        return matches
+    
+    def query(
+        self,
+        channel: Optional[str] = None,
+        model: Optional[str] = None,
+        q: Optional[str] = None,
+        active_minutes: Optional[int] = None,
+        sort: str = "-updatedAt",
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+    ) -> dict:
+        """Filter, sort and paginate the indexed sessions."""
+        descending = sort.startswith("-")
+        field = sort.lstrip("-")
+        if field not in SORT_FIELDS:
+            raise ValueError(f"Unknown sort field '{field}'")
+        
+        # Intersect the secondary indexes, smallest first
+        candidates: Optional[set[str]] = None
+        filters = []
+        if channel is not None:
+            filters.append(self._by_channel.get(channel, set()))
+        if model is not None:
+            filters.append(self._by_model.get(model, set()))
+        if q:
+            filters.append(self._prefix_keys(q))
+        for keys in sorted(filters, key=len):
+            candidates = set(keys) if candidates is None else candidates & keys
+        
+        if candidates is None and field == "updatedAt":
+            ordered = self._recent if descending else self._recent[::-1]
+        else:
+            keys = self._sessions.keys() if candidates is None else candidates
+            ordered = sorted(
+                keys,
+                key=lambda k: (_sort_value(self._sessions[k], field), k),
+                reverse=descending,
+            )
+        
+        if active_minutes:
+            cutoff = (time.time() - active_minutes * 60) * 1000
+            ordered = [k for k in ordered if (self._sessions[k].get("updatedAt") or 0) >= cutoff]
+        
+        total = len(ordered)
+        start = 0
+        if cursor:
+            after = decode_cursor(cursor, sort)
+            
+            def past(key: str) -> bool:
+                item = (_sort_value(self._sessions[key], field), key)
+                return item < after if descending else item > after
+            
+            # First position past the cursor in the (possibly descending) order
+            lo, hi = 0, len(ordered)
+            while lo < hi:
+                mid = (lo + hi) // 2
+                if past(ordered[mid]):
+                    hi = mid
+                else:
+                    lo = mid + 1
+            start = lo
+        
+        page_keys = ordered[start:start + limit] if limit else ordered[start:]
+        next_cursor = None
+        if limit and start + limit < total and page_keys:
+            last = page_keys[-1]
+            next_cursor = encode_cursor(sort, _sort_value(self._sessions[last], field), last)
+        
+        return {
+            "sessions": [self._sessions[k] for k in page_keys],
+            "total": total,
+            "nextCursor": next_cursor,
+        }
+
+
+# Singleton instance
+_index: Optional[SessionsIndex] = None
+
+
+def get_sessions_index() -> SessionsIndex:
+    """Get or create sessions index instance."""
+    global _index
+    if _index is None:
+        _index = SessionsIndex()
+    return _index
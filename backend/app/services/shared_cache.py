@@ -0,0 +1,152 @@
+"""Cache backends for gateway data shared between uvicorn worker processes.
+
+Shared: the sessions list, config, cron job list and cron stats overview,
+the health snapshot, queue samples and client presence. Kept per worker:
+the stale responses used when admission control sheds a call (a fallback
+written on every gateway read, which a database round trip would defeat)
+and the session history cache (large per-session message lists merged
+incrementally; it can spill to disk, see history_cache_dir).
+"""
+
+import asyncio
+import json
+import sqlite3
+import tempfile
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import deque
+from pathlib import Path
+from typing import Any, Optional
+from ..config import get_settings
+
+
+class CacheBackend(ABC):
+    """Key/value entries plus append-only streams, with store timestamps.
+    
+    `shared` is True when other processes on the host see the same data.
+    """
+    
+    shared = False
+    
+    @abstractmethod
+    async def get(self, key: str) -> Optional[tuple[Any, float]]:
+        """(value, stored_at) for a key, or None."""
+    
+    @abstractmethod
+    async def set(self, key: str, value: Any):
+        """Store a value, stamped with the current time."""
+    
+    @abstractmethod
+    async def append(self, stream: str, ts: float, value: Any, keep: int):
+        """Append to a stream, keeping its newest `keep` items."""
+    
+    @abstractmethod
+    async def since(self, stream: str, ts: float) -> list[tuple[float, Any]]:
+        """Stream items with a timestamp after `ts`, oldest first."""
+
+
+class MemoryCacheBackend(CacheBackend):
+    """Per-process backend (the default; nothing is shared)."""
+    
+    def __init__(self):
+        self._entries: dict[str, tuple[Any, float]] = {}
+        self._streams: dict[str, deque] = {}
+    
+    async def get(self, key: str) -> Optional[tuple[Any, float]]:
+        return self._entries.get(key)
+    
+    async def set(self, key: str, value: Any):
+        self._entries[key] = (value, time.time())
+    
+    async def append(self, stream: str, ts: float, value: Any, keep: int):
+        items = self._streams.get(stream)
+        if items is None or items.maxlen != keep:
+            items = self._streams[stream] = deque(items or (), maxlen=keep)
+        items.append((ts, value))
+    
+    async def since(self, stream: str, ts: float) -> list[tuple[float, Any]]:
+        return [item for item in self._streams.get(stream, ()) if item[0] > ts]
+
+
+class SqliteCacheBackend(CacheBackend):
+    """Backend in a SQLite database in WAL mode, shared by all workers on the host.
+    
+    Values are stored as JSON. Calls run in a thread so the event loop never
+    blocks on the database.
+    """
+    
+    shared = True
+    
+    def __init__(self, path: str):
+        self.path = Path(path).expanduser()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute("PRAGMA busy_timeout=5000")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS entries (key TEXT PRIMARY KEY, value TEXT, stored_at REAL)"
+        )
+        self._db.execute("CREATE TABLE IF NOT EXISTS streams (stream TEXT, ts REAL, value TEXT)")
+        self._db.execute("CREATE INDEX IF NOT EXISTS streams_ts ON streams (stream, ts)")
+        self._lock = threading.Lock()
+    
+    def _execute(self, sql: str, params: tuple = ()) -> list[tuple]:
+        with self._lock:
+            return self._db.execute(sql, params).fetchall()
+    
+    async def get(self, key: str) -> Optional[tuple[Any, float]]:
+        rows = await asyncio.to_thread(
+            self._execute, "SELECT value, stored_at FROM entries WHERE key = ?", (key,)
+        )
+        if not rows:
+            return None
+        return json.loads(rows[0][0]), rows[0][1]
+    
+    async def set(self, key: str, value: Any):
+        await asyncio.to_thread(
+            self._execute,
+            "INSERT OR REPLACE INTO entries (key, value, stored_at) VALUES (?, ?, ?)",
+            (key, json.dumps(value, separators=(",", ":")), time.time()),
+        )
+    
+    def _append(self, stream: str, ts: float, value: str, keep: int):
+        with self._lock:
+            self._db.execute("INSERT INTO streams (stream, ts, value) VALUES (?, ?, ?)", (stream, ts, value))
+            self._db.execute(
+                "DELETE FROM streams WHERE stream = ? AND ts < ("
+                "SELECT ts FROM streams WHERE stream = ? ORDER BY ts DESC LIMIT 1 OFFSET ?)",
+                (stream, stream, keep - 1),
+            )
+    
+    async def append(self, stream: str, ts: float, value: Any, keep: int):
+        await asyncio.to_thread(self._append, stream, ts, json.dumps(value, separators=(",", ":")), keep)
+    
+    async def since(self, stream: str, ts: float) -> list[tuple[float, Any]]:
+        rows = await asyncio.to_thread(
+            self._execute,
+            "SELECT ts, value FROM streams WHERE stream = ? AND ts > ? ORDER BY ts",
+            (stream, ts),
+        )
+        return [(row_ts, json.loads(value)) for row_ts, value in rows]
+
+
+def default_cache_path() -> str:
+    return str(Path(tempfile.gettempdir()) / "scuttlebox-cache.db")
+
+
+# Singleton instance
+_backend: Optional[CacheBackend] = None
+
+
+def get_cache_backend() -> CacheBackend:
+    """Get or create the configured cache backend."""
+    global _backend
+    if _backend is None:
+        settings = get_settings()
+        if settings.cache_backend == "sqlite":
+            _backend = SqliteCacheBackend(settings.cache_path or default_cache_path())
+        else:
+            _backend = MemoryCacheBackend()
+    return _backend
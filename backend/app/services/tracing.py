@@ -0,0 +1,143 @@
+"""Per-request tracing spans and sampled stack profiles for slow requests."""
+
+import asyncio
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional
+
+
+class Trace:
+    """Spans recorded while handling one request."""
+    
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.spans: list[tuple[str, float, float]] = []  # (name, start, end)
+    
+    def add(self, name: str, start: float, end: float):
+        self.spans.append((name, start, end))
+    
+    def summary(self) -> dict[str, dict]:
+        """Per span name: wall time covered (ms, overlaps merged), summed time and count."""
+        grouped: dict[str, list[tuple[float, float]]] = {}
+        for name, start, end in self.spans:
+            grouped.setdefault(name, []).append((start, end))
+        summary = {}
+        for name, intervals in grouped.items():
+            intervals.sort()
+            wall = 0.0
+            cur_start, cur_end = intervals[0]
+            for start, end in intervals[1:]:
+                if start > cur_end:
+                    wall += cur_end - cur_start
+                    cur_start, cur_end = start, end
+                else:
+                    cur_end = max(cur_end, end)
+            wall += cur_end - cur_start
+            summary[name] = {
+                "wallMs": wall * 1000,
+                "totalMs": sum(end - start for start, end in intervals) * 1000,
+                "count": len(intervals),
+            }
+        return summary
+
+
+_trace: ContextVar[Optional[Trace]] = ContextVar("trace", default=None)
+
+
+@contextmanager
+def trace_scope() -> Iterator[Trace]:
+    """Start a trace for the code run in this context."""
+    trace = Trace()
+    token = _trace.set(trace)
+    try:
+        yield trace
+    finally:
+        _trace.reset(token)
+
+
+@contextmanager
+def span(name: str) -> Iterator[None]:
+    """Record a span on the current trace (no-op outside a traced request)."""
+    trace = _trace.get()
+    if trace is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        trace.add(name, start, time.perf_counter())
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({code.co_filename.rsplit('/', 1)[-1]}:{frame.f_lineno})"
+
+
+def _coroutine_frames(coro) -> list:
+    """Frames of a coroutine's await chain, outermost first."""
+    frames = []
+    while coro is not None:
+        frame = getattr(coro, "cr_frame", None) or getattr(coro, "gi_frame", None)
+        if frame is None:
+            break
+        frames.append(frame)
+        coro = getattr(coro, "cr_await", None) or getattr(coro, "gi_yieldfrom", None)
+    return frames
+
+
+class StackSampler:
+    """Samples one request's stack from a background thread.
+    
+    While the request's task is running, the event loop thread's stack is
+    sampled; while it is suspended, its await chain is sampled with a
+    `(waiting)` leaf, so time spent waiting on I/O shows up too. Stacks are
+    collected in the folded format used by flame graph tools.
+    """
+    
+    def __init__(self, task: asyncio.Task, interval: float):
+        self.task = task
+        self.interval = interval
+        self.thread_id = threading.get_ident()
+        self.stacks: Counter[str] = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+    
+    def _sample(self) -> Optional[str]:
+        coro = self.task.get_coro()
+        if getattr(coro, "cr_running", False):
+            frame = sys._current_frames().get(self.thread_id)
+            frames = []
+            while frame is not None:
+                frames.append(frame)
+                frame = frame.f_back
+            labels = [_frame_label(f) for f in reversed(frames)]
+        else:
+            labels = [_frame_label(f) for f in _coroutine_frames(coro)] + ["(waiting)"]
+        return ";".join(labels) if labels else None
+    
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            if self.task.done():
+                break
+            try:
+                stack = self._sample()
+            except Exception:
+                continue
+            if stack:
+                self.stacks[stack] += 1
+    
+    def start(self):
+        self._thread.start()
+    
+    def stop(self) -> Counter:
+        self._stop.set()
+        self._thread.join()
+        return self.stacks
+    
+    def folded(self) -> str:
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
@@ -0,0 +1,114 @@
+"""Cache warm-up at startup and after gateway restarts, with readiness tracking."""
+
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Optional
+from ..config import get_settings
+from .admission import BACKGROUND, fresh_scope, priority_scope
+from .config_mirror import get_config_mirror
+from .cron_stats import get_cron_stats_store
+from .openclaw import OpenClawClient
+from .resilience import deadline_scope
+from .sessions_index import get_sessions_index
+
+
+class CacheWarmer:
+    """Prefetches the caches that first dashboard loads hit.
+    
+    The config schema, config, sessions index and cron list are fetched
+    concurrently. Caches that fail to warm (e.g. while the gateway is still
+    coming up) are retried with exponential backoff until all are warm,
+    which is what `/ready` reports.
+    """
+    
+    def __init__(self):
+        self.settings = get_settings()
+        self.ready = False
+        self.parts: dict[str, dict] = {}
+        self._task: Optional[asyncio.Task] = None
+    
+    def _fetchers(self, client: OpenClawClient) -> dict[str, Callable[[], Awaitable[Any]]]:
+        mirror = get_config_mirror()
+        return {
+            "config_schema": lambda: mirror.get_schema(client, force=True),
+            "config": lambda: mirror.get(client, force=True),
+            "sessions": lambda: get_sessions_index().refresh(client, force=True),
+            "cron": lambda: get_cron_stats_store().get_jobs(client, force=True),
+        }
+    
+    async def _warm_part(self, name: str, fetch: Callable[[], Awaitable[Any]]):
+        started = time.time()
+        try:
+            await asyncio.wait_for(fetch(), self.settings.warmup_timeout_seconds)
+            part = {"ok": True, "error": None}
+        except asyncio.TimeoutError:
+            part = {"ok": False, "error": f"Timed out after {self.settings.warmup_timeout_seconds:g}s"}
+        except Exception as e:
+            part = {"ok": False, "error": str(e)}
+        finished = time.time()
+        part["warmedAt"] = int(finished * 1000) if part["ok"] else None
+        part["latencyMs"] = int((finished - started) * 1000)
+        self.parts[name] = part
+    
+    async def warm(self, client: OpenClawClient, only: Optional[set[str]] = None) -> bool:
+        """Fetch every cache (or just `only`) concurrently. Returns whether all are warm."""
+        fetchers = self._fetchers(client)
+        names = [name for name in fetchers if only is None or name in only]
+        # Warming from stale responses would report caches warm that aren't
+        with fresh_scope():
+            await asyncio.gather(*(self._warm_part(name, fetchers[name]) for name in names))
+        self.ready = all(self.parts.get(name, {}).get("ok") for name in fetchers)
+        return self.ready
+    
+    async def _run(self, client: OpenClawClient, after_restart: bool):
+        # Runs detached from whatever request started it
+        with deadline_scope(None), priority_scope(BACKGROUND):
+            if after_restart:
+                await asyncio.sleep(self.settings.warmup_restart_delay_seconds)
+                await client.reconnect()
+            delay = self.settings.warmup_retry_seconds
+            pending = None
+            while not await self.warm(client, pending):
+                pending = {name for name, part in self.parts.items() if not part["ok"]}
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, self.settings.warmup_retry_max_seconds)
+    
+    def start(self, client: OpenClawClient, after_restart: bool = False):
+        """Warm caches in the background, replacing any warm-up in progress.
+        
+        After a gateway restart, readiness drops until the caches are warm
+        again.
+        """
+        if not self.settings.warmup_enabled:
+            self.ready = True
+            return
+        if after_restart:
+            self.ready = False
+            self.parts = {}
+        if self._task is not None:
+            self._task.cancel()
+        self._task = asyncio.create_task(self._run(client, after_restart))
+    
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+    
+    def snapshot(self) -> dict:
+        return {"ready": self.ready, "caches": self.parts}
+
+
+# Singleton instance
+_warmer: Optional[CacheWarmer] = None
+
+
+def get_cache_warmer() -> CacheWarmer:
+    """Get or create cache warmer instance."""
+    global _warmer
+    if _warmer is None:
+        _warmer = CacheWarmer()
+    return _warmer
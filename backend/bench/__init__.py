@@ -0,0 +1 @@
+"""Benchmark tooling: a fake OpenClaw gateway and a load harness."""
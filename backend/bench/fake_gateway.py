@@ -0,0 +1,289 @@
+"""Local stand-in for the OpenClaw gateway, for benchmarks and offline development.
+
+Run with:
+    
+    python -m bench.fake_gateway --port 18790 --sessions 1000 --latency-ms 5
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import random
+import time
+import uuid
+from dataclasses import dataclass
+from typing import Any, Optional
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+
+CHANNELS = ("telegram", "discord", "slack", "webchat", "cron")
+MODELS = ("anthropic/claude-sonnet", "anthropic/claude-haiku", "openai/gpt-4o")
+
+
+@dataclass
+class FakeGatewayConfig:
+    """Knobs for the fake gateway's scale and behaviour."""
+    sessions: int = 10
+    messages: int = 50  # Messages of history per session
+    message_bytes: int = 200  # Approximate size of each message's text
+    cron_jobs: int = 20
+    latency_ms: float = 5.0  # Added to every /tools/invoke call
+    jitter_ms: float = 0.0  # Uniform random extra latency
+    chat_latency_ms: float = 500.0  # Added to every chat completion
+    error_rate: float = 0.0  # Fraction of calls answered with a 503
+    seed: int = 1
+
+
+def _ok(details: Any) -> dict:
+    return {"ok": True, "result": {"details": details}}
+
+
+def _config_hash(config: dict) -> str:
+    return hashlib.sha256(json.dumps(config, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+
+
+def _merge_patch(target: Any, patch: Any) -> Any:
+    if not isinstance(patch, dict):
+        return patch
+    result = dict(target) if isinstance(target, dict) else {}
+    for key, value in patch.items():
+        if value is None:
+            result.pop(key, None)
+        else:
+            result[key] = _merge_patch(result.get(key), value)
+    return result
+
+
+class FakeGateway:
+    """In-memory gateway state: sessions, histories, config and cron jobs."""
+    
+    def __init__(self, config: FakeGatewayConfig):
+        self.config = config
+        self.random = random.Random(config.seed)
+        now_ms = int(time.time() * 1000)
+        self.sessions = [
+            {
+                "key": f"agent:main:{CHANNELS[i % len(CHANNELS)]}:{i:06d}",
+                "displayName": f"Session {i}",
+                "channel": CHANNELS[i % len(CHANNELS)],
+                "model": MODELS[i % len(MODELS)],
+                "updatedAt": now_ms - i * 60_000,
+                "kind": "direct",
+            }
+            for i in range(config.sessions)
+        ]
+        self._by_key = {s["key"]: s for s in self.sessions}
+        self._histories: dict[str, list[dict]] = {}
+        self.gateway_config = {
+            "agents": {"defaults": {"model": MODELS[0], "maxConcurrent": 4}},
+            "messages": {"queue": {"mode": "collect", "debounceMs": 1000, "cap": 20}},
+            "gateway": {"http": {"endpoints": {"chatCompletions": {"enabled": True}}}},
+        }
+        self.jobs: dict[str, dict] = {}
+        self.runs: dict[str, list[dict]] = {}
+        for i in range(config.cron_jobs):
+            job = {
+                "id": f"job-{i:04d}",
+                "name": f"Job {i}",
+                "enabled": i % 5 != 0,
+                "schedule": {"kind": "cron", "expr": f"{i % 60} * * * *"},
+                "sessionTarget": "isolated",
+                "payload": {"kind": "agentTurn", "message": f"Run job {i}"},
+                "state": {"lastRunAtMs": now_ms - i * 3_600_000, "lastStatus": "ok"},
+            }
+            self.jobs[job["id"]] = job
+            self.runs[job["id"]] = [
+                {
+                    "ts": now_ms - (i + r) * 3_600_000,
+                    "status": "ok" if r % 7 else "error",
+                    "durationMs": 1000 + (i * 37 + r * 11) % 5000,
+                }
+                for r in range(20)
+            ]
+    
+    def history(self, session_key: str) -> Optional[list[dict]]:
+        """Deterministic history for a session, generated on first use."""
+        if session_key not in self._by_key:
+            return None
+        messages = self._histories.get(session_key)
+        if messages is None:
+            filler = ("lorem ipsum dolor sit amet " * (self.config.message_bytes // 27 + 1))[:self.config.message_bytes]
+            updated = self._by_key[session_key]["updatedAt"]
+            messages = []
+            for i in range(self.config.messages):
+                role = "user" if i % 2 == 0 else "assistant"
+                message = {
+                    "id": f"{session_key}:{i}",
+                    "role": role,
+                    "content": [{"type": "text", "text": f"{i}: {filler}"}],
+                    "timestamp": updated - (self.config.messages - i) * 1000,
+                }
+                if role == "assistant":
+                    message["usage"] = {"input": 100 + i, "output": 50 + i}
+                messages.append(message)
+            self._histories[session_key] = messages
+        return messages
+    
+    # --- Tools ---
+    
+    def sessions_list(self, args: dict) -> dict:
+        sessions = self.sessions
+        if args.get("activeMinutes"):
+            cutoff = (time.time() - args["activeMinutes"] * 60) * 1000
+            sessions = [s for s in sessions if s["updatedAt"] >= cutoff]
+        return _ok({"sessions": sessions})
+    
+    def sessions_history(self, args: dict) -> dict:
+        messages = self.history(args.get("sessionKey", ""))
+        if messages is None:
+            return {"ok": False, "error": "Session not found"}
+        limit = args.get("limit") or 50
+        return _ok({"messages": messages[-limit:]})
+    
+    def session_status(self, args: dict) -> dict:
+        current = self.sessions[0] if self.sessions else {}
+        return {"ok": True, "result": {
+            "busy": self.random.random() < 0.2,
+            "sessionKey": current.get("key"),
+            "lastActivity": int(time.time() * 1000),
+            "model": current.get("model"),
+        }}
+    
+    def sessions_send(self, args: dict) -> dict:
+        key = args.get("sessionKey")
+        if key and key in self._by_key:
+            self._by_key[key]["updatedAt"] = int(time.time() * 1000)
+        return _ok({"status": "queued", "runId": uuid.uuid4().hex})
+    
+    def gateway(self, action: Optional[str], args: dict) -> dict:
+        if action == "config.get":
+            return _ok({"result": {
+                "config": self.gateway_config,
+                "hash": _config_hash(self.gateway_config),
+            }})
+        if action == "config.schema":
+            return _ok({"result": {"schema": {"type": "object"}, "uiHints": {}}})
+        if action == "config.patch":
+            if args.get("baseHash") != _config_hash(self.gateway_config):
+                return {"ok": False, "error": "config changed since last load; re-run config.get"}
+            self.gateway_config = _merge_patch(self.gateway_config, json.loads(args.get("raw") or "{}"))
+            return _ok({"result": {"ok": True, "hash": _config_hash(self.gateway_config)}})
+        if action == "restart":
+            return _ok({"result": {"ok": True, "scheduled": True}})
+        return {"ok": False, "error": f"Unknown gateway action '{action}'"}
+    
+    def cron(self, args: dict) -> dict:
+        action = args.get("action")
+        job_id = args.get("jobId")
+        if action == "status":
+            return _ok({"enabled": True, "jobs": len(self.jobs)})
+        if action == "list":
+            jobs = [j for j in self.jobs.values() if j["enabled"] or args.get("includeDisabled")]
+            return _ok({"result": {"jobs": jobs}})
+        if action == "add":
+            job = dict(args.get("job") or {}, id=f"job-{uuid.uuid4().hex[:8]}", state={})
+            self.jobs[job["id"]] = job
+            self.runs[job["id"]] = []
+            return _ok({"result": job})
+        if job_id not in self.jobs:
+            return {"ok": False, "error": f"Job '{job_id}' not found"}
+        if action == "update":
+            self.jobs[job_id] = _merge_patch(self.jobs[job_id], args.get("patch") or {})
+            return _ok({"result": self.jobs[job_id]})
+        if action == "remove":
+            self.jobs.pop(job_id)
+            self.runs.pop(job_id, None)
+            return _ok({"result": {"removed": True}})
+        if action == "run":
+            now_ms = int(time.time() * 1000)
+            self.jobs[job_id].setdefault("state", {})["lastRunAtMs"] = now_ms
+            self.runs[job_id].insert(0, {"ts": now_ms, "status": "ok", "durationMs": 1000})
+            return _ok({"result": {"ran": True}})
+        if action == "runs":
+            return _ok({"result": {"runs": self.runs[job_id]}})
+        return {"ok": False, "error": f"Unknown cron action '{action}'"}
+    
+    def invoke(self, body: dict) -> dict:
+        """Dispatch a /tools/invoke body to its tool."""
+        tool = body.get("tool")
+        args = body.get("args") or {}
+        if tool == "sessions_list":
+            return self.sessions_list(args)
+        if tool == "sessions_history":
+            return self.sessions_history(args)
+        if tool == "session_status":
+            return self.session_status(args)
+        if tool == "sessions_send":
+            return self.sessions_send(args)
+        if tool == "gateway":
+            return self.gateway(body.get("action"), args)
+        if tool == "cron":
+            return self.cron(args)
+        return {"ok": False, "error": f"Unknown tool '{tool}'"}
+
+
+def create_app(config: FakeGatewayConfig) -> FastAPI:
+    """Build the fake gateway app."""
+    app = FastAPI(title="Fake OpenClaw Gateway")
+    gateway = FakeGateway(config)
+    
+    async def delay(base_ms: float):
+        extra = gateway.random.uniform(0, config.jitter_ms) if config.jitter_ms else 0.0
+        if base_ms + extra > 0:
+            await asyncio.sleep((base_ms + extra) / 1000)
+    
+    def failed() -> bool:
+        return config.error_rate > 0 and gateway.random.random() < config.error_rate
+    
+    @app.post("/tools/invoke")
+    async def tools_invoke(request: Request):
+        body = await request.json()
+        await delay(config.latency_ms)
+        if failed():
+            return JSONResponse({"ok": False, "error": "Injected failure"}, status_code=503)
+        return gateway.invoke(body)
+    
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request):
+        body = await request.json()
+        await delay(config.chat_latency_ms)
+        if failed():
+            return JSONResponse({"error": {"message": "Injected failure"}}, status_code=503)
+        prompt = (body.get("messages") or [{}])[-1].get("content", "")
+        return {
+            "id": f"chatcmpl-{uuid.uuid4().hex[:12]}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", "openclaw:main"),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": f"Echo: {prompt[:200]}"},
+                "finish_reason": "stop",
+            }],
+        }
+    
+    return app
+
+
+def parse_args(argv: Optional[list[str]] = None) -> tuple[argparse.Namespace, FakeGatewayConfig]:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=18790)
+    defaults = FakeGatewayConfig()
+    for field, value in vars(defaults).items():
+        parser.add_argument(f"--{field.replace('_', '-')}", type=type(value), default=value)
+    args = parser.parse_args(argv)
+    config = FakeGatewayConfig(**{field: getattr(args, field) for field in vars(defaults)})
+    return args, config
+
+
+def main():
+    import uvicorn
+    args, config = parse_args()
+    uvicorn.run(create_app(config), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,207 @@
+"""Benchmark the Scuttlebox backend against the fake gateway at several scales.
+
+Run from backend/:
+    
+    python -m bench.run --scales 10,1000,10000 --requests 200 --concurrency 10
+
+For each scale, a fake gateway and a backend (uvicorn) are started as
+subprocesses, and each endpoint is hit with a fixed number of requests. The
+report has p50/p99 latency, throughput, errors and the backend's peak RSS.
+"""
+
+import argparse
+import asyncio
+import datetime
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Optional
+import httpx
+
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+DEFAULT_ENDPOINTS = ("/api/logs", "/api/status", "/api/files/memory", "/api/cron/jobs")
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def peak_rss_kb(pid: int) -> Optional[int]:
+    """Peak resident set size of a process (Linux only)."""
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return None
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """Nearest-rank percentile."""
+    ordered = sorted(values)
+    rank = max(1, -(-len(ordered) * pct // 100))
+    return ordered[int(rank) - 1]
+
+
+def make_workspace(root: Path, memory_files: int, memory_bytes: int):
+    """Create a workspace with MEMORY.md and daily memory files."""
+    memory_dir = root / "memory"
+    memory_dir.mkdir(parents=True)
+    filler = ("- remembered something useful\n" * (memory_bytes // 30 + 1))[:memory_bytes]
+    (root / "MEMORY.md").write_text(f"# Memory\n\n{filler}", encoding="utf-8")
+    day = datetime.date(2025, 1, 1)
+    for i in range(memory_files):
+        name = (day + datetime.timedelta(days=i)).isoformat()
+        (memory_dir / f"{name}.md").write_text(f"# {name}\n\n{filler}", encoding="utf-8")
+
+
+def wait_ready(url: str, timeout: float = 30.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(url, timeout=1.0).status_code < 500:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.1)
+    raise RuntimeError(f"{url} did not become ready")
+
+
+async def hit(url: str, requests: int, concurrency: int) -> dict:
+    """Issue `requests` GETs with up to `concurrency` in flight."""
+    latencies: list[float] = []
+    errors = 0
+    remaining = requests
+    
+    async def worker(client: httpx.AsyncClient):
+        nonlocal remaining, errors
+        while remaining > 0:
+            remaining -= 1
+            started = time.perf_counter()
+            try:
+                resp = await client.get(url)
+                if resp.status_code >= 400:
+                    errors += 1
+            except httpx.HTTPError:
+                errors += 1
+            latencies.append(time.perf_counter() - started)
+    
+    limits = httpx.Limits(max_connections=concurrency)
+    async with httpx.AsyncClient(timeout=120.0, limits=limits) as client:
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(client) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+    
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "p50Ms": percentile(latencies, 50) * 1000,
+        "p99Ms": percentile(latencies, 99) * 1000,
+        "meanMs": statistics.fmean(latencies) * 1000,
+        "rps": len(latencies) / elapsed if elapsed else 0.0,
+    }
+
+
+def run_scale(sessions: int, args: argparse.Namespace) -> list[dict]:
+    """Benchmark every endpoint against a fresh gateway and backend."""
+    gateway_port, backend_port = free_port(), free_port()
+    gateway_cmd = [
+        sys.executable, "-m", "bench.fake_gateway",
+        "--port", str(gateway_port),
+        "--sessions", str(sessions),
+        "--messages", str(args.messages),
+        "--message-bytes", str(args.message_bytes),
+        "--latency-ms", str(args.latency_ms),
+        "--jitter-ms", str(args.jitter_ms),
+        "--error-rate", str(args.error_rate),
+    ]
+    results = []
+    with tempfile.TemporaryDirectory() as workspace:
+        make_workspace(Path(workspace), args.memory_files, args.memory_bytes)
+        env = dict(
+            os.environ,
+            OPENCLAW_GATEWAY_URL=f"http://127.0.0.1:{gateway_port}",
+            OPENCLAW_GATEWAY_TOKEN="",
+            OPENCLAW_WORKSPACE=workspace,
+        )
+        backend_cmd = [
+            sys.executable, "-m", "uvicorn", "app.main:app",
+            "--port", str(backend_port), "--log-level", "warning",
+        ]
+        gateway = subprocess.Popen(gateway_cmd, cwd=BACKEND_DIR)
+        backend = subprocess.Popen(backend_cmd, cwd=BACKEND_DIR, env=env)
+        try:
+            wait_ready(f"http://127.0.0.1:{gateway_port}/docs")
+            wait_ready(f"http://127.0.0.1:{backend_port}/health")
+            for endpoint in args.endpoints:
+                url = f"http://127.0.0.1:{backend_port}{endpoint}"
+                asyncio.run(hit(url, args.warmup, 1))
+                result = asyncio.run(hit(url, args.requests, args.concurrency))
+                result.update(
+                    sessions=sessions,
+                    endpoint=endpoint,
+                    peakRssMb=(peak_rss_kb(backend.pid) or 0) / 1024,
+                )
+                results.append(result)
+                print_row(result)
+        finally:
+            for proc in (backend, gateway):
+                proc.terminate()
+                try:
+                    proc.wait(timeout=10)
+                except subprocess.TimeoutExpired:
+                    proc.kill()
+    return results
+
+
+HEADER = f"{'sessions':>8}  {'endpoint':<20} {'p50 ms':>9} {'p99 ms':>9} {'req/s':>9} {'errors':>7} {'peak RSS MB':>12}"
+
+
+def print_row(r: dict):
+    print(
+        f"{r['sessions']:>8}  {r['endpoint']:<20} {r['p50Ms']:>9.1f} {r['p99Ms']:>9.1f} "
+        f"{r['rps']:>9.1f} {r['errors']:>7} {r['peakRssMb']:>12.1f}",
+        flush=True,
+    )
+
+
+def main(argv: Optional[list[str]] = None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scales", default="10,1000,10000", help="Comma-separated session counts")
+    parser.add_argument("--endpoints", default=",".join(DEFAULT_ENDPOINTS))
+    parser.add_argument("--requests", type=int, default=200, help="Requests per endpoint")
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--warmup", type=int, default=5)
+    parser.add_argument("--messages", type=int, default=50, help="History messages per session")
+    parser.add_argument("--message-bytes", type=int, default=200)
+    parser.add_argument("--latency-ms", type=float, default=5.0, help="Gateway latency per call")
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--memory-files", type=int, default=365)
+    parser.add_argument("--memory-bytes", type=int, default=4000)
+    parser.add_argument("--json", dest="json_path", help="Also write results to this file")
+    args = parser.parse_args(argv)
+    args.endpoints = [e for e in args.endpoints.split(",") if e]
+    
+    print(HEADER)
+    results = []
+    for sessions in (int(s) for s in args.scales.split(",") if s):
+        results.extend(run_scale(sessions, args))
+    
+    if args.json_path:
+        Path(args.json_path).write_text(json.dumps(results, indent=2), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
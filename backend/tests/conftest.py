@@ -0,0 +1,50 @@
+import asyncio
+import pytest
+from app.config import get_settings
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture
+def command_limits(monkeypatch):
+    settings = get_settings()
+    monkeypatch.setattr(settings, "command_max_in_flight", 2)
+    monkeypatch.setattr(settings, "command_session_concurrency", 1)
+    monkeypatch.setattr(settings, "command_session_queue", 2)
+    monkeypatch.setattr(settings, "command_global_queue", 3)
+
+
+class Gate:
+    """A command that blocks until released, recording how many run at once."""
+    
+    def __init__(self):
+        self.release = asyncio.Event()
+        self.running = 0
+        self.peak = 0
+    
+    async def __call__(self) -> str:
+        self.running += 1
+        self.peak = max(self.peak, self.running)
+        try:
+            await self.release.wait()
+            return "done"
+        finally:
+            self.running -= 1
+
+
+@pytest.fixture
+def gate():
+    return Gate()
+
+
+@pytest.fixture
+def shared_backend(monkeypatch):
+    """An in-memory backend that the services treat as shared between workers."""
+    from app.services import shared_cache
+    backend = shared_cache.MemoryCacheBackend()
+    backend.shared = True
+    monkeypatch.setattr(shared_cache, "_backend", backend)
+    return backend
@@ -0,0 +1,156 @@
+import asyncio
+import json
+import httpx
+import pytest
+from app.config import get_settings
+from app.services.admission import (
+    BACKGROUND,
+    INTERACTIVE,
+    POLL,
+    WRITE,
+    AdmissionController,
+    StaleResponses,
+    classify,
+    fresh_scope,
+    priority_scope,
+)
+from app.services.openclaw import OpenClawClient
+from app.services.resilience import LoadShedError
+
+
+@pytest.fixture
+def admission_limits(monkeypatch):
+    settings = get_settings()
+    monkeypatch.setattr(settings, "admission_enabled", True)
+    monkeypatch.setattr(settings, "admission_max_in_flight", 10)
+    monkeypatch.setattr(settings, "admission_poll_shed_at", 0.5)
+    monkeypatch.setattr(settings, "admission_background_shed_at", 0.8)
+    monkeypatch.setattr(settings, "retry_max_attempts", 1)
+    monkeypatch.setattr(settings, "gateway_record_path", "")
+    monkeypatch.setattr(settings, "gateway_replay_path", "")
+
+
+@pytest.mark.parametrize("method, path, lane", [
+    ("POST", "/api/command", INTERACTIVE),
+    ("GET", "/api/command/jobs/abc", INTERACTIVE),
+    ("POST", "/api/cron/jobs", WRITE),
+    ("GET", "/api/sessions", POLL),
+    ("GET", "/api/status/", POLL),
+    ("GET", "/api/fleet/sessions", POLL),
+    ("GET", "/api/sessions/main/history", INTERACTIVE),
+])
+def test_classify(method, path, lane):
+    assert classify(method, path) == lane
+
+
+@pytest.mark.anyio
+async def test_polls_shed_before_background(admission_limits):
+    admission = AdmissionController()
+    admission.in_flight = 5
+    with pytest.raises(LoadShedError):
+        await admission.acquire(POLL)
+    await admission.acquire(BACKGROUND)
+    assert admission.in_flight == 6
+    admission.in_flight = 8
+    with pytest.raises(LoadShedError):
+        await admission.acquire(BACKGROUND)
+
+
+@pytest.mark.anyio
+async def test_non_sheddable_calls_are_admitted(admission_limits):
+    admission = AdmissionController()
+    admission.in_flight = 8
+    await admission.acquire(POLL, sheddable=False)
+    assert admission.in_flight == 9
+
+
+@pytest.mark.anyio
+async def test_freed_slots_go_to_the_highest_priority_waiter(admission_limits):
+    admission = AdmissionController()
+    admission.in_flight = admission.max_in_flight
+    order = []
+    
+    async def call(priority):
+        await admission.acquire(priority, sheddable=False)
+        order.append(priority)
+    
+    tasks = [asyncio.create_task(call(p)) for p in (POLL, BACKGROUND, WRITE, INTERACTIVE)]
+    await asyncio.sleep(0)
+    assert admission.snapshot()["waiting"] == {INTERACTIVE: 1, WRITE: 1, BACKGROUND: 1, POLL: 1}
+    # A sheddable call doesn't jump the queue
+    with pytest.raises(LoadShedError):
+        await admission.acquire(POLL)
+    for _ in tasks:
+        admission.release()
+        await asyncio.sleep(0)
+    await asyncio.gather(*tasks)
+    assert order == [INTERACTIVE, WRITE, BACKGROUND, POLL]
+    assert admission.in_flight == admission.max_in_flight
+
+
+def test_stale_responses_evict_least_recently_used():
+    stale = StaleResponses(2)
+    stale.put("a", {"n": 1})
+    stale.put("b", {"n": 2})
+    stale.get("a")
+    stale.put("c", {"n": 3})
+    assert "a" in stale and "c" in stale
+    assert "b" not in stale
+
+
+class Gateway:
+    """Answers session_status until it goes down."""
+    
+    def __init__(self):
+        self.up = True
+        self.calls = 0
+    
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.calls += 1
+        if not self.up:
+            raise httpx.ConnectError("Connection refused", request=request)
+        assert json.loads(request.content)["tool"] == "session_status"
+        return httpx.Response(200, json={"ok": True, "result": {"busy": False}})
+
+
+@pytest.fixture
+def loaded_client(admission_limits):
+    """A client whose session_status is cached stale and whose gateway is now down and busy."""
+    gateway = Gateway()
+    client = OpenClawClient()
+    client._http_client = httpx.AsyncClient(transport=httpx.MockTransport(gateway))
+    
+    async def load():
+        assert await client.get_session_status() == {"busy": False}
+        gateway.up = False
+        # Above both shed thresholds, below max_in_flight
+        client.admission.in_flight = 9
+        return client, gateway
+    return load
+
+
+@pytest.mark.anyio
+async def test_shed_reads_are_served_stale_and_marked(loaded_client):
+    client, gateway = await loaded_client()
+    with priority_scope(POLL):
+        result = await client.invoke_tool("session_status", {})
+    assert result == {"ok": True, "result": {"busy": False}, "stale": True}
+    assert gateway.calls == 1
+    # The cached response itself is left unmarked
+    assert all("stale" not in entry for entry in client.stale._entries.values())
+
+
+@pytest.mark.anyio
+async def test_health_check_is_never_served_stale(loaded_client):
+    client, gateway = await loaded_client()
+    assert await client.health_check() == {"ok": False, "error": "Cannot connect to gateway"}
+    assert gateway.calls == 2
+
+
+@pytest.mark.anyio
+async def test_fresh_scope_skips_the_stale_fallback(loaded_client):
+    client, gateway = await loaded_client()
+    with priority_scope(POLL), fresh_scope():
+        with pytest.raises(httpx.ConnectError):
+            await client.get_session_status()
+    assert gateway.calls == 2
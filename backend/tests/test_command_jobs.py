@@ -0,0 +1,66 @@
+import asyncio
+import pytest
+from app.config import get_settings
+from app.services.command_jobs import CommandJobStore
+from app.services.dispatcher import CommandDispatcher
+
+
+@pytest.mark.anyio
+async def test_job_runs_in_background_and_reports_result(command_limits, gate):
+    store = CommandJobStore(CommandDispatcher())
+    job = store.submit("s", gate)
+    await asyncio.sleep(0)
+    assert job.status == "running"
+    gate.release.set()
+    await job.task
+    view = store.describe(store.get(job.id))
+    assert view["status"] == "succeeded"
+    assert view["response"] == "done"
+    assert view["finishedAt"] >= view["startedAt"]
+
+
+@pytest.mark.anyio
+async def test_queued_job_reports_position_and_can_be_cancelled(command_limits, gate):
+    dispatcher = CommandDispatcher()
+    store = CommandJobStore(dispatcher)
+    running = store.submit("s", gate)
+    queued = store.submit("s", gate)
+    await asyncio.sleep(0.01)
+    assert store.describe(queued)["queuePosition"] == 1
+    
+    store.cancel(queued.id)
+    await asyncio.gather(queued.task, return_exceptions=True)
+    assert queued.status == "cancelled"
+    assert dispatcher.snapshot("s")["sessions"][0]["waiting"] == 0
+    
+    gate.release.set()
+    await running.task
+    assert running.status == "succeeded"
+    assert gate.peak == 1
+
+
+@pytest.mark.anyio
+async def test_failed_job_keeps_error(command_limits):
+    store = CommandJobStore(CommandDispatcher())
+    
+    async def fail() -> str:
+        raise RuntimeError("gateway down")
+    
+    job = store.submit("s", fail)
+    await job.task
+    assert job.status == "failed"
+    assert job.error == "gateway down"
+
+
+@pytest.mark.anyio
+async def test_finished_jobs_expire(command_limits, monkeypatch):
+    monkeypatch.setattr(get_settings(), "command_job_ttl_seconds", 0.0)
+    store = CommandJobStore(CommandDispatcher())
+    
+    async def ok() -> str:
+        return "ok"
+    
+    job = store.submit("s", ok)
+    await job.task
+    await asyncio.sleep(0.01)
+    assert store.get(job.id) is None
@@ -0,0 +1,74 @@
+import asyncio
+import pytest
+from app.config import get_settings
+from app.services.config_batcher import ConfigPatchBatcher, _composable, combine_patches
+from app.services.config_mirror import merge_patch
+
+
+def apply_in_turn(config: dict, *patches: dict) -> dict:
+    for patch in patches:
+        config = merge_patch(config, patch)
+    return config
+
+
+@pytest.mark.parametrize("first, second", [
+    ({"a": 1}, {"b": 2}),
+    ({"a": 1}, {"a": 2}),
+    ({"a": {"x": 1}}, {"a": {"y": 2}}),
+    ({"a": {"x": 1}}, {"a": 5}),
+    ({"a": {"x": None}}, {"a": {"y": 1}}),
+    ({"a": None}, {"a": 3}),
+])
+def test_composed_patch_matches_sequential_application(first, second):
+    original = {"a": {"x": 0, "z": 0}, "b": 0}
+    assert _composable(first, second)
+    assert merge_patch(original, combine_patches(first, second)) == apply_in_turn(original, first, second)
+
+
+@pytest.mark.parametrize("first, second", [
+    ({"a": None}, {"a": {"b": 1}}),
+    ({"a": 5}, {"a": {"b": 1}}),
+    ({"a": {"x": 5}}, {"a": {"x": {"y": 1}}}),
+])
+def test_patches_that_do_not_compose(first, second):
+    original = {"a": {"x": {"q": 1}, "z": 0}}
+    assert not _composable(first, second)
+    # Merging them anyway would give a different config
+    assert merge_patch(original, combine_patches(first, second)) != apply_in_turn(original, first, second)
+
+
+class FakeMirror:
+    def __init__(self):
+        self.patches: list[dict] = []
+    
+    async def patch(self, client, patch: dict, base_hash=None) -> dict:
+        self.patches.append(patch)
+        return {"ok": True, "n": len(self.patches)}
+
+
+@pytest.fixture
+def debounce(monkeypatch):
+    settings = get_settings()
+    monkeypatch.setattr(settings, "config_patch_debounce_ms", 20)
+    monkeypatch.setattr(settings, "config_patch_max_wait_ms", 200)
+
+
+@pytest.mark.anyio
+async def test_patches_in_window_are_sent_once(debounce):
+    mirror = FakeMirror()
+    batcher = ConfigPatchBatcher(mirror)
+    results = await asyncio.gather(
+        batcher.submit(None, {"a": {"x": 1}}),
+        batcher.submit(None, {"a": {"y": 2}}),
+        batcher.submit(None, {"b": 3}),
+    )
+    assert mirror.patches == [{"a": {"x": 1, "y": 2}, "b": 3}]
+    assert results == [{"ok": True, "n": 1}] * 3
+
+
+@pytest.mark.anyio
+async def test_scalar_then_nested_set_flushes_separately(debounce):
+    mirror = FakeMirror()
+    batcher = ConfigPatchBatcher(mirror)
+    await asyncio.gather(batcher.submit(None, {"a": 5}), batcher.submit(None, {"a": {"b": 1}}))
+    assert mirror.patches == [{"a": 5}, {"a": {"b": 1}}]
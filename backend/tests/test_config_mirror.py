@@ -0,0 +1,83 @@
+import json
+import pytest
+from app.services.config_mirror import ConfigConflictError, ConfigMirror, merge_patch
+
+
+class FakeGateway:
+    """Config endpoints of a gateway, with another editor able to sneak in changes."""
+    
+    def __init__(self, config: dict):
+        self.config = config
+        self.version = 1
+        self.patches: list[tuple[dict, str]] = []
+        self.error: str = ""
+    
+    @property
+    def hash(self) -> str:
+        return f"h{self.version}"
+    
+    def edit(self, patch: dict):
+        self.config = merge_patch(self.config, patch)
+        self.version += 1
+    
+    async def get_config(self) -> dict:
+        return {"config": json.loads(json.dumps(self.config)), "hash": self.hash}
+    
+    async def patch_config(self, patch: dict, base_hash: str) -> dict:
+        self.patches.append((patch, base_hash))
+        if self.error:
+            return {"ok": False, "error": self.error}
+        if base_hash != self.hash:
+            return {"ok": False, "error": "config changed since last load; re-run config.get"}
+        self.edit(patch)
+        return {"ok": True, "result": {"details": {"result": {"hash": self.hash}}}}
+
+
+@pytest.mark.anyio
+async def test_patch_uses_tracked_hash_and_updates_mirror():
+    gateway = FakeGateway({"a": 1})
+    mirror = ConfigMirror()
+    await mirror.get(gateway)
+    await mirror.patch(gateway, {"b": 2})
+    assert gateway.patches == [({"b": 2}, "h1")]
+    assert await mirror.get(gateway) == {"config": {"a": 1, "b": 2}, "hash": "h2"}
+
+
+@pytest.mark.anyio
+async def test_conflict_on_other_keys_is_retried():
+    gateway = FakeGateway({"a": 1, "b": 1})
+    mirror = ConfigMirror()
+    await mirror.get(gateway)
+    gateway.edit({"a": 2})
+    await mirror.patch(gateway, {"b": 3})
+    assert [base for _, base in gateway.patches] == ["h1", "h2"]
+    assert gateway.config == {"a": 2, "b": 3}
+
+
+@pytest.mark.anyio
+async def test_conflict_on_same_keys_is_refused():
+    gateway = FakeGateway({"a": 1})
+    mirror = ConfigMirror()
+    await mirror.get(gateway)
+    gateway.edit({"a": 2})
+    with pytest.raises(ConfigConflictError):
+        await mirror.patch(gateway, {"a": 3})
+    assert gateway.config == {"a": 2}
+
+
+@pytest.mark.anyio
+async def test_other_errors_mentioning_hash_are_not_retried():
+    gateway = FakeGateway({"a": 1})
+    gateway.error = "invalid value for auth.passwordHash"
+    mirror = ConfigMirror()
+    result = await mirror.patch(gateway, {"auth": {"passwordHash": "x"}})
+    assert result["ok"] is False
+    assert len(gateway.patches) == 1
+
+
+@pytest.mark.anyio
+async def test_get_returns_a_copy():
+    gateway = FakeGateway({"a": {"b": 1}})
+    mirror = ConfigMirror()
+    (await mirror.get(gateway))["config"]["a"]["b"] = 99
+    assert (await mirror.get(gateway))["config"] == {"a": {"b": 1}}
@@ -0,0 +1,80 @@
+import asyncio
+import pytest
+from app.config import get_settings
+from app.services.cron_stats import CronStatsStore
+
+
+class FakeClient:
+    def __init__(self, runs: list[dict]):
+        self.runs = runs
+        self.run_calls = 0
+    
+    async def cron_list(self, include_disabled: bool = False) -> dict:
+        last_run = max((r["runAtMs"] for r in self.runs), default=None)
+        return {"jobs": [{"id": "job", "name": "Job", "state": {"lastRunAtMs": last_run}}]}
+    
+    async def cron_runs(self, job_id: str) -> dict:
+        self.run_calls += 1
+        return {"runs": list(self.runs)}
+
+
+@pytest.mark.anyio
+async def test_running_run_is_ingested_once_it_finishes():
+    client = FakeClient([
+        {"runAtMs": 1000, "status": "ok", "durationMs": 10},
+        {"runAtMs": 2000, "status": "running"},
+    ])
+    store = CronStatsStore()
+    overview = await store.get_overview(client, force=True)
+    assert overview["fleet"]["runs"] == 1
+    assert store._jobs["job"].high_water_ms == 1000
+    
+    client.runs[1] = {"runAtMs": 2000, "status": "error", "durationMs": 30}
+    await store.invalidate_jobs()
+    overview = await store.get_overview(client, force=True)
+    assert overview["fleet"]["runs"] == 2
+    assert overview["fleet"]["failures"] == 1
+    assert overview["jobs"][0]["lastOutcomes"][0]["status"] == "error"
+
+
+@pytest.mark.anyio
+async def test_finished_jobs_are_not_refetched():
+    client = FakeClient([{"runAtMs": 1000, "status": "ok"}])
+    store = CronStatsStore()
+    await store.get_overview(client, force=True)
+    await store.invalidate_jobs()
+    await store.get_overview(client, force=True)
+    assert client.run_calls == 1
+
+
+@pytest.mark.anyio
+async def test_followers_serve_the_leaders_overview(shared_backend):
+    client = FakeClient([{"runAtMs": 1000, "status": "ok"}])
+    leader, follower = CronStatsStore(), CronStatsStore()
+    leader.start(client)
+    await asyncio.sleep(0.01)
+    await leader.stop()
+    
+    overview = await follower.get_overview(client)
+    assert overview["fleet"]["runs"] == 1
+    assert client.run_calls == 1  # The follower didn't ingest
+
+
+@pytest.mark.anyio
+async def test_follower_ingests_when_leader_overview_is_stale(shared_backend, monkeypatch):
+    monkeypatch.setattr(get_settings(), "cron_stats_refresh_seconds", 0.0)
+    client = FakeClient([{"runAtMs": 1000, "status": "ok"}])
+    await shared_backend.set("cron_stats", {"fleet": {"runs": 0}})
+    await asyncio.sleep(0.01)
+    overview = await CronStatsStore().get_overview(client)
+    assert overview["fleet"]["runs"] == 1
+
+
+@pytest.mark.anyio
+async def test_job_list_invalidation_reaches_other_workers(shared_backend):
+    client = FakeClient([])
+    first, second = CronStatsStore(), CronStatsStore()
+    await first.get_jobs(client)
+    assert await shared_backend.get("cron_jobs") is not None
+    await second.invalidate_jobs()
+    assert (await shared_backend.get("cron_jobs"))[0] is None
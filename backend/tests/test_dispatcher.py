@@ -0,0 +1,63 @@
+import asyncio
+import pytest
+from app.services.dispatcher import CommandDispatcher, DispatcherBusyError
+
+
+@pytest.mark.anyio
+async def test_session_commands_run_one_at_a_time_in_order(command_limits):
+    dispatcher = CommandDispatcher()
+    order = []
+    
+    async def call(i: int) -> int:
+        order.append(i)
+        await asyncio.sleep(0.01)
+        return i
+    
+    tickets = [dispatcher.reserve("s") for _ in range(2)]
+    results = await asyncio.gather(*(dispatcher.run("s", lambda i=i: call(i), t) for i, t in enumerate(tickets)))
+    assert results == order == [0, 1]
+    assert dispatcher.snapshot()["sessions"] == []
+
+
+@pytest.mark.anyio
+async def test_global_limit_caps_concurrency(command_limits, gate):
+    dispatcher = CommandDispatcher()
+    tasks = [asyncio.create_task(dispatcher.run(f"s{i}", gate)) for i in range(3)]
+    await asyncio.sleep(0.01)
+    assert gate.running == 2
+    assert dispatcher.snapshot()["waiting"] == 1
+    gate.release.set()
+    assert await asyncio.gather(*tasks) == ["done"] * 3
+    assert gate.peak == 2
+
+
+@pytest.mark.anyio
+async def test_full_session_queue_is_rejected_with_retry_after(command_limits):
+    dispatcher = CommandDispatcher()
+    dispatcher.reserve("s")
+    dispatcher.reserve("s")
+    with pytest.raises(DispatcherBusyError) as e:
+        dispatcher.reserve("s")
+    assert e.value.position == 3
+    assert e.value.retry_after >= 1
+
+
+@pytest.mark.anyio
+async def test_full_global_queue_is_rejected(command_limits):
+    dispatcher = CommandDispatcher()
+    for key in ("a", "b", "c"):
+        dispatcher.reserve(key)
+    with pytest.raises(DispatcherBusyError):
+        dispatcher.reserve("d")
+
+
+@pytest.mark.anyio
+async def test_released_ticket_frees_its_place(command_limits):
+    dispatcher = CommandDispatcher()
+    first = dispatcher.reserve("s")
+    second = dispatcher.reserve("s")
+    assert dispatcher.position("s", second) == 2
+    dispatcher.release("s", first)
+    assert dispatcher.position("s", second) == 1
+    dispatcher.release("s", second)
+    assert dispatcher.snapshot()["waiting"] == 0
@@ -0,0 +1,93 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
+from fastapi.testclient import TestClient
+from app.middleware import ETagMiddleware
+from app.responses import FastJSONResponse, body_etag, content_etag, etag_matches
+
+
+# What /api/items returns
+_items = {"items": [1, 2, 3]}
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.add_middleware(ETagMiddleware)
+    
+    @app.get("/api/items")
+    async def items():
+        return FastJSONResponse(_items)
+    
+    @app.post("/api/items")
+    async def add_item():
+        return FastJSONResponse(_items)
+    
+    @app.get("/api/tagged")
+    async def tagged():
+        return FastJSONResponse({"version": 7}, headers={"ETag": '"v7"'})
+    
+    @app.get("/api/text")
+    async def text():
+        return PlainTextResponse("hello")
+    
+    _items["items"] = [1, 2, 3]
+    return TestClient(app)
+
+
+def test_json_get_responses_are_tagged(client):
+    response = client.get("/api/items")
+    assert response.status_code == 200
+    assert response.headers["etag"] == body_etag(response.content)
+
+
+def test_matching_if_none_match_is_answered_304(client):
+    etag = client.get("/api/items").headers["etag"]
+    response = client.get("/api/items", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["etag"] == etag
+    assert "content-type" not in response.headers
+
+
+def test_changed_content_gets_a_new_etag(client):
+    etag = client.get("/api/items").headers["etag"]
+    _items["items"].append(4)
+    response = client.get("/api/items", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+    assert response.json() == {"items": [1, 2, 3, 4]}
+
+
+def test_route_etags_are_used_as_is(client):
+    response = client.get("/api/tagged", headers={"If-None-Match": 'W/"v7"'})
+    assert response.status_code == 304
+    assert response.headers["etag"] == '"v7"'
+
+
+def test_other_responses_are_left_alone(client):
+    assert "etag" not in client.post("/api/items").headers
+    assert "etag" not in client.get("/api/text").headers
+
+
+def test_content_etag_ignores_clock_fields_at_any_depth():
+    first = {"data": [{"id": 1, "fetchedAt": 100}], "latencyMs": 12}
+    second = {"latencyMs": 40, "data": [{"fetchedAt": 200, "id": 1}]}
+    ignore = {"fetchedAt", "latencyMs"}
+    assert content_etag(first, ignore) == content_etag(second, ignore)
+    assert content_etag(first) != content_etag(second)
+    assert content_etag({"data": [{"id": 2}]}, ignore) != content_etag(first, ignore)
+
+
+@pytest.mark.parametrize("if_none_match, matches", [
+    (None, False),
+    ("", False),
+    ("*", True),
+    ('"abc"', True),
+    ('W/"abc"', True),
+    ('"xyz", W/"abc"', True),
+    ('"xyz"', False),
+])
+def test_etag_matches_uses_weak_comparison(if_none_match, matches):
+    assert etag_matches(if_none_match, '"abc"') is matches
+    assert etag_matches(if_none_match, 'W/"abc"') is matches
@@ -0,0 +1,43 @@
+import pytest
+from app.config import GatewayTarget, get_settings
+from app.services.fleet import Fleet
+
+
+@pytest.fixture
+def extras(monkeypatch):
+    settings = get_settings()
+    monkeypatch.setattr(settings, "openclaw_gateway_url", "http://primary:18789")
+    
+    def configure(*targets: GatewayTarget):
+        monkeypatch.setattr(settings, "fleet_gateways", list(targets))
+    return configure
+
+
+def test_fleet_is_default_gateway_plus_extras(extras):
+    extras(GatewayTarget(name="alpha", url="http://alpha:18789"))
+    assert [g["name"] for g in Fleet().gateways()] == ["default", "alpha"]
+
+
+def test_extra_pointing_at_default_gateway_is_skipped(extras):
+    extras(GatewayTarget(name="self", url="http://primary:18789/"))
+    assert [g["name"] for g in Fleet().gateways()] == ["default"]
+
+
+def test_duplicate_names_are_rejected(extras):
+    extras(GatewayTarget(name="default", url="http://other:18789"))
+    with pytest.raises(ValueError):
+        Fleet()
+
+
+@pytest.mark.anyio
+async def test_fan_out_isolates_failures(extras):
+    extras(GatewayTarget(name="alpha", url="http://alpha:18789"))
+    
+    async def fetch(client):
+        if client.base_url.startswith("http://alpha"):
+            raise RuntimeError("down")
+        return "ok"
+    
+    results = {r["gateway"]: r for r in await Fleet().fan_out(fetch)}
+    assert results["default"]["data"] == "ok"
+    assert results["alpha"] == {**results["alpha"], "ok": False, "error": "down"}
@@ -0,0 +1,80 @@
+import json
+import httpx
+import pytest
+from app.config import get_settings
+from app.services.openclaw import OpenClawClient
+from app.services.recording import GatewayRecorder, GatewayReplayer, ReplayMissError
+
+
+# What session_status reports
+_status = {"busy": False}
+
+
+def gateway(request: httpx.Request) -> httpx.Response:
+    """Answers sessions_list and session_status like a gateway would."""
+    payload = json.loads(request.content)
+    if payload["tool"] == "sessions_list":
+        minutes = payload["args"].get("activeMinutes")
+        sessions = [{"key": "a"}] if minutes else [{"key": "a"}, {"key": "b"}]
+        return httpx.Response(200, json={"ok": True, "result": {"details": {"sessions": sessions}}})
+    if payload["tool"] == "session_status":
+        return httpx.Response(200, json={"ok": True, "result": dict(_status)})
+    return httpx.Response(404, json={"ok": False, "error": "unknown tool"})
+
+
+@pytest.fixture
+def recording(tmp_path, monkeypatch):
+    path = tmp_path / "gateway.rec"
+    settings = get_settings()
+    monkeypatch.setattr(settings, "gateway_replay_path", "")
+    monkeypatch.setattr(settings, "gateway_record_path", str(path))
+    return path
+
+
+@pytest.mark.anyio
+async def test_recorded_traffic_replays_without_a_gateway(recording, monkeypatch):
+    recorder = OpenClawClient()
+    recorder._http_client = httpx.AsyncClient(transport=httpx.MockTransport(gateway))
+    _status["busy"] = False
+    first_status = await recorder.get_session_status()
+    _status["busy"] = True
+    second_status = await recorder.get_session_status()
+    all_sessions = await recorder.get_sessions()
+    active_sessions = await recorder.get_sessions(active_minutes=5)
+    await recorder.aclose()
+    assert len(recording.read_text().splitlines()) == 4
+    
+    settings = get_settings()
+    monkeypatch.setattr(settings, "gateway_record_path", "")
+    monkeypatch.setattr(settings, "gateway_replay_path", str(recording))
+    replayer = OpenClawClient()
+    try:
+        assert await replayer.get_sessions() == all_sessions
+        assert await replayer.get_sessions(active_minutes=5) == active_sessions
+        # Repeated requests cycle through their responses in order
+        assert await replayer.get_session_status() == first_status
+        assert await replayer.get_session_status() == second_status
+        assert await replayer.get_session_status() == first_status
+        # Unrecorded arguments fall back to the latest response for the same call
+        assert await replayer.get_sessions(active_minutes=60) == active_sessions
+        assert replayer._http_client is None
+    finally:
+        await replayer.aclose()
+
+
+@pytest.mark.anyio
+async def test_unrecorded_call_is_a_replay_miss(tmp_path):
+    path = tmp_path / "gateway.rec"
+    recorder = GatewayRecorder(str(path))
+    response = httpx.Response(200, json={"ok": True})
+    await recorder.record("/tools/invoke", {"tool": "x"}, "x", response, 0.01)
+    recorder.close()
+    
+    replayer = GatewayReplayer(str(path))
+    try:
+        replayed = await replayer.replay("http://gw/tools/invoke", "/tools/invoke", {"tool": "x"}, "x")
+        assert replayed.json() == {"ok": True}
+        with pytest.raises(ReplayMissError):
+            await replayer.replay("http://gw/tools/invoke", "/tools/invoke", {"tool": "y"}, "y")
+    finally:
+        replayer.close()
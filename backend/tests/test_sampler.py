@@ -0,0 +1,86 @@
+import asyncio
+import pytest
+from app.config import get_settings
+from app.services.sampler import QueueSampler, RingBuffer, session_queue_depth
+
+
+def test_ring_buffer_overwrites_oldest():
+    buffer = RingBuffer(3, {"ts": "d", "v": "l"})
+    for i in range(5):
+        buffer.append(ts=float(i), v=i * 10)
+    assert len(buffer) == 3
+    assert [r["v"] for r in buffer.rows()] == [20, 30, 40]
+    assert buffer.first_ts() == 2.0
+    assert buffer.last() == {"ts": 4.0, "v": 40}
+
+
+def test_ring_buffer_range_reads_after_wraparound():
+    buffer = RingBuffer(4, {"ts": "d", "v": "O"})
+    for i in range(10):
+        buffer.append(ts=float(i), v=str(i))
+    assert [r["v"] for r in buffer.rows(7, 8)] == ["7", "8"]
+    assert [r["v"] for r in buffer.rows(start_ts=8.5)] == ["9"]
+    assert buffer.rows(0, 5) == []
+
+
+def test_queue_depth_fields():
+    assert session_queue_depth({"queueDepth": 3}) == 3
+    assert session_queue_depth({"queued": ["a", "b"]}) == 2
+    assert session_queue_depth({"key": "s"}) is None
+
+
+@pytest.fixture
+def sampler(monkeypatch):
+    monkeypatch.setattr(get_settings(), "sampler_history_dir", "")
+    return QueueSampler()
+
+
+def test_rollups_are_time_weighted(sampler):
+    # Idle for 50s at 10s spacing, busy for 5s, then idle again
+    for ts in (0, 10_000, 20_000, 30_000, 40_000):
+        sampler._ingest(ts, False, 1, 0, ())
+    sampler._ingest(50_000, True, 3, 2, ())
+    sampler._ingest(55_000, False, 1, 0, ())
+    # Close the first minute
+    sampler._ingest(60_000, False, 1, 0, ())
+    sampler._ingest(70_000, False, 1, 0, ())
+    
+    (bucket,) = sampler.tiers["1m"].buffer.rows()
+    assert bucket["samples"] == 7
+    assert bucket["busy_ratio"] == pytest.approx(5 / 60)
+    assert bucket["active_avg"] == pytest.approx((55 * 1 + 5 * 3) / 60)
+    assert bucket["active_max"] == 3
+    assert bucket["queued_max"] == 2
+
+
+def test_long_gaps_are_capped(sampler, monkeypatch):
+    settings = get_settings()
+    monkeypatch.setattr(settings, "polling_idle_max_seconds", 10.0)
+    monkeypatch.setattr(settings, "polling_unwatched_max_seconds", 10.0)
+    # A busy sample followed by a 45s outage counts for 10s, not 45s
+    sampler._ingest(0, True, 1, 0, ())
+    sampler._ingest(45_000, False, 1, 0, ())
+    sampler._ingest(50_000, False, 1, 0, ())
+    sampler._ingest(60_000, False, 1, 0, ())
+    sampler._ingest(70_000, False, 1, 0, ())
+    assert sampler.tiers["1m"].buffer.rows()[0]["busy_ratio"] == pytest.approx(10 / 25)
+
+
+@pytest.mark.anyio
+async def test_stop_flushes_open_bucket(sampler):
+    sampler._ingest(0, True, 2, 0, ())
+    sampler._ingest(10_000, False, 2, 0, ())
+    assert sampler.tiers["1m"].buffer.rows() == []
+    # As if the sampling loop were running
+    sampler._task = asyncio.create_task(asyncio.sleep(10))
+    await sampler.stop()
+    (bucket,) = sampler.tiers["1m"].buffer.rows()
+    assert bucket["samples"] == 2
+
+
+def test_raw_history_reports_actual_spacing(sampler):
+    for ts in (0, 30_000, 60_000, 90_000):
+        sampler._ingest(ts, False, 1, 0, (("s", None),))
+    history = sampler.history(0, 90_000, "raw", session_key="s")
+    assert history["intervalMs"] == 30_000
+    assert history["session"][0] == {"ts": 0, "active": True, "queueDepth": None}
@@ -0,0 +1,107 @@
+from datetime import datetime
+from zoneinfo import ZoneInfo
+import pytest
+from app.services.schedule import build_timeline, find_bursts, next_fire_times, parse_cron
+
+
+NY = ZoneInfo("America/New_York")
+
+
+def ms(*args, tz=NY) -> int:
+    return int(datetime(*args, tzinfo=tz).timestamp() * 1000)
+
+
+def local(at_ms: int, tz=NY) -> datetime:
+    return datetime.fromtimestamp(at_ms / 1000, tz).replace(tzinfo=None)
+
+
+def cron(expr: str, tz: str = "America/New_York") -> dict:
+    return {"kind": "cron", "expr": expr, "tz": tz}
+
+
+def test_parse_steps_ranges_and_lists():
+    expr = parse_cron("*/15 9-17/4 1,15 * *")
+    assert expr.seconds == (0,)
+    assert expr.minutes == (0, 15, 30, 45)
+    assert expr.hours == (9, 13, 17)
+    assert expr.days == {1, 15}
+    assert expr.any_weekday and not expr.any_day
+
+
+def test_parse_offset_step():
+    assert parse_cron("5/20 * * * *").minutes == (5, 25, 45)
+
+
+def test_parse_names_and_sunday_as_7():
+    expr = parse_cron("0 0 * jan-mar mon,FRI,7")
+    assert expr.months == {1, 2, 3}
+    assert expr.weekdays == {0, 1, 5}
+
+
+def test_parse_macros_and_seconds_field():
+    assert parse_cron("@hourly") == parse_cron("0 * * * *")
+    assert parse_cron("30 0 12 * * *").seconds == (30,)
+
+
+@pytest.mark.parametrize("expr", ["* * * *", "61 * * * *", "*/0 * * * *", "0 0 * foo *", "5-1 * * * *"])
+def test_parse_rejects_invalid(expr):
+    with pytest.raises(ValueError):
+        parse_cron(expr)
+
+
+def test_day_of_month_or_day_of_week():
+    # Both restricted: standard cron fires on either
+    times = next_fire_times(cron("0 12 13 * fri"), ms(2026, 2, 1), ms(2026, 3, 1))
+    assert [local(t).day for t in times] == [6, 13, 20, 27]
+
+
+def test_spring_forward_skips_missing_time():
+    # 2026-03-08 02:30 doesn't exist in New York
+    times = next_fire_times(cron("30 2 * * *"), ms(2026, 3, 7), ms(2026, 3, 10))
+    assert [local(t) for t in times] == [datetime(2026, 3, 7, 2, 30), datetime(2026, 3, 9, 2, 30)]
+
+
+def test_fall_back_fires_once():
+    # 2026-11-01 01:30 happens twice in New York
+    times = next_fire_times(cron("30 1 * * *"), ms(2026, 10, 31, 12), ms(2026, 11, 2, 12))
+    assert len(times) == 2
+    assert [local(t) for t in times] == [datetime(2026, 11, 1, 1, 30), datetime(2026, 11, 2, 1, 30)]
+
+
+def test_hourly_across_spring_forward_keeps_utc_spacing():
+    times = next_fire_times(cron("0 * * * *"), ms(2026, 3, 8, 0), ms(2026, 3, 8, 4))
+    assert [(b - a) // 3_600_000 for a, b in zip(times, times[1:])] == [1, 1, 1]
+
+
+def test_every_aligns_to_anchor():
+    schedule = {"kind": "every", "everyMs": 1000, "anchorMs": 500}
+    assert next_fire_times(schedule, 1200, 4000) == [1500, 2500, 3500]
+
+
+def test_at_inside_and_outside_window():
+    assert next_fire_times({"kind": "at", "atMs": 10}, 0, 20) == [10]
+    assert next_fire_times({"kind": "at", "atMs": 30}, 0, 20) == []
+
+
+def test_unknown_timezone_is_an_error():
+    with pytest.raises(ValueError):
+        next_fire_times(cron("0 0 * * *", tz="Mars/Olympus"), 0, 1)
+
+
+def test_find_bursts_merges_overlapping_windows():
+    events = [{"atMs": t, "jobId": f"j{t % 2}"} for t in (0, 10, 20, 30, 1000)]
+    assert find_bursts(events, window_ms=25, threshold=3) == [
+        {"startMs": 0, "endMs": 30, "count": 4, "jobIds": ["j0"]},
+    ]
+
+
+def test_build_timeline_reports_bad_schedules():
+    jobs = [
+        {"id": "a", "schedule": {"kind": "every", "everyMs": 60_000, "anchorMs": 0}},
+        {"id": "b", "schedule": {"kind": "cron", "expr": "nope"}},
+        {"id": "c", "enabled": False, "schedule": {"kind": "at", "atMs": 0}},
+    ]
+    timeline = build_timeline(jobs, 0, 120_000)
+    assert [j["jobId"] for j in timeline["jobs"]] == ["a"]
+    assert timeline["jobs"][0]["nextRuns"] == [0, 60_000, 120_000]
+    assert [e["jobId"] for e in timeline["errors"]] == ["b"]
@@ -0,0 +1,67 @@
+import pytest
+from app.services.sessions_index import SessionsIndex, decode_cursor, encode_cursor
+
+
+def make_index(n: int = 25) -> SessionsIndex:
+    index = SessionsIndex()
+    index.update([
+        {
+            "key": f"agent:{i:02d}",
+            "displayName": f"Session {chr(ord('a') + i % 26)}",
+            "updatedAt": 1000 + (i % 5) * 10,  # Ties, so pages split within equal values
+            "channel": "telegram" if i % 2 else "discord",
+            "model": "m1",
+        }
+        for i in range(n)
+    ])
+    return index
+
+
+def walk(index: SessionsIndex, **query) -> list[str]:
+    keys, cursor = [], None
+    while True:
+        page = index.query(limit=4, cursor=cursor, **query)
+        keys += [s["key"] for s in page["sessions"]]
+        cursor = page["nextCursor"]
+        if cursor is None:
+            return keys
+
+
+@pytest.mark.parametrize("sort", ["-updatedAt", "updatedAt", "key", "-key", "displayName", "-displayName"])
+def test_pages_cover_every_session_once_in_order(sort):
+    index = make_index()
+    everything = [s["key"] for s in index.query(sort=sort)["sessions"]]
+    assert len(everything) == 25
+    assert walk(index, sort=sort) == everything
+
+
+def test_filters_intersect_with_pagination():
+    index = make_index()
+    keys = walk(index, channel="telegram", q="agent:1")
+    assert keys == [k for k in walk(index) if k.startswith("agent:1") and int(k[-2:]) % 2]
+
+
+def test_cursor_round_trip():
+    assert decode_cursor(encode_cursor("-updatedAt", 5, "k"), "-updatedAt") == (5, "k")
+
+
+@pytest.mark.parametrize("cursor", ["!!!", "e30", encode_cursor("key", "x", "k")[:-2]])
+def test_malformed_cursor_is_rejected(cursor):
+    with pytest.raises(ValueError):
+        make_index().query(cursor=cursor)
+
+
+def test_cursor_from_another_sort_is_rejected():
+    index = make_index()
+    cursor = index.query(sort="key", limit=2)["nextCursor"]
+    with pytest.raises(ValueError):
+        index.query(sort="-updatedAt", limit=2, cursor=cursor)
+    with pytest.raises(ValueError):
+        index.query(sort="-key", limit=2, cursor=cursor)
+
+
+def test_unchanged_list_still_serves_fresh_dicts():
+    index = make_index(1)
+    index.update([{"key": "agent:00", "displayName": "Session a", "updatedAt": 1000,
+                   "channel": "discord", "model": "m1", "label": "new"}])
+    assert index.recent()[0]["label"] == "new"
@@ -0,0 +1,22 @@
+import pytest
+from app.services.shared_cache import CacheBackend, MemoryCacheBackend, SqliteCacheBackend
+
+
+def test_backend_interface_is_abstract():
+    with pytest.raises(TypeError):
+        CacheBackend()
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("kind", ["memory", "sqlite"])
+async def test_entries_and_streams(kind, tmp_path):
+    backend = MemoryCacheBackend() if kind == "memory" else SqliteCacheBackend(str(tmp_path / "cache.db"))
+    assert await backend.get("k") is None
+    await backend.set("k", {"a": [1, 2]})
+    value, stored_at = await backend.get("k")
+    assert value == {"a": [1, 2]} and stored_at > 0
+    
+    for ts in range(5):
+        await backend.append("s", float(ts), [ts], keep=3)
+    assert await backend.since("s", 0.0) == [(2.0, [2]), (3.0, [3]), (4.0, [4])]
+    assert await backend.since("s", 3.0) == [(4.0, [4])]
@@ -22,6 +22,12 @@ export async function getGatewayHealth() {
   return data;
 }
 
+// Dashboard snapshot: status, health, queue and cron sections in one call
+export async function getDashboard() {
+  const { data } = await api.get('/dashboard');
+  return data;
+}
+
 // Sessions
 export async function getSessions(activeMinutes?: number) {
   const params = activeMinutes ? { active_minutes: activeMinutes } : {};
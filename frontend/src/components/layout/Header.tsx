@@ -1,22 +1,20 @@
 import { useQuery } from '@tanstack/react-query';
 import { Activity, Wifi, WifiOff, Loader2 } from 'lucide-react';
-import { getAgentStatus, getGatewayHealth } from '@/api';
+import { getDashboard } from '@/api';
 import { useAssistantStore } from '@/stores/assistantStore';
 
 export default function Header() {
   const { isBusy } = useAssistantStore();
 
-  const { data: status } = useQuery({
-    queryKey: ['agent-status'],
-    queryFn: getAgentStatus,
+  // Shares the dashboard snapshot query with the Dashboard page
+  const { data: dashboard } = useQuery({
+    queryKey: ['dashboard'],
+    queryFn: getDashboard,
     refetchInterval: 5000,
   });
 
-  const { data: health } = useQuery({
-    queryKey: ['gateway-health'],
-    queryFn: getGatewayHealth,
-    refetchInterval: 10000,
-  });
+  const status = dashboard?.status?.data;
+  const health = dashboard?.health?.data;
 
   // Show busy if either local portal is busy OR server reports busy
   const isProcessing = isBusy || status?.busy;
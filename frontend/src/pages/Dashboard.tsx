@@ -14,7 +14,7 @@ import {
   User,
   Bot,
 } from 'lucide-react';
-import { getAgentStatus, getGatewayHealth, getSessions, sendCommand, getSessionHistory } from '@/api';
+import { getDashboard, getSessions, sendCommand, getSessionHistory } from '@/api';
 import { useAssistantStore } from '@/stores/assistantStore';
 import { cn } from '@/utils/cn';
 import { formatDistanceToNow } from 'date-fns';
@@ -318,17 +318,15 @@ export default function Dashboard() {
   // Use the global assistant store for state management
   const { status: assistantStatus, isBusy, setBusy } = useAssistantStore();
 
-  const { data: status, refetch: refetchStatus } = useQuery({
-    queryKey: ['agent-status'],
-    queryFn: getAgentStatus,
+  // One snapshot poll covers status and health (shared with the Header)
+  const { data: dashboard, refetch: refetchStatus } = useQuery({
+    queryKey: ['dashboard'],
+    queryFn: getDashboard,
     refetchInterval: 3000, // More frequent updates
   });
 
-  const { data: health } = useQuery({
-    queryKey: ['gateway-health'],
-    queryFn: getGatewayHealth,
-    refetchInterval: 10000,
-  });
+  const status = dashboard?.status?.data;
+  const health = dashboard?.health?.data;
 
   const { data: sessionsData } = useQuery({
     queryKey: ['sessions'],